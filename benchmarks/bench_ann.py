@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark approximate (IVF) vs. exact semantic search
+
+Builds passage corpora of 10,000 and 100,000 random 40-word windows over
+the bundled episodes' text, embeds them, clusters them into an IVF index
+and reports recall@10 against exact search and the mean query latency
+(including query encoding) for several n_probe settings.
+
+Usage:
+    python benchmarks/bench_ann.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_search import load_episodes  # noqa: E402
+from lennys_wisdom.ann import recall_at_k  # noqa: E402
+from lennys_wisdom.embeddings import EmbeddingIndex  # noqa: E402
+
+SIZES = [10000, 100000]
+WINDOW = 40
+PASSAGES_PER_EPISODE = 100
+N_QUERIES = 100
+K = 10
+N_PROBES = [8, 16, 32, 64]
+
+
+def corpus_words(episodes):
+    words = []
+    for episode in episodes:
+        words.extend(f"{episode['description']} {episode['summary']}".split())
+        for insight in episode.get('key_insights', []):
+            words.extend(f"{insight['quote']} {insight['insight']} {insight['context']}".split())
+    return words
+
+
+def passages(words, count, rng):
+    starts = [rng.randrange(len(words) - WINDOW) for _ in range(count)]
+    return [" ".join(words[start:start + WINDOW // rng.choice((1, 2, 4))]) for start in starts]
+
+
+def timed_search(index, queries, ann):
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        results.append(index.search(query, K, ann=ann))
+    elapsed = (time.perf_counter() - start) / len(queries) * 1000
+    return [[unit for unit, _ in hits] for hits in results], elapsed
+
+
+def main():
+    rng = random.Random(0)
+    words = corpus_words(load_episodes())
+    queries = [" ".join(words[s:s + 8]) for s in (rng.randrange(len(words) - 8) for _ in range(N_QUERIES))]
+
+    print(f"{'passages':>9} {'encode (s)':>11} {'build (s)':>10} {'n_probe':>8} "
+          f"{'recall@10':>10} {'ann (ms)':>9} {'exact (ms)':>11}")
+    for size in SIZES:
+        index = EmbeddingIndex()
+        texts = passages(words, size, rng)
+        start = time.perf_counter()
+        for e, begin in enumerate(range(0, size, PASSAGES_PER_EPISODE)):
+            index.add_episode({
+                'id': f"passages-{e:05d}",
+                'key_insights': [{'quote': text} for text in texts[begin:begin + PASSAGES_PER_EPISODE]]
+            })
+        encode = time.perf_counter() - start
+        index.search("warm up")
+
+        start = time.perf_counter()
+        ann = index.build_ann()
+        build = time.perf_counter() - start
+
+        exact, exact_ms = timed_search(index, queries, None)
+        for n_probe in N_PROBES:
+            ann.n_probe = n_probe
+            approximate, ann_ms = timed_search(index, queries, ann)
+            print(f"{size:>9} {encode:>11.1f} {build:>10.1f} {n_probe:>8} "
+                  f"{recall_at_k(exact, approximate):>10.3f} {ann_ms:>9.2f} {exact_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
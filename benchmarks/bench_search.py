@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark keyword search latency: linear scan vs. inverted index
+
+Builds synthetic corpora by cloning the bundled episodes under new ids and
+reports the mean query latency at 20, 320 and 10,000 episodes, for both
+plain index matching and BM25F scoring with top-k selection.
+
+Usage:
+    python benchmarks/bench_search.py
+"""
+
+import copy
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lennys_wisdom.index import InvertedIndex  # noqa: E402
+from lennys_wisdom.query import parse_query  # noqa: E402
+from lennys_wisdom.ranking import BM25FScorer, top_k  # noqa: E402
+
+EPISODES_DIR = Path(__file__).parent.parent / "lennys_wisdom" / "data" / "episodes"
+QUERIES = ["hiring", "growth strategy", "pricing", "decision", "product-market fit"]
+SIZES = [20, 320, 10000]
+
+
+def load_episodes():
+    episodes = []
+    for json_file in sorted(EPISODES_DIR.glob("ep-*.json")):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            episodes.append(json.load(f))
+    return episodes
+
+
+def synthetic_corpus(episodes, size):
+    """Clone the real episodes under fresh ids until ``size`` is reached"""
+    corpus = []
+    for i in range(size):
+        episode = copy.deepcopy(episodes[i % len(episodes)])
+        episode['id'] = f"{episode['id']}-{i:05d}"
+        corpus.append(episode)
+    return corpus
+
+
+def linear_scan(query, episodes):
+    """The pre-index search: lowercase substring checks over every field"""
+    query_lower = query.lower()
+    hits = 0
+    for episode in episodes:
+        for insight in episode.get('key_insights', []):
+            if (query_lower in insight.get('quote', '').lower() or
+                    query_lower in insight.get('insight', '').lower() or
+                    query_lower in insight.get('context', '').lower() or
+                    any(query_lower in t.lower() for t in insight.get('topics', []))):
+                hits += 1
+    return hits
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            fn(query)
+    return (time.perf_counter() - start) / (repeat * len(QUERIES)) * 1000
+
+
+def main():
+    episodes = load_episodes()
+    print(f"{'episodes':>9} {'build (s)':>10} {'scan (ms)':>10} {'index (ms)':>11} {'bm25 (ms)':>10}")
+    for size in SIZES:
+        corpus = synthetic_corpus(episodes, size)
+        repeat = max(1, 2000 // size)
+
+        start = time.perf_counter()
+        index = InvertedIndex()
+        for episode in corpus:
+            index.add_episode(episode)
+        build = time.perf_counter() - start
+
+        scan_ms = timed(lambda q: linear_scan(q, corpus), repeat)
+        index_ms = timed(index.match, repeat)
+        scorer = BM25FScorer(index)
+        scorer.score({})  # precompute field normalization outside the timing
+        bm25_ms = timed(lambda q: top_k(scorer.score(parse_query(index, q)), 10), repeat)
+        print(f"{size:>9} {build:>10.2f} {scan_ms:>10.2f} {index_ms:>11.3f} {bm25_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark semantic search latency over hashed n-gram embeddings
+
+Encodes synthetic corpora (cloned episodes) and reports the encode time and
+the mean top-10 query latency, including query encoding, at roughly 300,
+5,000 and 20,000 insights.
+
+Usage:
+    python benchmarks/bench_semantic.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_search import load_episodes, synthetic_corpus  # noqa: E402
+from lennys_wisdom.embeddings import EmbeddingIndex  # noqa: E402
+
+QUERIES = ["letting someone go", "how to price a new product", "finding product-market fit",
+           "running better meetings", "hiring senior leaders"]
+SIZES = [20, 350, 1400]
+
+
+def main():
+    episodes = load_episodes()
+    print(f"{'episodes':>9} {'insights':>9} {'encode (s)':>11} {'query (ms)':>11}")
+    for size in SIZES:
+        index = EmbeddingIndex()
+        start = time.perf_counter()
+        for episode in synthetic_corpus(episodes, size):
+            index.add_episode(episode)
+        encode = time.perf_counter() - start
+        index.search("warm up")  # stack the matrix outside the timing
+
+        repeat = 50
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for query in QUERIES:
+                index.search(query, 10)
+        query_ms = (time.perf_counter() - start) / (repeat * len(QUERIES)) * 1000
+        print(f"{size:>9} {len(index):>9} {encode:>11.2f} {query_ms:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark corpus cold start: JSON + index build vs. compiled snapshot
+
+For the bundled 20 episodes and a synthetic 320-episode corpus, times how
+long it takes to get a CorpusStore with all server indexes ready, first
+from the episode JSON files and then from a snapshot.
+
+Usage:
+    python benchmarks/bench_startup.py
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_search import load_episodes, synthetic_corpus  # noqa: E402
+from lennys_wisdom.corpus import CorpusStore  # noqa: E402
+from lennys_wisdom.embeddings import EmbeddingIndex  # noqa: E402
+from lennys_wisdom.index import (  # noqa: E402
+    FrameworkIndex, GuestIndex, InvertedIndex, SituationIndex, TopicIndex
+)
+
+INDEXES = {
+    'search': InvertedIndex,
+    'situation': SituationIndex,
+    'framework': FrameworkIndex,
+    'guest': GuestIndex,
+    'topic': TopicIndex,
+    'semantic': EmbeddingIndex,
+}
+
+
+def cold_start(episodes_dir, snapshot_path):
+    start = time.perf_counter()
+    corpus = CorpusStore(episodes_dir, snapshot_path=snapshot_path)
+    corpus.add_indexes({name: index_type() for name, index_type in INDEXES.items()})
+    return time.perf_counter() - start, corpus
+
+
+def main():
+    episodes = load_episodes()
+    print(f"{'episodes':>9} {'json (ms)':>10} {'snapshot (ms)':>14} {'snapshot size':>14}")
+    for size in (20, 320):
+        with tempfile.TemporaryDirectory() as tmp:
+            episodes_dir = Path(tmp) / "episodes"
+            episodes_dir.mkdir()
+            for episode in synthetic_corpus(episodes, size):
+                with open(episodes_dir / f"{episode['id']}.json", 'w', encoding='utf-8') as f:
+                    json.dump(episode, f, indent=2, ensure_ascii=False)
+            snapshot_path = Path(tmp) / "corpus.snapshot"
+
+            json_seconds, corpus = cold_start(episodes_dir, None)
+            corpus.write_snapshot(snapshot_path)
+            snapshot_seconds, corpus = cold_start(episodes_dir, snapshot_path)
+            assert corpus.loaded_from_snapshot
+
+            print(f"{size:>9} {json_seconds * 1000:>10.1f} {snapshot_seconds * 1000:>14.1f} "
+                  f"{snapshot_path.stat().st_size:>14,}")
+
+
+if __name__ == "__main__":
+    main()
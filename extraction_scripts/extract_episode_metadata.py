@@ -10,40 +10,269 @@ Usage:
 
     # API mode (requires ANTHROPIC_API_KEY)
     python extract_episode_metadata.py --transcript "Brian Chesky.txt" --api
+
+    # Batch API mode: every .txt in a directory, several at a time
+    python extract_episode_metadata.py --batch transcripts/ --api --concurrency 8
+
+    # Batch mode against a local stub API (see stub_api_server.py)
+    python extract_episode_metadata.py --batch transcripts/ --api --base-url http://127.0.0.1:8765
+
+Batch mode is incremental: transcripts whose content hash and prompt version
+match their existing episode JSON are skipped, and progress is checkpointed
+to a journal in the output directory so a crashed run resumes where it left
+off. Use --force to re-extract everything.
+
+In API modes, transcripts longer than --chunk-chars are split on speaker
+turns, the parts are extracted concurrently, and their summaries, themes
+and insights are merged and deduplicated, instead of truncating the
+transcript. Manual mode does not split: its prompt holds only the first
+50,000 characters of the transcript.
+
+Responses are streamed and parsed as they arrive (see response_parser.py):
+malformed or cut-off JSON is repaired and invalid insights are dropped
+rather than failing the extraction. A response that cannot be salvaged is
+saved next to the output as <episode-id>.response.txt; fix it by hand and
+feed it back without another API call:
+
+    python extract_episode_metadata.py --transcript "Brian Chesky.txt" --manual < output/ep-brian-chesky.response.txt
 """
 
+import asyncio
+import bisect
+import difflib
+import hashlib
 import json
+import mmap
+import os
+import random
+import re
 import sys
+import tempfile
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import argparse
 
+from response_parser import ExtractionError, StreamingExtractionParser
+
 # Optional: Only needed for API mode
 try:
-    from anthropic import Anthropic
+    import anthropic
+    from anthropic import Anthropic, AsyncAnthropic
     HAS_ANTHROPIC = True
 except ImportError:
     HAS_ANTHROPIC = False
 
-
-def load_transcript(transcript_path: Path) -> str:
-    """Load transcript file"""
-    with open(transcript_path, 'r', encoding='utf-8') as f:
-        return f.read()
-
-
-def create_extraction_prompt(transcript_text: str, guest_name: str) -> str:
-    """Create the extraction prompt for Claude"""
-
-    # Truncate if too long (for display in manual mode)
-    if len(transcript_text) > 50000:
-        transcript_preview = transcript_text[:50000] + "\n\n[... transcript continues ...]"
+MODEL = "claude-sonnet-4-5-20250929"
+MAX_TOKENS = 4096
+
+# Bump whenever create_extraction_prompt() or MODEL changes in a way that
+# should re-extract every transcript
+PROMPT_VERSION = "1"
+
+# Batch mode checkpoint log, kept in the output directory
+JOURNAL_NAME = ".extraction-journal.jsonl"
+
+# Longest transcript sent in one prompt; longer ones are extracted in parts
+# (API modes) or truncated (manual mode)
+CHUNK_CHARS = 50000
+
+# Limits of the merged result, matching what the prompt asks for
+MAX_TOPICS = 8
+MAX_THEMES = 4
+
+# Insights whose quotes are this similar (or contain one another) are duplicates
+DUPLICATE_QUOTE_RATIO = 0.85
+
+# Themes sharing this share of their words are the same theme
+DUPLICATE_THEME_OVERLAP = 0.5
+
+# Sentences of each part's summary kept in the merged episode summary
+SUMMARY_SENTENCES_PER_PART = 2
+
+# Transcripts at least this large are read through mmap instead of a buffered file
+MMAP_MIN_BYTES = 4 * 1024 * 1024
+
+# Speaker turn header at the start of a line: "Brian Chesky (00:12:34):" or "[00:12:34] Brian Chesky:"
+_TURN_RE = re.compile(
+    r"(?:(?P<speaker>[^\n()]{1,80})\((?P<timestamp>\d{1,2}:\d{2}(?::\d{2})?)\):?"
+    r"|\[(?P<bracket_timestamp>\d{1,2}:\d{2}(?::\d{2})?)\](?:\s*(?P<bracket_speaker>[^\n:]{1,80}):)?)"
+)
+_WORD_RE = re.compile(r"\w+")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Batch mode: concurrent requests, and retries of rate-limited/overloaded calls
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 6
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+# Status codes worth retrying: rate limited, and server errors/overloaded
+RETRYABLE_STATUS = {429, 500, 502, 503, 504, 529}
+
+
+class Turn(NamedTuple):
+    """A speaker turn header: where it starts in the text, who speaks, and when"""
+    offset: int
+    speaker: str
+    timestamp: str
+
+
+class Transcript:
+    """
+    A transcript file read once, with everything derived from it.
+
+    The file is read line by line in a single pass that hashes the bytes,
+    counts words and records every speaker turn (with its character offset
+    and timestamp). Prompt building, splitting and episode assembly all
+    use this object instead of re-reading the file.
+
+    Attributes:
+        path: The transcript file
+        text: Decoded text, with line endings normalized to \\n
+        sha256: Digest of the file's bytes
+        word_count: Whitespace-separated words
+        turns: Speaker turns in order
+    """
+
+    def __init__(self, path: Path, text: str, sha256: str, word_count: int, turns: List[Turn]):
+        self.path = path
+        self.text = text
+        self.sha256 = sha256
+        self.word_count = word_count
+        self.turns = turns
+        self._turn_offsets = [turn.offset for turn in turns]
+        self._parts: Dict[int, List[str]] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> "Transcript":
+        """Read and analyze a transcript in one pass"""
+        digest = hashlib.sha256()
+        lines: List[str] = []
+        turns: List[Turn] = []
+        word_count = offset = 0
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size >= MMAP_MIN_BYTES else f
+            try:
+                for raw in iter(source.readline, b''):
+                    digest.update(raw)
+                    line = raw.decode('utf-8')
+                    if line.endswith('\r\n'):
+                        line = line[:-2] + '\n'
+                    match = _TURN_RE.match(line)
+                    if match:
+                        speaker = match.group('speaker') or match.group('bracket_speaker') or ''
+                        timestamp = match.group('timestamp') or match.group('bracket_timestamp')
+                        turns.append(Turn(offset, speaker.strip(), timestamp))
+                    word_count += len(line.split())
+                    lines.append(line)
+                    offset += len(line)
+            finally:
+                if source is not f:
+                    source.close()
+        return cls(Path(path), "".join(lines), digest.hexdigest(), word_count, turns)
+
+    def split(self, max_chars: int = CHUNK_CHARS) -> List[str]:
+        """The transcript in parts of at most ``max_chars``, on speaker turns (see split_transcript)"""
+        if max_chars not in self._parts:
+            self._parts[max_chars] = split_transcript(self.text, self._turn_offsets, max_chars)
+        return self._parts[max_chars]
+
+    def timestamp_at(self, offset: int) -> Optional[str]:
+        """Timestamp of the turn containing character ``offset``"""
+        index = bisect.bisect_right(self._turn_offsets, offset) - 1
+        return self.turns[index].timestamp if index >= 0 else None
+
+    def find_timestamp(self, quote: str) -> Optional[str]:
+        """Timestamp of the turn a verbatim quote comes from, if it can be found"""
+        offset = self.text.find(quote.strip()[:80]) if quote.strip() else -1
+        return self.timestamp_at(offset) if offset >= 0 else None
+
+
+def episode_id_for(guest_name: str) -> str:
+    """Episode id for a guest, e.g. Brian Chesky -> ep-brian-chesky"""
+    return f"ep-{guest_slug(guest_name)}"
+
+
+def guest_slug(guest_name: str) -> str:
+    """Lowercase, hyphenated guest name used in ids"""
+    return guest_name.lower().replace(' ', '-').replace("'", "")
+
+
+def split_transcript(transcript_text: str, turn_offsets: List[int], max_chars: int = CHUNK_CHARS) -> List[str]:
+    """
+    Split a transcript into parts of at most ``max_chars``, on the speaker turns starting at ``turn_offsets``.
+
+    Falls back to blank lines, then line breaks, for transcripts (or single
+    turns) without speaker headers; only a single overlong line is cut mid-text.
+    """
+    if len(transcript_text) <= max_chars:
+        return [transcript_text]
+
+    segments = _split_at(transcript_text, turn_offsets)
+    parts, current = [], ""
+    for segment in segments:
+        for piece in _fit(segment, max_chars):
+            if current and len(current) + len(piece) > max_chars:
+                parts.append(current)
+                current = ""
+            current += piece
+    if current.strip():
+        parts.append(current)
+    return parts
+
+
+def _split_at(text: str, starts: List[int]) -> List[str]:
+    """Cut ``text`` at the given offsets"""
+    bounds = sorted(set([0] + starts + [len(text)]))
+    return [text[a:b] for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _fit(segment: str, max_chars: int) -> List[str]:
+    """Break a segment longer than ``max_chars`` at blank lines, then line breaks, then hard"""
+    if len(segment) <= max_chars:
+        return [segment]
+    for separator in ("\n\n", "\n"):
+        starts = [m.end() for m in re.finditer(re.escape(separator), segment)]
+        pieces = _split_at(segment, starts)
+        if len(pieces) > 1:
+            return [fitted for piece in pieces for fitted in _fit(piece, max_chars)]
+    return [segment[i:i + max_chars] for i in range(0, len(segment), max_chars)]
+
+
+def create_extraction_prompt(
+    transcript_text: str,
+    guest_name: str,
+    part: Optional[Tuple[int, int]] = None,
+    max_chars: Optional[int] = None
+) -> str:
+    """
+    Create the extraction prompt for Claude.
+
+    ``part`` is (number, total) when the transcript was split; each part
+    asks for proportionally fewer insights. ``max_chars`` truncates the
+    transcript (manual mode, which cannot split); API modes split long
+    transcripts before building prompts and pass None.
+    """
+
+    if max_chars is not None and len(transcript_text) > max_chars:
+        transcript_preview = transcript_text[:max_chars] + "\n\n[... transcript continues ...]"
     else:
         transcript_preview = transcript_text
 
-    prompt = f"""Extract structured metadata from this Lenny's Podcast transcript.
+    if part:
+        scope = (f"This is part {part[0]} of {part[1]} of the transcript. "
+                 f"Extract only what is said in this part.\n\n")
+        insight_count = "4-8 insights from this part"
+    else:
+        scope = ""
+        insight_count = "8-15 insights"
 
+    prompt = f"""Extract structured metadata from this Lenny's Podcast transcript.
+{scope}
 TRANSCRIPT:
 {transcript_preview}
 
@@ -75,7 +304,7 @@ Extract the following information and return as valid JSON:
    - Description (one sentence explaining the theme)
    - Relevance score (0.0 to 1.0, how central is this theme?)
 
-5. **Key Insights** (8-15 insights):
+5. **Key Insights** ({insight_count}):
    For each insight:
    - Quote: The actual quote (verbatim from transcript)
    - Timestamp: Approximate timestamp (look for speaker timestamps)
@@ -117,45 +346,402 @@ Return ONLY valid JSON, no additional text before or after.
     return prompt
 
 
-def extract_via_api(transcript_text: str, guest_name: str, api_key: str) -> dict:
-    """Extract metadata using Anthropic API"""
+def extract_via_api(
+    transcript: Transcript,
+    guest_name: str,
+    api_key: str,
+    base_url: Optional[str] = None,
+    chunk_chars: int = CHUNK_CHARS
+) -> dict:
+    """Extract metadata using Anthropic API (in parts if the transcript is long)"""
     if not HAS_ANTHROPIC:
         raise ImportError("anthropic library not installed. Run: pip install anthropic")
 
-    client = Anthropic(api_key=api_key)
-    prompt = create_extraction_prompt(transcript_text, guest_name)
+    if len(transcript.text) > chunk_chars:
+        async def run() -> dict:
+            client = AsyncAnthropic(api_key=api_key, base_url=base_url, max_retries=0)
+            try:
+                return await extract_chunked_async(
+                    client, transcript, guest_name,
+                    asyncio.Semaphore(DEFAULT_CONCURRENCY), DEFAULT_MAX_RETRIES, chunk_chars
+                )
+            finally:
+                await client.close()
+        return asyncio.run(run())
+
+    client = Anthropic(api_key=api_key, base_url=base_url)
+    prompt = create_extraction_prompt(transcript.text, guest_name)
 
     print(f"🤖 Calling Claude API to extract metadata for {guest_name}...")
 
-    message = client.messages.create(
-        model="claude-sonnet-4-5-20250929",
-        max_tokens=4096,
+    parser = StreamingExtractionParser(guest_name)
+    with client.messages.stream(
+        model=MODEL,
+        max_tokens=MAX_TOKENS,
         temperature=0,
         messages=[
             {"role": "user", "content": prompt}
         ]
-    )
+    ) as stream:
+        for text in stream.text_stream:
+            parser.feed(text)
 
-    response_text = message.content[0].text
+    return finish_parse(parser, guest_name)
 
-    # Parse JSON response
-    try:
-        # Find JSON in response (in case there's extra text)
-        json_start = response_text.find('{')
-        json_end = response_text.rfind('}') + 1
-        json_text = response_text[json_start:json_end]
-
-        data = json.loads(json_text)
-        return data
-    except json.JSONDecodeError as e:
-        print(f"❌ Error parsing JSON response: {e}")
-        print(f"Response was:\n{response_text}")
-        sys.exit(1)
 
+def finish_parse(parser: StreamingExtractionParser, label: str) -> dict:
+    """Validate a fully streamed response, reporting anything that was repaired or dropped"""
+    try:
+        data = parser.result()
+    except ExtractionError as e:
+        raise ExtractionError(f"{label}: {e}", e.response, e.problems) from None
+    for problem in parser.problems:
+        print(f"  ⚠ {label}: {problem}")
+    return data
+
+
+def retry_delay(attempt: int, error: Exception) -> float:
+    """Seconds to wait before retrying: the server's retry-after, else exponential backoff with jitter"""
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+        except ValueError:
+            pass
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** attempt, BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, overloaded/server errors and dropped connections are worth retrying"""
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS
+    return isinstance(error, anthropic.APIConnectionError)
+
+
+async def extract_via_api_async(
+    client: "AsyncAnthropic",
+    transcript_text: str,
+    guest_name: str,
+    semaphore: asyncio.Semaphore,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    part: Optional[Tuple[int, int]] = None
+) -> dict:
+    """Extract metadata for one transcript (or part), at most ``semaphore`` calls in flight"""
+    prompt = create_extraction_prompt(transcript_text, guest_name, part)
+
+    for attempt in range(max_retries + 1):
+        async with semaphore:
+            parser = StreamingExtractionParser(guest_name)
+            try:
+                async with client.messages.stream(
+                    model=MODEL,
+                    max_tokens=MAX_TOKENS,
+                    temperature=0,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                ) as stream:
+                    async for text in stream.text_stream:
+                        parser.feed(text)
+                break
+            except Exception as e:
+                if attempt == max_retries or not is_retryable(e):
+                    raise
+                error = e
+        # Back off outside the semaphore so waiting doesn't hold a slot
+        delay = retry_delay(attempt, error)
+        print(f"  ↻ {guest_name}: {type(error).__name__}, retrying in {delay:.1f}s "
+              f"({attempt + 1}/{max_retries})")
+        await asyncio.sleep(delay)
+
+    return finish_parse(parser, f"{guest_name} (part {part[0]}/{part[1]})" if part else guest_name)
+
+
+async def extract_chunked_async(
+    client: "AsyncAnthropic",
+    transcript: Transcript,
+    guest_name: str,
+    semaphore: asyncio.Semaphore,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    chunk_chars: int = CHUNK_CHARS
+) -> dict:
+    """Map: extract every part of the transcript concurrently. Reduce: merge the results."""
+    parts = transcript.split(chunk_chars)
+    if len(parts) == 1:
+        return await extract_via_api_async(client, transcript.text, guest_name, semaphore, max_retries)
+
+    print(f"  ✂ {guest_name}: extracting {len(parts)} parts")
+    results = await asyncio.gather(*(
+        extract_via_api_async(client, text, guest_name, semaphore, max_retries, (number, len(parts)))
+        for number, text in enumerate(parts, 1)
+    ))
+    return merge_extractions(results)
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def _is_duplicate_quote(quote: str, seen: List[str]) -> bool:
+    normalized = " ".join(_words(quote))
+    for other in seen:
+        if normalized in other or other in normalized:
+            return True
+        if difflib.SequenceMatcher(None, normalized, other).ratio() >= DUPLICATE_QUOTE_RATIO:
+            return True
+    return False
+
+
+def merge_extractions(parts: List[dict]) -> dict:
+    """
+    Reduce per-part extractions into one.
+
+    Guest details come from the first part (the intro); the summary joins
+    the opening sentences of every part's summary, in transcript order;
+    topics are ranked by how many parts tagged them; themes with mostly the
+    same words are merged keeping the highest relevance; insights are kept
+    in transcript order, dropping quotes already extracted from an earlier
+    part (the same passage can be quoted from both sides of a split).
+    """
+    first = parts[0]
+    merged = {
+        key: first.get(key, "")
+        for key in ("guest_name", "guest_title", "guest_company", "guest_bio")
+    }
 
-def extract_manual(transcript_text: str, guest_name: str) -> None:
-    """Output prompt for manual extraction via Claude in Cowork"""
-    prompt = create_extraction_prompt(transcript_text, guest_name)
+    sentences, seen_sentences = [], set()
+    for part in parts:
+        summary = part.get("episode_summary", "").strip()
+        if not summary:
+            continue
+        for sentence in _SENTENCE_END_RE.split(summary)[:SUMMARY_SENTENCES_PER_PART]:
+            normalized = " ".join(_words(sentence))
+            if normalized not in seen_sentences:
+                seen_sentences.add(normalized)
+                sentences.append(sentence)
+    merged["episode_summary"] = " ".join(sentences)
+
+    topic_counts = Counter(topic for part in parts for topic in dict.fromkeys(part.get("topics", [])))
+    merged["topics"] = [topic for topic, _ in topic_counts.most_common(MAX_TOPICS)]
+
+    themes: List[dict] = []
+    for part in parts:
+        for theme in part.get("key_themes", []):
+            words = set(_words(theme.get("theme", "")))
+            match = next((
+                existing for existing in themes
+                if len(words & set(_words(existing["theme"]))) >= DUPLICATE_THEME_OVERLAP * max(len(words), 1)
+            ), None)
+            if match is None:
+                themes.append(dict(theme))
+            elif theme.get("relevance_score", 0) > match.get("relevance_score", 0):
+                match.update(theme)
+    themes.sort(key=lambda theme: theme.get("relevance_score", 0), reverse=True)
+    merged["key_themes"] = themes[:MAX_THEMES]
+
+    insights, earlier_quotes = [], []
+    for part in parts:
+        part_quotes = []
+        for insight in part.get("key_insights", []):
+            quote = insight.get("quote", "")
+            if quote and _is_duplicate_quote(quote, earlier_quotes):
+                continue
+            part_quotes.append(" ".join(_words(quote)))
+            insights.append(insight)
+        earlier_quotes.extend(part_quotes)
+    merged["key_insights"] = insights
+    return merged
+
+
+def write_json_atomic(path: Path, data: dict) -> None:
+    """Write JSON to a temp file in the same directory, then rename it into place"""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+class ExtractionJournal:
+    """
+    Append-only checkpoint log of batch extraction progress.
+
+    Each transcript gets a "started" record when its extraction begins and a
+    "done" or "failed" record when it ends. Records are flushed and fsynced
+    as they are written, so after a crash the journal tells which
+    transcripts already have a current episode file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.latest: Dict[str, dict] = {}
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn final line from a crash
+                    self.latest[record['transcript']] = record
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def record(self, status: str, transcript_path: Path, content_hash: Optional[str], **fields) -> None:
+        """Append a record and force it to disk"""
+        record = {
+            'transcript': transcript_path.name,
+            'status': status,
+            'transcript_sha256': content_hash,
+            'prompt_version': PROMPT_VERSION,
+            'at': datetime.utcnow().isoformat() + "Z",
+            **fields
+        }
+        self.latest[record['transcript']] = record
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def is_done(self, transcript_path: Path, content_hash: str, parts: int, output_dir: Path) -> bool:
+        """True if the journal shows this exact transcript and prompt extracted to an existing file"""
+        record = self.latest.get(transcript_path.name)
+        return bool(
+            record and record['status'] == 'done' and
+            record['transcript_sha256'] == content_hash and
+            record['prompt_version'] == PROMPT_VERSION and
+            record.get('parts', 1) == parts and
+            (output_dir / record.get('output', '')).is_file()
+        )
+
+    def compact(self) -> None:
+        """Rewrite the journal with only the latest record per transcript"""
+        self._file.close()
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for record in self.latest.values():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_name, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def is_up_to_date(transcript_path: Path, content_hash: str, parts: int, output_dir: Path) -> bool:
+    """True if the episode JSON for this transcript was extracted from the same content, prompt and split"""
+    output_file = output_dir / f"{episode_id_for(transcript_path.stem)}.json"
+    try:
+        with open(output_file, 'r', encoding='utf-8') as f:
+            metadata = json.load(f).get('extraction_metadata', {})
+    except (OSError, json.JSONDecodeError):
+        return False
+    return (metadata.get('transcript_sha256') == content_hash and
+            metadata.get('prompt_version') == PROMPT_VERSION and
+            metadata.get('transcript_parts', 1) == parts)
+
+
+async def extract_batch(
+    transcripts: List[Path],
+    output_dir: Path,
+    api_key: Optional[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    base_url: Optional[str] = None,
+    force: bool = False,
+    chunk_chars: int = CHUNK_CHARS
+) -> Tuple[List[Path], List[Path], List[Tuple[Path, str]]]:
+    """
+    Extract many transcripts concurrently, saving each episode as soon as it completes.
+
+    Transcripts already extracted from the same content with the same
+    prompt version are skipped unless ``force`` is set.
+
+    Returns:
+        (episode files written, transcripts skipped, (transcript, error) for each failure)
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    journal = ExtractionJournal(output_dir / JOURNAL_NAME)
+
+    # Each file is read once; only the transcripts still to extract are kept in memory.
+    # An unreadable transcript fails on its own without stopping the batch.
+    todo: Dict[Path, Transcript] = {}
+    skipped = []
+    failed: List[Tuple[Path, str]] = []
+    for path in transcripts:
+        try:
+            transcript = Transcript.load(path)
+        except (OSError, ValueError) as e:
+            error = f"{type(e).__name__}: {e}"
+            journal.record('failed', path, None, error=error)
+            failed.append((path, error))
+            print(f"❌ {path.name}: {error}")
+            continue
+        parts = len(transcript.split(chunk_chars))
+        if not force and (journal.is_done(path, transcript.sha256, parts, output_dir) or
+                          is_up_to_date(path, transcript.sha256, parts, output_dir)):
+            skipped.append(path)
+        else:
+            todo[path] = transcript
+    if skipped:
+        print(f"⏭  Skipping {len(skipped)} unchanged transcript(s)")
+
+    # Retries are handled here (with backoff outside the semaphore), not by the SDK
+    client = AsyncAnthropic(api_key=api_key, base_url=base_url, max_retries=0)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def extract_one(transcript: Transcript) -> Tuple[Path, Optional[Path], Optional[str]]:
+        transcript_path, content_hash = transcript.path, transcript.sha256
+        parts = len(transcript.split(chunk_chars))
+        journal.record('started', transcript_path, content_hash)
+        try:
+            extracted_data = await extract_chunked_async(
+                client, transcript, transcript_path.stem, semaphore, max_retries, chunk_chars
+            )
+            episode = create_episode_json(extracted_data, transcript_path.stem, transcript, parts)
+            output_file = output_dir / f"{episode['id']}.json"
+            write_json_atomic(output_file, episode)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            fields = {}
+            if isinstance(e, ExtractionError):
+                fields['response'] = save_failed_response(output_dir, transcript_path.stem, e).name
+                error += f" (response saved to {fields['response']})"
+            journal.record('failed', transcript_path, content_hash, error=error, **fields)
+            return transcript_path, None, error
+        journal.record('done', transcript_path, content_hash, parts=parts, output=output_file.name)
+        return transcript_path, output_file, None
+
+    written = []
+    try:
+        pending = [extract_one(transcript) for transcript in todo.values()]
+        for done, future in enumerate(asyncio.as_completed(pending), 1):
+            transcript_path, output_file, error = await future
+            if error:
+                failed.append((transcript_path, error))
+                print(f"❌ [{done}/{len(pending)}] {transcript_path.name}: {error}")
+            else:
+                written.append(output_file)
+                print(f"✓ [{done}/{len(pending)}] {output_file.name}")
+        journal.compact()
+    finally:
+        journal.close()
+        await client.close()
+    return written, skipped, failed
+
+
+def save_failed_response(output_dir: Path, guest_name: str, error: ExtractionError) -> Path:
+    """Keep an unusable response so it can be fixed and re-parsed without paying for another call"""
+    path = output_dir / f"{episode_id_for(guest_name)}.response.txt"
+    path.write_text(error.response, encoding='utf-8')
+    return path
+
+
+def extract_manual(transcript: Transcript, guest_name: str) -> dict:
+    """Output prompt for manual extraction via Claude in Cowork (truncated to CHUNK_CHARS)"""
+    prompt = create_extraction_prompt(transcript.text, guest_name, max_chars=CHUNK_CHARS)
 
     print("=" * 80)
     print("MANUAL EXTRACTION MODE")
@@ -177,45 +763,34 @@ def extract_manual(transcript_text: str, guest_name: str) -> None:
     print("Paste Claude's JSON response below (then press Enter, then Ctrl+D):")
     print()
 
-    # Read response from stdin
-    response_lines = []
+    # Read response from stdin, parsing as it is pasted
+    parser = StreamingExtractionParser(guest_name)
     try:
         while True:
-            line = input()
-            response_lines.append(line)
+            parser.feed(input() + "\n")
     except EOFError:
         pass
 
-    response_text = '\n'.join(response_lines)
-
-    # Parse JSON
-    try:
-        json_start = response_text.find('{')
-        json_end = response_text.rfind('}') + 1
-        json_text = response_text[json_start:json_end]
-
-        data = json.loads(json_text)
-        return data
-    except json.JSONDecodeError as e:
-        print(f"❌ Error parsing JSON: {e}")
-        sys.exit(1)
+    return finish_parse(parser, guest_name)
 
 
-def create_episode_json(extracted_data: dict, guest_name: str, transcript_path: Path) -> dict:
-    """Create full episode JSON from extracted data"""
+def create_episode_json(
+    extracted_data: dict,
+    guest_name: str,
+    transcript: Transcript,
+    parts: int = 1
+) -> dict:
+    """Create full episode JSON from extracted data (``parts``: prompts it was extracted in)"""
 
     # Generate episode ID
-    guest_slug = guest_name.lower().replace(' ', '-').replace("'", "")
-    episode_id = f"ep-{guest_slug}"
-
-    # Count words in transcript
-    with open(transcript_path, 'r') as f:
-        word_count = len(f.read().split())
+    slug = guest_slug(guest_name)
+    episode_id = episode_id_for(guest_name)
+    transcript_path = transcript.path
 
     # Build episode JSON
     episode = {
         "id": episode_id,
-        "guest_id": f"guest-{guest_slug}",
+        "guest_id": f"guest-{slug}",
         "guest_name": extracted_data["guest_name"],
         "title": f"{extracted_data['guest_name']} on Lenny's Podcast",  # Can be refined
         "description": extracted_data.get("episode_summary", ""),
@@ -228,11 +803,14 @@ def create_episode_json(extracted_data: dict, guest_name: str, transcript_path:
         "quotes_extracted": len(extracted_data["key_insights"]),
         "transcript_available": True,
         "transcript_path": f"transcripts/{transcript_path.name}",
-        "transcript_word_count": word_count,
+        "transcript_word_count": transcript.word_count,
         "extraction_metadata": {
             "extracted_at": datetime.utcnow().isoformat() + "Z",
             "extraction_version": "1.0",
             "llm_model": "claude-sonnet-4.5",
+            "prompt_version": PROMPT_VERSION,
+            "transcript_sha256": transcript.sha256,
+            "transcript_parts": parts,
             "human_reviewed": False
         }
     }
@@ -244,7 +822,7 @@ def create_episode_json(extracted_data: dict, guest_name: str, transcript_path:
             "id": insight_id,
             "insight": insight["insight"],
             "quote": insight["quote"],
-            "timestamp": insight.get("timestamp", "unknown"),
+            "timestamp": _insight_timestamp(insight, transcript),
             "context": insight["context"],
             "topics": insight["topics"],
             "actionable": insight.get("actionable", True)
@@ -253,12 +831,74 @@ def create_episode_json(extracted_data: dict, guest_name: str, transcript_path:
     return episode
 
 
+def _insight_timestamp(insight: dict, transcript: Transcript) -> str:
+    """The extracted timestamp, or the one of the turn the quote was found in"""
+    timestamp = insight.get("timestamp") or "unknown"
+    if timestamp == "unknown":
+        timestamp = transcript.find_timestamp(insight.get("quote", "")) or timestamp
+    return timestamp
+
+
+def run_batch(args: argparse.Namespace) -> None:
+    """--batch mode: extract a directory of transcripts concurrently and report throughput"""
+    if not args.api:
+        print("❌ Error: --batch requires --api mode")
+        sys.exit(1)
+    if not HAS_ANTHROPIC:
+        print("❌ Error: anthropic library not installed. Run: pip install anthropic")
+        sys.exit(1)
+
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key and not args.base_url:
+        print("❌ Error: ANTHROPIC_API_KEY environment variable not set")
+        sys.exit(1)
+
+    batch_dir = Path(args.batch)
+    transcripts = sorted(batch_dir.glob("*.txt"))
+    if not transcripts:
+        print(f"❌ Error: No .txt transcripts found in {batch_dir}")
+        sys.exit(1)
+
+    print(f"📚 Extracting {len(transcripts)} transcripts ({args.concurrency} at a time)")
+    start = time.perf_counter()
+    written, skipped, failed = asyncio.run(extract_batch(
+        transcripts, Path(args.output_dir), api_key or "stub",
+        args.concurrency, args.max_retries, args.base_url, args.force, args.chunk_chars
+    ))
+    elapsed = time.perf_counter() - start
+
+    print()
+    print("Summary:")
+    print(f"  - Extracted: {len(written)}")
+    print(f"  - Skipped (unchanged): {len(skipped)}")
+    print(f"  - Failed: {len(failed)}")
+    print(f"  - Elapsed: {elapsed:.1f}s")
+    print(f"  - Throughput: {len(written) / elapsed * 60:.1f} transcripts/minute")
+    for transcript_path, error in failed:
+        print(f"  ❌ {transcript_path.name}: {error}")
+    if failed:
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Extract episode metadata from transcripts")
-    parser.add_argument("--transcript", required=True, help="Path to transcript file")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--transcript", help="Path to transcript file")
+    source.add_argument("--batch", metavar="DIR", help="Extract every .txt transcript in DIR (API mode only)")
     parser.add_argument("--manual", action="store_true", help="Manual mode (use Claude in Cowork)")
     parser.add_argument("--api", action="store_true", help="API mode (use Anthropic API)")
     parser.add_argument("--output-dir", default="output", help="Output directory for JSON files")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Batch mode: API calls in flight at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                        help=f"Batch mode: retries per transcript on rate limits/overload (default: {DEFAULT_MAX_RETRIES})")
+    parser.add_argument("--force", action="store_true",
+                        help="Batch mode: re-extract transcripts even if unchanged since the last run")
+    parser.add_argument("--chunk-chars", type=int, default=CHUNK_CHARS,
+                        help=f"API modes: split longer transcripts into parts of this size (default: {CHUNK_CHARS}); "
+                             f"manual mode always truncates at {CHUNK_CHARS}")
+    parser.add_argument("--base-url", default=None,
+                        help="API base URL, e.g. a local stub server (default: ANTHROPIC_BASE_URL or the Anthropic API)")
 
     args = parser.parse_args()
 
@@ -271,6 +911,10 @@ def main():
         print("❌ Error: Cannot use both --manual and --api")
         sys.exit(1)
 
+    if args.batch:
+        run_batch(args)
+        return
+
     # Load transcript
     transcript_path = Path(args.transcript)
     if not transcript_path.exists():
@@ -280,30 +924,39 @@ def main():
     guest_name = transcript_path.stem  # Filename without extension
     print(f"📄 Loading transcript: {guest_name}")
 
-    transcript_text = load_transcript(transcript_path)
-    print(f"✓ Loaded transcript ({len(transcript_text)} characters, {len(transcript_text.split())} words)")
+    transcript = Transcript.load(transcript_path)
+    print(f"✓ Loaded transcript ({len(transcript.text)} characters, {transcript.word_count} words, "
+          f"{len(transcript.turns)} speaker turns)")
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     # Extract metadata
-    if args.api:
-        import os
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            print("❌ Error: ANTHROPIC_API_KEY environment variable not set")
-            sys.exit(1)
-
-        extracted_data = extract_via_api(transcript_text, guest_name, api_key)
-    else:
-        extracted_data = extract_manual(transcript_text, guest_name)
+    try:
+        if args.api:
+            api_key = os.getenv("ANTHROPIC_API_KEY")
+            if not api_key and not args.base_url:
+                print("❌ Error: ANTHROPIC_API_KEY environment variable not set")
+                sys.exit(1)
+
+            extracted_data = extract_via_api(transcript, guest_name, api_key or "stub", args.base_url, args.chunk_chars)
+            parts = len(transcript.split(args.chunk_chars))
+        else:
+            extracted_data = extract_manual(transcript, guest_name)
+            parts = 1
+    except ExtractionError as e:
+        print(f"❌ Error: {e}")
+        for problem in e.problems:
+            print(f"  - {problem}")
+        print(f"Response saved to: {save_failed_response(output_dir, guest_name, e)}")
+        sys.exit(1)
 
     print(f"✓ Extracted metadata successfully")
 
     # Create episode JSON
-    episode = create_episode_json(extracted_data, guest_name, transcript_path)
+    episode = create_episode_json(extracted_data, guest_name, transcript, parts)
 
     # Save to file
-    output_dir = Path(args.output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-
     output_file = output_dir / f"{episode['id']}.json"
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(episode, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,362 @@
+"""
+Streaming parser and validator for extraction responses
+
+Model responses are fed in as they arrive (API stream deltas, or lines
+pasted in manual mode). The parser tracks JSON nesting as it goes, so
+every object in "key_insights" is validated the moment it closes, and
+insights that are complete before a response goes wrong are kept even if
+the rest cannot be parsed.
+
+At the end, the response is parsed with common defects repaired:
+
+- prose or ``` fences around the object, including braces in the prose
+  (a candidate object that is not JSON, or not an extraction, is skipped
+  and the scan restarts at the next "{")
+- trailing commas before } or ]
+- a response cut off mid-way (max_tokens): the open string is closed, the
+  dangling key or value dropped, and open objects and arrays closed
+
+The parsed fields are then checked against the episode schema: missing
+optional fields get defaults, wrong types are coerced where the intent is
+clear (a topics string becomes a list, relevance is clamped to 0-1), and
+insights without a quote or insight are dropped. Only a response with no
+summary or no valid insight at all is rejected, with ExtractionError.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+REQUIRED_INSIGHT_FIELDS = ("quote", "insight")
+
+# Top-level keys of an extraction; a JSON object with none of them is not one
+EXTRACTION_KEYS = ("guest_name", "episode_summary", "key_themes", "key_insights")
+
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+
+
+class ExtractionError(ValueError):
+    """
+    A response that could not be turned into a usable extraction.
+
+    Attributes:
+        response: The raw response text, so it can be saved and re-parsed
+                  without another API call
+        problems: What was wrong, one entry per defect
+    """
+
+    def __init__(self, message: str, response: str, problems: List[str]):
+        super().__init__(message)
+        self.response = response
+        self.problems = problems
+
+
+class StreamingExtractionParser:
+    """
+    Incrementally parses one extraction response.
+
+    Usage:
+        parser = StreamingExtractionParser(guest_name)
+        for text in stream:
+            parser.feed(text)
+        data = parser.result()
+
+    Attributes:
+        insights: Valid insights seen so far, in order
+        problems: Defects repaired or fields dropped so far
+    """
+
+    def __init__(self, guest_name: str = ""):
+        self.guest_name = guest_name
+        self.insights: List[Dict[str, Any]] = []
+        self.problems: List[str] = []
+        self._text = ""
+        self._scanned = 0
+        self._data: Optional[Dict[str, Any]] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget the candidate object (and what was streamed from it), to scan for another"""
+        self.insights = []
+        self._start = -1
+        self._end = -1
+        self._stack: List[str] = []
+        self._first = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._expect_key = False
+        self._key = ""
+        self._insight_start = -1
+        self._insight_count = 0
+        self._problems_before = len(self.problems)
+
+    def _open(self, i: int) -> None:
+        """Start a candidate top-level object at the "{" at ``i``"""
+        self._start = i
+        self._stack.append('{')
+        self._first = True
+        self._expect_key = True
+
+    def feed(self, text: str) -> None:
+        """Consume the next piece of the response"""
+        self._text += text
+        if self._end < 0:
+            self._scan()
+
+    @property
+    def response(self) -> str:
+        """Everything fed so far"""
+        return self._text
+
+    def _scan(self) -> None:
+        while True:
+            self._scan_candidate()
+            if self._end < 0:
+                return
+            # A complete object that is not an extraction ({"a": 1} quoted in
+            # prose): look for the next one
+            try:
+                data = json.loads(_TRAILING_COMMA_RE.sub(r"\1", self._text[self._start:self._end]))
+            except json.JSONDecodeError:
+                return
+            if isinstance(data, dict) and any(key in data for key in EXTRACTION_KEYS):
+                self._data = data
+                return
+            self._scanned = self._start + 1
+            del self.problems[self._problems_before:]
+            self._reset()
+
+    def _scan_candidate(self) -> None:
+        text = self._text
+        for i in range(self._scanned, len(text)):
+            char = text[i]
+            if self._start < 0:
+                if char == '{':
+                    self._open(i)
+                continue
+
+            if self._first:
+                if char.isspace():
+                    continue
+                self._first = False
+                if char not in '"}':
+                    # "{curly} notes" in prose: not a JSON object
+                    self._reset()
+                    if char == '{':
+                        self._open(i)
+                    continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1 and self._expect_key:
+                        self._key = text[self._string_start + 1:i]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in '{[':
+                self._stack.append(char)
+                if char == '{' and self._stack == ['{', '[', '{'] and self._key == 'key_insights':
+                    self._insight_start = i
+            elif char in '}]':
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if char == '}' and self._stack == ['{', '['] and self._insight_start >= 0:
+                    self._insight_closed(text[self._insight_start:i + 1])
+                    self._insight_start = -1
+                elif not self._stack:
+                    self._end = i + 1
+                    break
+            elif len(self._stack) == 1:
+                if char == ',':
+                    self._expect_key = True
+                elif char == ':':
+                    self._expect_key = False
+        self._scanned = len(text) if self._end < 0 else self._end
+
+    def _insight_closed(self, text: str) -> None:
+        self._insight_count += 1
+        try:
+            insight = json.loads(_TRAILING_COMMA_RE.sub(r"\1", text))
+        except json.JSONDecodeError as e:
+            self.problems.append(f"insight {self._insight_count}: invalid JSON ({e.msg})")
+            return
+        validated = validate_insight(insight, self._insight_count, self.problems)
+        if validated is not None:
+            self.insights.append(validated)
+
+    def _repair(self) -> str:
+        """The top-level object with trailing commas removed and, if truncated, closed"""
+        if self._end >= 0:
+            return _TRAILING_COMMA_RE.sub(r"\1", self._text[self._start:self._end])
+
+        self.problems.append("response was cut off; closed the open JSON")
+        text = self._text[self._start:]
+        if self._in_string:
+            text = text[:self._string_start - self._start]
+        # Drop the cut-off value and its key, then any dangling key or comma
+        while True:
+            stripped = text.rstrip()
+            stripped = re.sub(r"(?<=[:\[,])(\s*)[-\w.+]+$", r"\1", stripped).rstrip()
+            stripped = re.sub(r'"(?:[^"\\]|\\.)*"\s*:$', "", stripped).rstrip()
+            stripped = re.sub(r",$", "", stripped)
+            if stripped == text:
+                break
+            text = stripped
+        closers = {'{': '}', '[': ']'}
+        return _TRAILING_COMMA_RE.sub(r"\1", text) + "".join(closers[opener] for opener in reversed(self._stack))
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Parse, repair and validate the whole response.
+
+        If the object found cannot be parsed, a later object in the response
+        is tried before settling for the insights streamed from this one.
+
+        Raises:
+            ExtractionError: No JSON object, no summary, or no valid insight
+        """
+        response = self.response
+        if self._start < 0:
+            raise ExtractionError("Response contains no JSON object", response, ["no JSON object"])
+
+        data = self._data
+        if data is None:
+            try:
+                data = json.loads(self._repair())
+            except json.JSONDecodeError as e:
+                retried = self._retry_later()
+                if retried is not None:
+                    return retried
+                self.problems.append(f"could not repair JSON ({e.msg}); kept {len(self.insights)} streamed insights")
+                data = {}
+        if not isinstance(data, dict):
+            data = {}
+
+        validated = validate_extraction({**data, "key_insights": []}, self.guest_name, self.problems)
+        # The scanner already validated every insight that closed; this also
+        # drops an insight cut off part-way, which the repair would have closed
+        validated["key_insights"] = list(self.insights)
+
+        if not validated["episode_summary"] or not validated["key_insights"]:
+            missing = "episode_summary" if not validated["episode_summary"] else "key_insights"
+            raise ExtractionError(f"Response has no usable {missing}", response, self.problems + [f"no {missing}"])
+        return validated
+
+
+    def _retry_later(self) -> Optional[Dict[str, Any]]:
+        """Result of parsing the response from the next "{" on (e.g. past an unclosed brace in prose), if usable"""
+        later = self._text.find('{', self._start + 1)
+        if later < 0:
+            return None
+        retry = StreamingExtractionParser(self.guest_name)
+        retry.feed(self._text[later:])
+        try:
+            data = retry.result()
+        except ExtractionError:
+            return None
+        self.insights, self.problems = retry.insights, self.problems[:self._problems_before] + retry.problems
+        return data
+
+
+def _string(value: Any) -> str:
+    return value.strip() if isinstance(value, str) else ("" if value is None else str(value))
+
+
+def _string_list(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = re.split(r"[,;]", value)
+    if not isinstance(value, list):
+        return []
+    return [item.strip() for item in value if isinstance(item, str) and item.strip()]
+
+
+def _bool(value: Any, default: bool = True) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.strip().lower() not in ("false", "no", "0", "")
+    return default if value is None else bool(value)
+
+
+def validate_insight(insight: Any, number: int, problems: List[str]) -> Optional[Dict[str, Any]]:
+    """Normalize one insight, or return None (noting why) if it lacks a quote or insight"""
+    if not isinstance(insight, dict):
+        problems.append(f"insight {number}: not an object")
+        return None
+    missing = [field for field in REQUIRED_INSIGHT_FIELDS if not _string(insight.get(field))]
+    if missing:
+        problems.append(f"insight {number}: missing {', '.join(missing)}")
+        return None
+    return {
+        "quote": _string(insight["quote"]),
+        "timestamp": _string(insight.get("timestamp")) or "unknown",
+        "context": _string(insight.get("context")),
+        "insight": _string(insight["insight"]),
+        "topics": _string_list(insight.get("topics")),
+        "actionable": _bool(insight.get("actionable"))
+    }
+
+
+def validate_theme(theme: Any, number: int, problems: List[str]) -> Optional[Dict[str, Any]]:
+    """Normalize one theme, or return None if it has no name"""
+    if isinstance(theme, str):
+        theme = {"theme": theme}
+    if not isinstance(theme, dict) or not _string(theme.get("theme")):
+        problems.append(f"theme {number}: missing theme")
+        return None
+    try:
+        relevance = float(theme.get("relevance_score", 0.5))
+    except (TypeError, ValueError):
+        problems.append(f"theme {number}: relevance_score is not a number")
+        relevance = 0.5
+    return {
+        "theme": _string(theme["theme"]),
+        "description": _string(theme.get("description")),
+        "relevance_score": min(max(relevance, 0.0), 1.0)
+    }
+
+
+def validate_extraction(
+    data: Dict[str, Any],
+    guest_name: str = "",
+    problems: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Normalize a parsed extraction to the episode schema, noting anything dropped in ``problems``"""
+    problems = problems if problems is not None else []
+    themes = data.get("key_themes")
+    insights = data.get("key_insights")
+    validated = {
+        "guest_name": _string(data.get("guest_name")) or guest_name,
+        "guest_title": _string(data.get("guest_title")),
+        "guest_company": _string(data.get("guest_company")),
+        "guest_bio": _string(data.get("guest_bio")),
+        "episode_summary": _string(data.get("episode_summary")),
+        "topics": _string_list(data.get("topics")),
+        "key_themes": [],
+        "key_insights": []
+    }
+    for number, theme in enumerate(themes if isinstance(themes, list) else [], 1):
+        theme = validate_theme(theme, number, problems)
+        if theme is not None:
+            validated["key_themes"].append(theme)
+    for number, insight in enumerate(insights if isinstance(insights, list) else [], 1):
+        insight = validate_insight(insight, number, problems)
+        if insight is not None:
+            validated["key_insights"].append(insight)
+    return validated
+
+
+def parse_response(response_text: str, guest_name: str = "") -> Dict[str, Any]:
+    """Parse a complete response (the non-streaming entry point)"""
+    parser = StreamingExtractionParser(guest_name)
+    parser.feed(response_text)
+    return parser.result()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Local stub of the Anthropic Messages API for testing batch extraction
+
+Answers POST /v1/messages with a canned extraction for the guest named in
+the prompt, after a configurable delay, and rejects a configurable share of
+requests with 429 (with a retry-after header) so retry and backoff can be
+exercised without network access or API spend. Streaming requests get the
+same text as server-sent events; --truncate cuts a share of responses short
+(stop_reason "max_tokens") to exercise response repair.
+
+Usage:
+    python stub_api_server.py --port 8765 --latency 1.0 --rate-limit 0.2 --truncate 0.1
+
+    # In another terminal
+    python extract_episode_metadata.py --batch transcripts/ --api --base-url http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_GUEST_RE = re.compile(r"- Full name: (.+)")
+_PART_RE = re.compile(r"This is part (\d+) of (\d+)")
+
+_WORDS = ("hiring pricing roadmap feedback culture growth retention strategy metrics "
+          "onboarding leverage focus coaching delegation ownership clarity trust speed "
+          "quality design sales churn experiments narrative").split()
+
+
+def stub_quote(guest_name: str, seed: int) -> str:
+    """A quote whose words differ for every seed"""
+    words = " ".join(random.Random(seed).sample(_WORDS, 12))
+    return f"{guest_name} on {words}."
+
+
+def canned_extraction(guest_name: str, part: int = 0) -> dict:
+    """
+    A valid extraction result for ``guest_name``.
+
+    For part prompts, quotes differ per part except the first, which is
+    the same in every part, so merging has a duplicate to remove.
+    """
+    suffix = f" (part {part})" if part else ""
+    return {
+        "guest_name": guest_name,
+        "guest_title": "Stub Title",
+        "guest_company": "Stub Company",
+        "guest_bio": f"{guest_name} is a placeholder guest produced by the stub API.",
+        "episode_summary": f"A stub episode with {guest_name} about leadership and strategy.",
+        "topics": ["leadership", "strategy"],
+        "key_themes": [
+            {"theme": "Stub Theme", "description": "A placeholder theme.", "relevance_score": 0.9},
+            {"theme": f"Stub Theme{suffix}", "description": "A per-part theme.", "relevance_score": 0.5}
+        ],
+        "key_insights": [
+            {
+                "quote": stub_quote(guest_name, part * 8 + i if i > 1 else 0),
+                "timestamp": f"{i:02d}:00",
+                "context": "Placeholder context.",
+                "insight": f"Stub insight {i}.",
+                "topics": ["leadership"],
+                "actionable": True
+            }
+            for i in range(1, 9)
+        ]
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 1.0
+    rate_limit = 0.0
+    truncate = 0.0
+    counts = {"requests": 0, "rate_limited": 0, "truncated": 0}
+    lock = threading.Lock()
+
+    def do_POST(self):
+        length = int(self.headers.get("content-length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        with self.lock:
+            self.counts["requests"] += 1
+            limited = random.random() < self.rate_limit
+            truncated = not limited and random.random() < self.truncate
+            if limited:
+                self.counts["rate_limited"] += 1
+            if truncated:
+                self.counts["truncated"] += 1
+
+        if limited:
+            self._send(429, {"type": "error", "error": {"type": "rate_limit_error", "message": "stub rate limit"}},
+                       {"retry-after": "0.2"})
+            return
+
+        time.sleep(self.latency)
+        prompt = body.get("messages", [{}])[0].get("content", "")
+        match = _GUEST_RE.search(prompt if isinstance(prompt, str) else json.dumps(prompt))
+        guest_name = match.group(1).strip() if match else "Unknown Guest"
+        part = _PART_RE.search(prompt if isinstance(prompt, str) else "")
+        text = json.dumps(canned_extraction(guest_name, int(part.group(1)) if part else 0), indent=2)
+        stop_reason = "end_turn"
+        if truncated:
+            text, stop_reason = text[:len(text) * 3 // 4], "max_tokens"
+        message = {
+            "id": "msg_stub",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "stub"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4}
+        }
+        if body.get("stream"):
+            self._send_stream(message)
+        else:
+            self._send(200, message)
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, message, delta_chars=64):
+        """Send ``message`` as Messages API server-sent events, in small text deltas"""
+        text = message["content"][0]["text"]
+        events = [("message_start", {"type": "message_start", "message": {
+            **message, "content": [], "stop_reason": None, "usage": {**message["usage"], "output_tokens": 0}
+        }})]
+        events.append(("content_block_start", {"type": "content_block_start", "index": 0,
+                                               "content_block": {"type": "text", "text": ""}}))
+        for i in range(0, len(text), delta_chars):
+            events.append(("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                   "delta": {"type": "text_delta", "text": text[i:i + delta_chars]}}))
+        events.append(("content_block_stop", {"type": "content_block_stop", "index": 0}))
+        events.append(("message_delta", {"type": "message_delta",
+                                         "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+                                         "usage": {"output_tokens": message["usage"]["output_tokens"]}}))
+        events.append(("message_stop", {"type": "message_stop"}))
+
+        data = "".join(f"event: {name}\ndata: {json.dumps(payload)}\n\n" for name, payload in events).encode("utf-8")
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub Anthropic Messages API for extraction tests")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--latency", type=float, default=1.0, help="Seconds before each response (default: 1.0)")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="Share of requests answered with 429 (default: 0.0)")
+    parser.add_argument("--truncate", type=float, default=0.0,
+                        help="Share of responses cut short as if max_tokens was hit (default: 0.0)")
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    StubHandler.rate_limit = args.rate_limit
+    StubHandler.truncate = args.truncate
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), StubHandler)
+    print(f"Stub API listening on http://127.0.0.1:{args.port} "
+          f"(latency {args.latency}s, rate limit {args.rate_limit:.0%}, truncate {args.truncate:.0%})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Served {StubHandler.counts['requests']} requests "
+              f"({StubHandler.counts['rate_limited']} rate limited, "
+              f"{StubHandler.counts['truncated']} truncated)", flush=True)
+
+
+if __name__ == "__main__":
+    main()
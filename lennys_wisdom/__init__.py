@@ -7,6 +7,13 @@ featuring world-class product leaders.
 
 __version__ = "2.0.0"
 
-from .server import mcp
-
 __all__ = ["mcp"]
+
+
+def __getattr__(name):
+    # The server is imported on first use, so the episode directories can be
+    # configured (LENNYS_WISDOM_EPISODES) before the corpus loads
+    if name == "mcp":
+        from .server import mcp
+        return mcp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,9 +2,66 @@
 CLI entry point for Lenny's Wisdom MCP Server
 """
 
+import argparse
+import os
+from pathlib import Path
+
+from .corpus import EPISODE_DIRS_ENV
+
+
 def main():
     """Run the MCP server"""
-    from .server import mcp
+    parser = argparse.ArgumentParser(description="Lenny's Wisdom MCP Server")
+    parser.add_argument("--episodes-dir", metavar="DIR", action="append",
+                        help="Serve the episode JSON files in DIR; repeat to merge several directories "
+                             f"(earlier wins on duplicate ids). Default: ${EPISODE_DIRS_ENV} or the bundled episodes")
+    parser.add_argument("--build-snapshot", action="store_true",
+                        help="Compile the episode JSON files into a snapshot for faster startup, then exit")
+    parser.add_argument("--build-ann", action="store_true",
+                        help="Cluster the insight embeddings into an approximate nearest-neighbour index, then exit")
+    parser.add_argument("--ann-lists", type=int, default=None,
+                        help="Number of IVF clusters for --build-ann (default: about 4 * sqrt(vectors))")
+    parser.add_argument("--build-transcripts", metavar="DIR",
+                        help="Chunk and index the transcripts in DIR for search_transcripts, then exit")
+    parser.add_argument("--no-watch", action="store_true",
+                        help="Don't watch the episode directory; check for changed files on access instead")
+    args = parser.parse_args()
+
+    # Read by the server module when it builds the corpus
+    if args.episodes_dir:
+        os.environ[EPISODE_DIRS_ENV] = os.pathsep.join(args.episodes_dir)
+
+    from . import server
+    from .server import SNAPSHOT_PATH, corpus, mcp
+
+    if args.build_snapshot:
+        if len(corpus.episode_dirs) > 1:
+            parser.error("--build-snapshot needs a single episode directory")
+        corpus.write_snapshot(SNAPSHOT_PATH)
+        print(f"✓ Wrote {len(corpus.episodes())} episodes to {SNAPSHOT_PATH} "
+              f"({SNAPSHOT_PATH.stat().st_size:,} bytes)")
+        return
+
+    if args.build_ann:
+        if not server.HAS_NUMPY:
+            parser.error("--build-ann requires numpy. Run: pip install numpy")
+        embedding_index = server.corpus.index('semantic')
+        ann = embedding_index.build_ann(args.ann_lists)
+        ann.save(server.ANN_PATH)
+        print(f"✓ Wrote {len(ann.centroids)} clusters over {len(embedding_index)} vectors "
+              f"to {server.ANN_PATH}")
+        return
+
+    if args.build_transcripts:
+        from .transcripts import build_transcript_index
+        transcripts, passages = build_transcript_index(
+            corpus.episodes(), Path(args.build_transcripts), SNAPSHOT_PATH.parent
+        )
+        print(f"✓ Indexed {passages:,} passages from {transcripts} transcripts into {SNAPSHOT_PATH.parent}")
+        return
+
+    if not args.no_watch:
+        corpus.watch()
     mcp.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+"""
+Approximate nearest-neighbour search for the embedding matrix
+
+An inverted-file (IVF) index: spherical k-means splits the unit vectors
+into ``n_lists`` clusters, and a query only scans the rows of the
+``n_probe`` clusters whose centroids are closest to it. Candidates are
+rescored exactly against the live matrix, so the index stores only
+centroids and cluster membership, never a second copy of the vectors.
+
+Brute force stays exact and is fast enough for the bundled corpus; the IVF
+index pays off once passages number in the tens of thousands. Build it
+with ``lennys-wisdom --build-ann``; it is saved next to the episode data
+and ignored whenever the embedded units no longer match.
+
+Requires numpy.
+"""
+
+import hashlib
+import math
+import os
+import tempfile
+from pathlib import Path
+from typing import Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+ANN_NAME = "embeddings.ivf.npz"
+
+# Lists scanned per query; higher is slower but closer to exact
+N_PROBE = 32
+
+# Training points per centroid and k-means iterations
+TRAINING_POINTS_PER_LIST = 40
+KMEANS_ITERATIONS = 10
+
+# Rows per block when assigning vectors to centroids (bounds memory use)
+ASSIGN_BLOCK = 8192
+
+
+def default_lists(count: int) -> int:
+    """Number of clusters for ``count`` vectors (about 4 * sqrt(count))"""
+    return max(1, min(count, int(4 * math.sqrt(count))))
+
+
+def units_fingerprint(units: Sequence[Tuple[str, int]]) -> str:
+    """Digest of the ordered (episode_id, position) rows an index was built over"""
+    digest = hashlib.sha1()
+    for episode_id, position in units:
+        digest.update(f"{episode_id}\0{position}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for every row"""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BLOCK):
+        block = vectors[start:start + ASSIGN_BLOCK]
+        labels[start:start + ASSIGN_BLOCK] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def spherical_kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    iterations: int = KMEANS_ITERATIONS,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Cluster unit vectors by cosine similarity.
+
+    Returns:
+        (n_clusters, dimensions) unit-length centroids
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        norms = np.linalg.norm(sums, axis=1)
+        empty = norms == 0
+        # Re-seed empty clusters with random points instead of dropping them
+        if empty.any():
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+            norms[empty] = np.linalg.norm(sums[empty], axis=1)
+        centroids = sums / np.maximum(norms, 1e-12)[:, None]
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """
+    Centroids plus, per cluster, the matrix rows assigned to it.
+
+    Rows of cluster ``c`` are ``order[offsets[c]:offsets[c + 1]]``.
+
+    Args:
+        centroids: (n_lists, dimensions) unit vectors
+        order: Matrix row ids grouped by cluster
+        offsets: Start of every cluster in ``order``, plus the end
+        fingerprint: units_fingerprint() of the matrix rows
+
+    Attributes:
+        n_probe: Clusters scanned per query
+    """
+
+    def __init__(self, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray, fingerprint: str):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+        self.fingerprint = fingerprint
+        self.n_probe = N_PROBE
+
+    @classmethod
+    def build(
+        cls,
+        matrix: np.ndarray,
+        fingerprint: str,
+        n_lists: Optional[int] = None,
+        seed: int = 0
+    ) -> "IVFIndex":
+        """Cluster the rows of ``matrix`` (k-means is trained on a sample)"""
+        n_lists = n_lists or default_lists(len(matrix))
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(matrix), n_lists * TRAINING_POINTS_PER_LIST)
+        sample = matrix[np.sort(rng.choice(len(matrix), sample_size, replace=False))]
+        centroids = spherical_kmeans(sample, n_lists, seed=seed)
+
+        labels = _assign(matrix, centroids)
+        order = np.argsort(labels, kind='stable').astype(np.int64)
+        offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=n_lists), out=offsets[1:])
+        return cls(centroids, order, offsets, fingerprint)
+
+    def candidates(self, query_vector: np.ndarray) -> np.ndarray:
+        """Matrix rows in the ``n_probe`` clusters nearest to the query"""
+        n_probe = min(self.n_probe, len(self.centroids))
+        nearest = np.argpartition(-(self.centroids @ query_vector), n_probe - 1)[:n_probe]
+        return np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in nearest])
+
+    def save(self, path: Path) -> None:
+        """Atomically write the index as an .npz file"""
+        path = Path(path)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, centroids=self.centroids, order=self.order, offsets=self.offsets,
+                         fingerprint=np.array(self.fingerprint))
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> "IVFIndex":
+        """Read an index written by save()"""
+        with np.load(path) as data:
+            return cls(data['centroids'], data['order'], data['offsets'], str(data['fingerprint']))
+
+
+def recall_at_k(exact: Sequence[Sequence[Hashable]], approximate: Sequence[Sequence[Hashable]]) -> float:
+    """Fraction of the exact top-k results that the approximate search also returned"""
+    hits = sum(len(set(e) & set(a)) for e, a in zip(exact, approximate))
+    total = sum(len(e) for e in exact)
+    return hits / total if total else 1.0
@@ -0,0 +1,209 @@
+"""
+Token budgets for tool responses
+
+A tool called with ``max_tokens`` spends part of the budget on its fixed
+parts (title, summary, closing notes) and fills the rest with result items
+in rank order, stopping at the first item that no longer fits (or, for
+paginated tools, once ``limit`` items are shown). The items left over are
+reached by calling the tool again with the cursor the page returns.
+
+A cursor records the corpus version, the offset where the page stopped and
+the key of the last item shown (an episode id, an (episode, insight) pair,
+a guest name). Tools whose results are keyed resume just after that key:
+by bisection when the results are sorted by key, by looking the key up in a
+ranked list otherwise. Such cursors survive a corpus reload. Offset-only
+cursors are rejected once the corpus changes, so a page is never stitched
+onto results from a reloaded corpus.
+
+Token counts are estimated from the character count, which is free to
+compute and close enough for budgeting: BPE tokenizers average about four
+characters per token on English prose and markdown.
+"""
+
+import base64
+import binascii
+import bisect
+import json
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Average characters per token for English text
+CHARS_PER_TOKEN = 4
+
+# Tokens held back for the continuation note of a page that stops early
+CONTINUATION_TOKENS = 40
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate number of tokens in ``text``"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+EXPIRED_CURSOR = "The cursor has expired because the episodes changed. Repeat the call without a cursor."
+
+
+def encode_cursor(version: int, offset: int, key: Any = None) -> str:
+    """Opaque cursor for the page starting at ``offset``, after the item with ``key``"""
+    data = json.dumps([version, offset, key], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int, Any]:
+    """
+    (corpus version, offset, last key) stored in a cursor; list keys come back as tuples.
+
+    Raises:
+        ValueError: The cursor is malformed
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        version, offset, key = json.loads(data)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError(f"Invalid cursor '{cursor}'.")
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError(f"Invalid cursor '{cursor}'.")
+    return version, offset, tuple(key) if isinstance(key, list) else key
+
+
+class Page:
+    """
+    One page of a tool response under an optional token budget.
+
+    Usage:
+        page = Page(max_tokens, cursor, corpus.version, limit=limit, keyed=True)
+        page.resume(keys)
+        page.spend(header)
+        for key, item in zip(page.window(keys), page.window(items)):
+            if not page.add(render(item), key):
+                break
+            ...
+        more = page.next_cursor(len(items))
+
+    Args:
+        max_tokens: Budget for the whole response, or None for no limit
+        cursor: Cursor from the previous page, or None for the first page
+        version: Corpus version the results come from
+        limit: Most items on one page, or None for no limit
+        keyed: The tool calls ``resume`` with its result keys, so cursors
+               from an older corpus version can still be followed
+
+    Raises:
+        ValueError: ``cursor`` is invalid or expired, or ``max_tokens`` or
+                    ``limit`` is not positive
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int],
+        cursor: Optional[str],
+        version: int,
+        limit: Optional[int] = None,
+        keyed: bool = False
+    ):
+        if max_tokens is not None and max_tokens <= 0:
+            raise ValueError(f"Invalid max_tokens {max_tokens}. Use a positive number.")
+        if limit is not None and limit < 1:
+            # A page of no items would hand back a cursor to the same offset forever
+            raise ValueError(f"Invalid limit {limit}. Use a positive number.")
+        self.max_tokens = max_tokens
+        self.version = version
+        self.limit = limit
+        self.start = 0
+        self.after: Any = None
+        if cursor:
+            cursor_version, self.start, self.after = decode_cursor(cursor)
+            if cursor_version != version and not (keyed and self.after is not None):
+                raise ValueError(EXPIRED_CURSOR)
+        self.end = self.start
+        self.last: Any = None
+        self.used = CONTINUATION_TOKENS if max_tokens is not None else 0
+
+    def resume(self, keys: Sequence[Any], ordered: bool = True) -> int:
+        """
+        Position in ``keys`` just after the cursor's last key, which becomes
+        ``start``.
+
+        ``ordered`` keys are sorted, so the position is found by bisection
+        even if the key itself has since gone; otherwise the key is looked
+        up, trying the cursor's offset first.
+
+        Raises:
+            ValueError: The cursor belongs to another tool, or (unordered)
+                        its key is no longer in ``keys``
+        """
+        if self.after is None:
+            return self.start
+        try:
+            if ordered:
+                position = bisect.bisect_right(keys, self.after)
+            elif 0 < self.start <= len(keys) and keys[self.start - 1] == self.after:
+                position = self.start
+            else:
+                position = list(keys).index(self.after) + 1
+        except TypeError:
+            raise ValueError("Invalid cursor for this tool.")
+        except ValueError:
+            raise ValueError(EXPIRED_CURSOR)
+        self.start = self.end = position
+        return position
+
+    @property
+    def budgeted(self) -> bool:
+        """True when a token budget applies"""
+        return self.max_tokens is not None
+
+    def spend(self, text: str) -> None:
+        """Charge fixed content that is always shown"""
+        if self.budgeted:
+            self.used += estimate_tokens(text) + 1
+
+    def window(self, items: Sequence[T]) -> Sequence[T]:
+        """The part of ``items`` this page can show: from ``start``, at most ``limit`` of them"""
+        return items[self.start:] if self.limit is None else items[self.start:self.start + self.limit]
+
+    def add(self, text: str, key: Any = None) -> bool:
+        """
+        Charge the next item's text if the page has room for it.
+
+        Returns False, charging nothing, once the page holds ``limit`` items
+        or the budget is used up. The first item always fits, so paging makes
+        progress even when it alone exceeds the budget. ``key`` identifies
+        the item for the next cursor.
+        """
+        if self.limit is not None and self.end - self.start >= self.limit:
+            return False
+        if self.budgeted:
+            cost = estimate_tokens(text) + 1
+            if self.end > self.start and self.used + cost > self.max_tokens:
+                return False
+            self.used += cost
+        self.end += 1
+        self.last = key
+        return True
+
+    def take(
+        self,
+        items: Iterable[T],
+        render: Callable[[T], str],
+        key: Optional[Callable[[T], Any]] = None
+    ) -> List[T]:
+        """The leading ``items`` that fit, measuring each by ``render`` (only called under a budget)"""
+        taken = []
+        for item in items:
+            if not self.add(render(item) if self.budgeted else "", key(item) if key else None):
+                break
+            taken.append(item)
+        return taken
+
+    def next_cursor(self, total: int) -> Optional[str]:
+        """Cursor for the items after this page, or None if it reached the end"""
+        return encode_cursor(self.version, self.end, self.last) if self.end < total else None
+
+    def note(self, total: int) -> List[str]:
+        """Markdown lines telling the client how to fetch the rest, if anything is left"""
+        cursor = self.next_cursor(total)
+        if cursor is None:
+            return []
+        return [f"\n*Showing {self.start + 1}-{self.end} of {total}. "
+                f"Call again with cursor=\"{cursor}\" for the next page.*"]
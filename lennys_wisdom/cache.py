@@ -0,0 +1,100 @@
+"""
+Rendered-response cache for MCP tools
+
+Tool responses are pure functions of their arguments and the corpus, so the
+rendered markdown is cached under (tool name, normalized arguments, corpus
+version). A corpus reload bumps the version, which empties the cache.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+def freeze(value: Any) -> Hashable:
+    """Make a tool argument hashable (lists become tuples, dicts sorted items)"""
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return tuple(sorted(freeze(v) for v in value))
+    return value
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache with a time-to-live, keyed per tool call.
+
+    Args:
+        version: Returns the current corpus version; entries from older
+                 versions are dropped
+        maxsize: Maximum number of cached responses
+        ttl: Seconds a response stays valid
+    """
+
+    def __init__(self, version: Callable[[], int], maxsize: int = 256, ttl: float = 600.0):
+        self.version = version
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()  # key -> (stored at, response)
+        self._version = None
+        self._lock = threading.Lock()
+
+    def cached(self, fn: Callable) -> Callable:
+        """Decorator caching ``fn``'s return value (keeps its signature for MCP)"""
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            version = self.version()
+            key = (fn.__name__, version, freeze(tuple(bound.arguments.items())))
+
+            with self._lock:
+                if version != self._version:
+                    self._entries.clear()
+                    self._version = version
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+
+            result = fn(*args, **kwargs)
+
+            with self._lock:
+                if version == self._version:
+                    self._entries[key] = (time.monotonic(), result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+            return result
+
+        return wrapper
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'corpus_version': self._version
+            }
@@ -0,0 +1,502 @@
+"""
+Episode corpus for Lenny's Wisdom MCP Server
+
+The store keeps a lightweight manifest of every episode (id, guest, title,
+description, topics) in memory; full episode bodies are parsed on first
+access and held in a bounded LRU cache. On later access the store re-stats
+the episode directory (at most every ``check_interval`` seconds) and
+re-parses only the files whose mtime or size changed. Indexes registered
+with ``add_indexes`` are updated with just the changed episodes.
+
+If a fresh compiled snapshot (see snapshot.py) is available, the manifest
+and prebuilt indexes come from it, and episode bodies are decoded from the
+memory-mapped snapshot instead of parsing JSON files.
+
+A store can serve several episode directories (e.g. the bundled data and
+the extraction output) as one corpus. When the same episode id appears in
+more than one, the file in the earliest directory is served; the others
+take over if it is deleted.
+
+With ``watch()``, a background thread (see watcher.py) applies changes as
+soon as files change, and reads no longer check the directory at all.
+Reloads are copy-on-write: changed episodes are applied to copies of the
+manifest and indexes, which are published together as a new immutable
+``Generation`` in a single assignment. A reader that takes one generation
+(``corpus.generation()``) and reads everything from it never blocks and
+never sees a half-updated index or an index from another reload than the
+manifest.
+"""
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Protocol, Sequence, Tuple, TypedDict, Union
+
+from lennys_wisdom import snapshot
+from lennys_wisdom.watcher import DirectoryWatcher
+
+logger = logging.getLogger(__name__)
+
+# Episode directories to serve, separated by os.pathsep (":" or ";"), earliest first
+EPISODE_DIRS_ENV = "LENNYS_WISDOM_EPISODES"
+
+
+def episode_dirs_from_env(default: Path) -> List[Path]:
+    """The directories listed in LENNYS_WISDOM_EPISODES, or ``[default]`` if it is unset"""
+    value = os.environ.get(EPISODE_DIRS_ENV, "")
+    dirs = [Path(part).expanduser() for part in value.split(os.pathsep) if part.strip()]
+    return dirs or [Path(default)]
+
+
+class Theme(TypedDict, total=False):
+    """A key theme of an episode"""
+    theme: str
+    description: str
+    relevance_score: float
+
+
+class Insight(TypedDict, total=False):
+    """A single extracted insight (quote + takeaway)"""
+    id: str
+    quote: str
+    timestamp: str
+    context: str
+    insight: str
+    actionable_advice: str
+    topics: List[str]
+    actionable: bool
+
+
+class Episode(TypedDict, total=False):
+    """A fully extracted podcast episode"""
+    id: str
+    guest_id: str
+    guest_name: str
+    title: str
+    description: str
+    summary: str
+    topics: List[str]
+    key_themes: List[Theme]
+    key_insights: List[Insight]
+    frameworks_mentioned: List[str]
+    situations_addressed: List[str]
+    quotes_extracted: int
+    transcript_available: bool
+    transcript_path: str
+    transcript_word_count: int
+    extraction_metadata: Dict[str, Any]
+
+
+class FileStamp(NamedTuple):
+    """What we remember about an episode file to detect changes"""
+    mtime_ns: int
+    size: int
+    episode_id: str
+
+
+class ManifestEntry(NamedTuple):
+    """Episode metadata kept in memory for every episode"""
+    id: str
+    guest_name: str
+    title: str
+    description: str
+    topics: List[str]
+    path: Path
+    blob: Optional[Tuple[int, int]]  # (offset, length) in the snapshot, or None to read path
+
+
+def manifest_entry(episode: Episode, path: Path, blob: Optional[Tuple[int, int]] = None) -> ManifestEntry:
+    """Build the manifest entry for a parsed episode"""
+    return ManifestEntry(
+        id=episode['id'],
+        guest_name=episode.get('guest_name', ''),
+        title=episode.get('title', ''),
+        description=episode.get('description', ''),
+        topics=list(episode.get('topics', [])),
+        path=path,
+        blob=blob
+    )
+
+
+class CorpusIndex(Protocol):
+    """
+    Anything the store keeps in sync with the episodes it holds.
+
+    Reloads update a copy of the index, which the next generation holds in
+    its place; a published index object is never modified again. An index
+    may define ``copy()`` returning a copy that can be updated without
+    touching the original (sharing unchanged parts); others are deep-copied.
+    """
+
+    def add_episode(self, episode: Episode) -> None: ...
+
+    def remove_episode(self, episode_id: str) -> None: ...
+
+
+def staged_copy(index: CorpusIndex) -> CorpusIndex:
+    """A copy of ``index`` to apply a reload to"""
+    return index.copy() if hasattr(index, 'copy') else copy.deepcopy(index)
+
+
+class Generation(NamedTuple):
+    """One published state of the corpus, replaced as a whole and never modified"""
+    version: int
+    manifest: Dict[str, ManifestEntry]
+    ordered: List[ManifestEntry]  # manifest entries in directory then file name order
+    indexes: Dict[str, CorpusIndex]
+
+
+class CorpusStore:
+    """
+    Process-wide manifest, episode cache and index registry for one or more directories.
+
+    The store is safe to share between threads; reloads are serialized and
+    readers always see a complete manifest and complete indexes.
+
+    Args:
+        episodes_dir: Directory of ep-*.json files, or a list of them in
+                      order of precedence; the snapshot covers the first
+        check_interval: Minimum seconds between checks for changed files
+        snapshot_path: Optional compiled snapshot to start from
+        cache_size: Maximum number of full episode bodies kept in memory
+    """
+
+    def __init__(
+        self,
+        episodes_dir: Union[Path, Sequence[Path]],
+        check_interval: float = 2.0,
+        snapshot_path: Optional[Path] = None,
+        cache_size: int = 64
+    ):
+        dirs = [episodes_dir] if isinstance(episodes_dir, (str, os.PathLike)) else list(episodes_dir)
+        self.episode_dirs: List[Path] = list(dict.fromkeys(Path(d) for d in dirs))
+        self.episodes_dir = self.episode_dirs[0]
+        self.check_interval = check_interval
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.cache_size = cache_size
+        self.loaded_from_snapshot = False
+        self._current = Generation(0, {}, [], {})
+        self._stamps: Dict[Path, FileStamp] = {}
+        self._bodies: "OrderedDict[str, Episode]" = OrderedDict()
+        self._snapshot: Optional[snapshot.Snapshot] = None
+        self._last_check: Optional[float] = None
+        self._snapshot_indexes: Dict[str, str] = {}
+        self._snapshot_ids: set = set()
+        self._dir_rank = {episodes_dir: rank for rank, episodes_dir in enumerate(self.episode_dirs)}
+        self._lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._watchers: List[DirectoryWatcher] = []
+
+    @property
+    def version(self) -> int:
+        """Version of the published generation; bumped by every reload that changes something"""
+        return self._current.version
+
+    def generation(self) -> Generation:
+        """The current manifest and indexes, after reloading changed files if due for a check"""
+        self._maybe_refresh()
+        return self._current
+
+    def index(self, name: str) -> CorpusIndex:
+        """The current version of a registered index (take ``generation()`` to read several consistently)"""
+        return self.generation().indexes[name]
+
+    def manifest(self) -> List[ManifestEntry]:
+        """Return every episode's manifest entry, in directory then file name order"""
+        return self.generation().ordered
+
+    def episodes(self) -> List[Episode]:
+        """Return every full episode (parses all bodies; prefer manifest())"""
+        return [episode for episode in map(self.get, [e.id for e in self.manifest()]) if episode]
+
+    def get(self, episode_id: str) -> Optional[Episode]:
+        """Return a single episode by id, parsing it on first access, or None"""
+        self._maybe_refresh()
+        with self._cache_lock:
+            episode = self._bodies.get(episode_id)
+            if episode is not None:
+                self._bodies.move_to_end(episode_id)
+                return episode
+        entry = self._current.manifest.get(episode_id)
+        if entry is None:
+            return None
+        episode = self._load_body(entry)
+        self._cache(episode)
+        return episode
+
+    def current_version(self) -> int:
+        """Corpus version, after reloading changed files if due for a check"""
+        return self.generation().version
+
+    def cached_episodes(self) -> int:
+        """Number of full episode bodies currently held in memory"""
+        return len(self._bodies)
+
+    def watch(self, use_inotify: bool = True) -> List[DirectoryWatcher]:
+        """
+        Reload changed files from background threads (one per directory) as soon as they change.
+
+        Reads stop re-checking the directories while the watchers run.
+        """
+        self._maybe_refresh()
+        if not self._watching():
+            self.stop_watching()
+            self._watchers = [
+                DirectoryWatcher(episodes_dir, self.refresh, use_inotify=use_inotify).start()
+                for episodes_dir in self.episode_dirs
+            ]
+        return self._watchers
+
+    def stop_watching(self) -> None:
+        """Stop the background watchers; reads check for changes again"""
+        watchers, self._watchers = self._watchers, []
+        for watcher in watchers:
+            watcher.stop()
+
+    def _watching(self) -> bool:
+        return bool(self._watchers) and all(watcher.alive for watcher in self._watchers)
+
+    def _load_body(self, entry: ManifestEntry) -> Episode:
+        if entry.blob is not None and self._snapshot is not None:
+            return self._snapshot.episode(*entry.blob)
+        with open(entry.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _cache(self, episode: Episode) -> None:
+        with self._cache_lock:
+            self._bodies[episode['id']] = episode
+            self._bodies.move_to_end(episode['id'])
+            while len(self._bodies) > self.cache_size:
+                self._bodies.popitem(last=False)
+
+    def add_index(self, name: str, index: CorpusIndex) -> None:
+        """Build ``index`` over the current episodes and keep it up to date (see add_indexes)"""
+        self.add_indexes({name: index})
+
+    def add_indexes(self, indexes: Dict[str, CorpusIndex]) -> None:
+        """
+        Build several indexes over the current episodes and keep them up to date.
+
+        They are built in a single pass, so each episode body is read once
+        (from the cache if the initial load still holds it) however many
+        indexes there are; register indexes together rather than one by one.
+
+        If the corpus came from a snapshot holding a prebuilt index of the
+        same name, its state is adopted instead of rebuilding, then brought up
+        to date with episodes loaded from JSON since (changed files, or files
+        in other directories).
+        """
+        self._maybe_refresh()
+        with self._lock:
+            current = self._current
+            fresh: List[CorpusIndex] = []
+            adopted: List[CorpusIndex] = []
+            for name, index in indexes.items():
+                state = None
+                if self._snapshot_indexes.pop(name, None) == type(index).__name__:
+                    try:
+                        state = self._snapshot.index_state(name)
+                    except (KeyError, ValueError):
+                        logger.warning("Snapshot state of index %s is unreadable; rebuilding it", name)
+                if state is not None:
+                    index.__dict__.update(state)
+                    from_snapshot = {entry.id for entry in current.ordered if entry.blob is not None}
+                    for episode_id in self._snapshot_ids - from_snapshot:
+                        index.remove_episode(episode_id)
+                    adopted.append(index)
+                else:
+                    fresh.append(index)
+
+            for entry in current.ordered:
+                targets = fresh + adopted if entry.blob is None else fresh
+                if not targets:
+                    continue
+                with self._cache_lock:
+                    episode = self._bodies.get(entry.id)
+                if episode is None:
+                    episode = self._load_body(entry)
+                for index in targets:
+                    index.add_episode(episode)
+            self._current = current._replace(indexes={**current.indexes, **indexes})
+
+    def write_snapshot(self, path: Path) -> None:
+        """Compile the current episodes and registered indexes into a snapshot"""
+        if len(self.episode_dirs) > 1:
+            raise ValueError("A snapshot covers a single episode directory; "
+                             f"{len(self.episode_dirs)} are configured")
+        self.refresh()
+        with self._lock:
+            current = self._current
+            sources = snapshot.describe_sources(self.episodes_dir)
+            for json_file, stamp in self._stamps.items():
+                if json_file.name in sources:
+                    sources[json_file.name]['episode_id'] = stamp.episode_id
+            snapshot.write_snapshot(
+                path,
+                sources,
+                [
+                    {
+                        'id': entry.id,
+                        'guest_name': entry.guest_name,
+                        'title': entry.title,
+                        'description': entry.description,
+                        'topics': entry.topics,
+                        'file': entry.path.name
+                    }
+                    for entry in current.ordered
+                ],
+                [self._load_body(entry) for entry in current.ordered],
+                {
+                    name: (type(index).__name__, index.__dict__)
+                    for name, index in current.indexes.items()
+                }
+            )
+
+    def _load_snapshot(self) -> None:
+        """Take the manifest and index states from a fresh snapshot, if any"""
+        if not self.snapshot_path:
+            return
+        try:
+            opened = snapshot.open_snapshot(self.snapshot_path, self.episodes_dir)
+            if opened is None:
+                return
+        except (OSError, ValueError):
+            return
+
+        for name, source in opened.sources.items():
+            json_file = self.episodes_dir / name
+            stat = json_file.stat()
+            self._stamps[json_file] = FileStamp(stat.st_mtime_ns, stat.st_size, source['episode_id'])
+        manifest = {}
+        for item in opened.manifest:
+            manifest[item['id']] = ManifestEntry(
+                id=item['id'],
+                guest_name=item['guest_name'],
+                title=item['title'],
+                description=item['description'],
+                topics=item['topics'],
+                path=self.episodes_dir / item['file'],
+                blob=(item['offset'], item['length'])
+            )
+        self._snapshot = opened
+        self._snapshot_indexes = opened.index_types()
+        self._snapshot_ids = set(manifest)
+        self.loaded_from_snapshot = True
+        self._current = Generation(self.version + 1, manifest, self._sorted_entries(manifest), self._current.indexes)
+
+    def _file_order(self, path: Path) -> Tuple[int, str]:
+        """Sort key of an episode file: its directory's precedence, then its name"""
+        return self._dir_rank.get(path.parent, len(self._dir_rank)), path.name
+
+    def _sorted_entries(self, manifest: Dict[str, ManifestEntry]) -> List[ManifestEntry]:
+        """Manifest entries in directory then file name order"""
+        return sorted(manifest.values(), key=lambda entry: self._file_order(entry.path))
+
+    def _maybe_refresh(self) -> None:
+        last = self._last_check
+        if last is not None and self._watching():
+            return
+        if last is None or time.monotonic() - last >= self.check_interval:
+            self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        Re-stat the episode directories and reload added or modified files.
+
+        Files that fail to parse (e.g. still being written by hand) are
+        skipped and retried on the next refresh.
+
+        Returns:
+            True if any episode was added, changed or removed
+        """
+        with self._lock:
+            if self._last_check is None:
+                self._load_snapshot()
+            self._last_check = time.monotonic()
+            stamps = dict(self._stamps)
+            parsed: Dict[Path, Episode] = {}
+            seen = set()
+
+            for episodes_dir in self.episode_dirs:
+                for json_file in sorted(episodes_dir.glob("ep-*.json")):
+                    seen.add(json_file)
+                    try:
+                        stat = json_file.stat()
+                    except FileNotFoundError:
+                        continue
+                    old = stamps.get(json_file)
+                    if old and old.mtime_ns == stat.st_mtime_ns and old.size == stat.st_size:
+                        continue
+
+                    try:
+                        with open(json_file, 'r', encoding='utf-8') as f:
+                            episode = json.load(f)
+                        episode_id = episode['id']
+                    except (OSError, ValueError, KeyError, TypeError) as e:
+                        logger.warning("Skipping %s: %s", json_file, e)
+                        continue
+                    stamps[json_file] = FileStamp(stat.st_mtime_ns, stat.st_size, episode_id)
+                    parsed[json_file] = episode
+
+            for json_file in set(stamps) - seen:
+                del stamps[json_file]
+
+            # Each id is served from its first file in directory order
+            owners: Dict[str, Path] = {}
+            for json_file in sorted(stamps, key=self._file_order):
+                owners.setdefault(stamps[json_file].episode_id, json_file)
+
+            current = self._current
+            manifest = dict(current.manifest)
+            updated: List[Episode] = []
+            removed = [episode_id for episode_id in manifest if episode_id not in owners]
+            for episode_id in removed:
+                del manifest[episode_id]
+            for episode_id, json_file in owners.items():
+                entry = manifest.get(episode_id)
+                if json_file in parsed:
+                    episode = parsed[json_file]
+                elif entry is None or entry.path != json_file:
+                    # A shadowed, unchanged file takes over from one that went away
+                    try:
+                        with open(json_file, 'r', encoding='utf-8') as f:
+                            episode = json.load(f)
+                    except (OSError, ValueError) as e:
+                        logger.warning("Skipping %s: %s", json_file, e)
+                        if entry is not None:
+                            del manifest[episode_id]
+                            removed.append(episode_id)
+                        continue
+                else:
+                    continue
+                manifest[episode_id] = manifest_entry(episode, json_file)
+                updated.append(episode)
+
+            if not (updated or removed):
+                self._stamps = stamps
+                return False
+
+            # New bodies are cached before the indexes can point at them
+            for episode in updated:
+                self._cache(episode)
+
+            staged = {}
+            for name, index in current.indexes.items():
+                staged[name] = staged_copy(index)
+                for episode_id in removed:
+                    staged[name].remove_episode(episode_id)
+                for episode in updated:
+                    staged[name].add_episode(episode)
+
+            # Publish the manifest and indexes together in one assignment
+            self._current = Generation(current.version + 1, manifest, self._sorted_entries(manifest), staged)
+            self._stamps = stamps
+            with self._cache_lock:
+                for episode_id in removed:
+                    self._bodies.pop(episode_id, None)
+            return True
@@ -0,0 +1,201 @@
+"""
+Local semantic search over insights with hashed n-gram embeddings
+
+Every insight's quote, insight, context and topics are encoded into a
+fixed-size vector by feature hashing: each stemmed word and each character
+trigram of a word is hashed to a signed dimension. Vectors are L2
+normalized, so a query is one matrix-vector product (cosine similarity)
+followed by an argpartition top-k. Nothing is downloaded and no model runs;
+morphological variants and partial word overlaps score as similar even when
+the exact keywords differ.
+
+The per-episode vectors are a regular corpus index, so they are compiled
+into the snapshot by ``lennys-wisdom --build-snapshot`` and not recomputed
+at startup.
+
+Requires numpy (``pip install lennys-wisdom-mcp[semantic]``).
+"""
+
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from lennys_wisdom import serialize
+from lennys_wisdom.ann import IVFIndex, units_fingerprint
+from lennys_wisdom.corpus import Episode
+from lennys_wisdom.text import analyze
+
+# Vector size; more dimensions means fewer hash collisions
+DIMENSIONS = 1024
+
+# Weight of a whole-word feature relative to each of its character trigrams
+WORD_WEIGHT = 1.0
+TRIGRAM_WEIGHT = 0.5
+
+# Insight fields that are embedded, in addition to its topic tags
+INSIGHT_TEXT_FIELDS = ('quote', 'insight', 'context')
+
+# An embedded unit: (episode_id, insight position)
+Unit = Tuple[str, int]
+
+
+@lru_cache(maxsize=65536)
+def _word_features(word: str, dimensions: int) -> Tuple[Tuple[int, float], ...]:
+    """Hashed (dimension, signed weight) features of one stemmed word"""
+    features = [(f"w:{word}", WORD_WEIGHT)]
+    padded = f" {word} "
+    features.extend((padded[i:i + 3], TRIGRAM_WEIGHT) for i in range(len(padded) - 2))
+    hashed = []
+    for feature, weight in features:
+        h = zlib.crc32(feature.encode('utf-8'))
+        hashed.append((h % dimensions, weight if h & 0x80000000 else -weight))
+    return tuple(hashed)
+
+
+@serialize.register
+class HashingEncoder:
+    """
+    Encodes text into L2-normalized float32 vectors by feature hashing.
+
+    Args:
+        dimensions: Length of each vector
+    """
+
+    def __init__(self, dimensions: int = DIMENSIONS):
+        self.dimensions = dimensions
+
+    def encode(self, texts: Iterable[str]) -> np.ndarray:
+        """Encode texts into a (len(texts), dimensions) matrix, one row per text"""
+        texts = list(texts)
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vector = matrix[row]
+            for word in analyze(text):
+                for dimension, weight in _word_features(word, self.dimensions):
+                    vector[dimension] += weight
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+def insight_text(insight: Dict) -> str:
+    """The text of an insight that gets embedded"""
+    parts = [insight.get(field, '') for field in INSIGHT_TEXT_FIELDS]
+    parts.extend(topic.replace('-', ' ') for topic in insight.get('topics', []))
+    return "\n".join(parts)
+
+
+class EmbeddingIndex:
+    """
+    Insight vectors stored per episode, searched as one matrix.
+
+    Each episode's rows are kept separately so a changed episode is
+    re-encoded alone; the stacked matrix is rebuilt on the next search.
+    """
+
+    def __init__(self, encoder: Optional[HashingEncoder] = None):
+        self.encoder = encoder or HashingEncoder()
+        self.generation = 0
+        self._episode_vectors: Dict[str, np.ndarray] = {}
+        self._stacked_generation = -1
+        # (matrix, row -> unit, episode -> row span, fingerprint of the rows),
+        # replaced as a whole so concurrent searches never see a half-rebuilt stack
+        self._stacked: Tuple[np.ndarray, List[Unit], Dict[str, Tuple[int, int]], str] = (
+            np.zeros((0, self.encoder.dimensions), dtype=np.float32), [], {}, units_fingerprint([])
+        )
+
+    def copy(self) -> "EmbeddingIndex":
+        """A copy to update while this index keeps serving searches (vector arrays are shared, never modified)"""
+        clone = EmbeddingIndex.__new__(EmbeddingIndex)
+        clone.__dict__.update(self.__dict__)
+        clone._episode_vectors = dict(self._episode_vectors)
+        return clone
+
+    def add_episode(self, episode: Episode) -> None:
+        """Encode every insight of an episode"""
+        insights = episode.get('key_insights', [])
+        self._episode_vectors[episode['id']] = self.encoder.encode(insight_text(i) for i in insights)
+        self.generation += 1
+
+    def remove_episode(self, episode_id: str) -> None:
+        """Drop an episode's vectors"""
+        if self._episode_vectors.pop(episode_id, None) is not None:
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return sum(len(vectors) for vectors in self._episode_vectors.values())
+
+    def _stack(self) -> Tuple[np.ndarray, List[Unit], Dict[str, Tuple[int, int]], str]:
+        generation = self.generation
+        if self._stacked_generation == generation:
+            return self._stacked
+        vectors = dict(self._episode_vectors)
+        episode_ids = sorted(vectors)
+        units: List[Unit] = []
+        episode_rows: Dict[str, Tuple[int, int]] = {}
+        for episode_id in episode_ids:
+            count = len(vectors[episode_id])
+            episode_rows[episode_id] = (len(units), len(units) + count)
+            units.extend((episode_id, position) for position in range(count))
+        matrix = (np.vstack([vectors[episode_id] for episode_id in episode_ids]) if episode_ids
+                  else np.zeros((0, self.encoder.dimensions), dtype=np.float32))
+        self._stacked = (matrix, units, episode_rows, units_fingerprint(units))
+        self._stacked_generation = generation
+        return self._stacked
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        episode_ids: Optional[Iterable[str]] = None,
+        min_similarity: float = 0.0,
+        ann: Optional[IVFIndex] = None
+    ) -> List[Tuple[Unit, float]]:
+        """
+        Find the insights most similar to ``query``.
+
+        Args:
+            query: Free text
+            k: Maximum number of results
+            episode_ids: Only search insights of these episodes (default: all)
+            min_similarity: Drop results at or below this cosine similarity
+            ann: IVF index to scan only nearby clusters of a corpus-wide
+                 search; ignored if it was built over different rows
+
+        Returns:
+            Up to ``k`` ((episode_id, insight position), cosine similarity)
+            pairs, most similar first
+        """
+        matrix, units, episode_rows, fingerprint = self._stack()
+        if k <= 0 or not units:
+            return []
+        query_vector = self.encoder.encode([query])[0]
+        if not query_vector.any():
+            return []
+
+        if episode_ids is None and ann is not None and ann.fingerprint == fingerprint:
+            rows = ann.candidates(query_vector)
+            scores = matrix[rows] @ query_vector
+        elif episode_ids is None:
+            rows = np.arange(len(units))
+            scores = matrix @ query_vector
+        else:
+            spans = [episode_rows[e] for e in episode_ids if e in episode_rows]
+            if not spans:
+                return []
+            rows = np.concatenate([np.arange(begin, end) for begin, end in spans])
+            scores = matrix[rows] @ query_vector
+
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(len(scores))
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(units[rows[i]], float(scores[i])) for i in ranked if scores[i] > min_similarity]
+
+    def build_ann(self, n_lists: Optional[int] = None) -> IVFIndex:
+        """Cluster the current vectors into an IVF index for search(ann=...)"""
+        matrix, _, _, fingerprint = self._stack()
+        return IVFIndex.build(matrix, fingerprint, n_lists)
@@ -0,0 +1,113 @@
+"""
+Hybrid keyword + vector retrieval with reciprocal rank fusion
+
+The keyword path (BM25F) is precise on exact names such as "LNO" or "DHM";
+the vector path (hashed n-gram embeddings) recalls paraphrases. Both
+rankings are produced concurrently and fused by reciprocal rank fusion:
+
+    score(item) = sum over rankings of 1 / (RRF_K + rank)
+
+RRF only looks at ranks, so BM25 scores and cosine similarities never have
+to be put on the same scale. Each stage is timed so it is visible which one
+dominates latency.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Dampens the advantage of top ranks; 60 is the value from the original RRF paper
+RRF_K = 60
+
+# A ranked list of (item, stage score), best first
+Ranking = List[Tuple[Hashable, float]]
+
+STAGES = ('keyword', 'vector', 'fusion', 'total')
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Ranking], k: int = RRF_K) -> Ranking:
+    """
+    Fuse ranked lists into one.
+
+    Ties keep the order in which items were first seen, so the first ranking
+    (the keyword path) wins ties.
+    """
+    fused: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, (item, _) in enumerate(ranking, 1):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridRetriever:
+    """
+    Runs a keyword and a vector ranking concurrently and fuses them.
+
+    The vector stage runs on a worker thread (numpy releases the GIL during
+    the matrix product) while the keyword stage runs on the caller's thread.
+
+    Args:
+        k: RRF rank constant
+    """
+
+    def __init__(self, k: int = RRF_K):
+        self.k = k
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._timings = {stage: {'calls': 0, 'total_ms': 0.0, 'last_ms': 0.0} for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def fuse(
+        self,
+        keyword: Callable[[], Ranking],
+        vector: Optional[Callable[[], Ranking]] = None
+    ) -> Ranking:
+        """
+        Run both stages and return the fused ranking.
+
+        Args:
+            keyword: Produces the keyword ranking
+            vector: Produces the vector ranking (skipped when None)
+
+        Returns:
+            (item, fused score) pairs, best first
+        """
+        start = time.perf_counter()
+        future = None
+        if vector is not None:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hybrid")
+            future = self._executor.submit(self._timed, 'vector', vector)
+
+        rankings = [self._timed('keyword', keyword)]
+        if future is not None:
+            rankings.append(future.result())
+
+        fused = self._timed('fusion', lambda: reciprocal_rank_fusion(rankings, self.k))
+        self._record('total', time.perf_counter() - start)
+        return fused
+
+    def _timed(self, stage: str, fn: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = fn()
+        self._record(stage, time.perf_counter() - start)
+        return result
+
+    def _record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            timing = self._timings[stage]
+            timing['calls'] += 1
+            timing['total_ms'] += seconds * 1000
+            timing['last_ms'] = seconds * 1000
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage call count, mean and last latency in milliseconds"""
+        with self._lock:
+            return {
+                stage: {
+                    'calls': timing['calls'],
+                    'mean_ms': timing['total_ms'] / timing['calls'] if timing['calls'] else 0.0,
+                    'last_ms': timing['last_ms']
+                }
+                for stage, timing in self._timings.items()
+            }
@@ -0,0 +1,630 @@
+"""
+Search indexes built over the in-memory corpus
+
+Indexes are registered with the CorpusStore, which calls ``add_episode`` and
+``remove_episode`` as episode files appear, change or disappear, so they are
+built once at load time and kept up to date incrementally.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from lennys_wisdom import serialize
+from lennys_wisdom.corpus import Episode
+from lennys_wisdom.text import analyze, analyze_tags, tokenize
+
+# Sentinel insight position for fields that belong to the episode itself
+EPISODE_LEVEL = -1
+
+# Episode-level fields that are indexed
+EPISODE_FIELDS = ('title', 'description', 'summary')
+
+# Insight-level fields that are indexed
+INSIGHT_FIELDS = ('quote', 'insight', 'context')
+
+
+@serialize.register
+class DocKey(NamedTuple):
+    """One indexed field of an episode or of one of its insights"""
+    episode_id: str
+    insight: int  # position in key_insights, or EPISODE_LEVEL
+    field: str
+
+
+def episode_fields(episode: Episode) -> Iterable[Tuple[DocKey, List[str]]]:
+    """Yield (DocKey, analyzed terms) for every searchable field of an episode"""
+    episode_id = episode['id']
+    for field in EPISODE_FIELDS:
+        yield DocKey(episode_id, EPISODE_LEVEL, field), analyze(episode.get(field, ''))
+    yield DocKey(episode_id, EPISODE_LEVEL, 'topics'), analyze_tags(episode.get('topics', []))
+    yield DocKey(episode_id, EPISODE_LEVEL, 'themes'), analyze(' '.join(
+        f"{theme.get('theme', '')} {theme.get('description', '')}"
+        for theme in episode.get('key_themes', [])
+    ))
+    for position, insight in enumerate(episode.get('key_insights', [])):
+        for field in INSIGHT_FIELDS:
+            yield DocKey(episode_id, position, field), analyze(insight.get(field, ''))
+        yield DocKey(episode_id, position, 'topics'), analyze_tags(insight.get('topics', []))
+
+
+class InvertedIndex:
+    """
+    Token -> postings index over every searchable field in the corpus.
+
+    Every indexed field gets an integer doc id; postings map each doc id to
+    the term frequency of the token in that field.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.docs: Dict[int, DocKey] = {}
+        self.doc_lengths: Dict[int, int] = {}
+        self.unit_count = 0
+        self.generation = 0  # bumped on every change, for derived caches
+        self._field_lengths: Dict[str, List[int]] = {}
+        self._next_doc = 0
+        self._episode_units: Dict[str, int] = {}
+        self._episode_postings: Dict[str, List[Tuple[str, int]]] = {}
+        self._vocabulary: Optional[List[str]] = None
+        # Tokens whose postings dict is still shared with the index this was copied from
+        self._shared: Set[str] = set()
+
+    def copy(self) -> "InvertedIndex":
+        """
+        A copy that can be updated while this index keeps serving searches.
+
+        Postings dicts are shared and only copied when the copy first
+        changes them, so copying costs one pass over the vocabulary rather
+        than over every posting.
+        """
+        clone = InvertedIndex.__new__(InvertedIndex)
+        clone.__dict__.update(self.__dict__)
+        clone.postings = dict(self.postings)
+        clone.docs = dict(self.docs)
+        clone.doc_lengths = dict(self.doc_lengths)
+        clone._field_lengths = {field: list(totals) for field, totals in self._field_lengths.items()}
+        clone._episode_units = dict(self._episode_units)
+        clone._episode_postings = dict(self._episode_postings)
+        clone._shared = set(self.postings)
+        return clone
+
+    def _writable_postings(self, token: str) -> Dict[int, int]:
+        """The postings of ``token``, copied first if still shared with another index"""
+        postings = self.postings.get(token)
+        if postings is None:
+            postings = self.postings[token] = {}
+        elif token in self._shared:
+            postings = self.postings[token] = dict(postings)
+            self._shared.discard(token)
+        return postings
+
+    def add_episode(self, episode: Episode) -> None:
+        """Index (or re-index) all fields of an episode"""
+        self.remove_episode(episode['id'])
+        added = []
+        for key, tokens in episode_fields(episode):
+            if not tokens:
+                continue
+            doc = self._next_doc
+            self._next_doc += 1
+            self.docs[doc] = key
+            self.doc_lengths[doc] = len(tokens)
+            totals = self._field_lengths.setdefault(key.field, [0, 0])
+            totals[0] += len(tokens)
+            totals[1] += 1
+            for token, tf in Counter(tokens).items():
+                self._writable_postings(token)[doc] = tf
+                added.append((token, doc))
+        self._episode_postings[episode['id']] = added
+        # The episode itself plus one unit per insight
+        units = len(episode.get('key_insights', [])) + 1
+        self._episode_units[episode['id']] = units
+        self.unit_count += units
+        self.generation += 1
+        self._vocabulary = None
+
+    def remove_episode(self, episode_id: str) -> None:
+        """Drop every posting that belongs to an episode"""
+        added = self._episode_postings.pop(episode_id, None)
+        if added is None:
+            return
+        for token, doc in added:
+            postings = self._writable_postings(token)
+            del postings[doc]
+            if not postings:
+                del self.postings[token]
+                self._shared.discard(token)
+            key = self.docs.pop(doc, None)
+            length = self.doc_lengths.pop(doc, None)
+            if key is not None and length is not None:
+                totals = self._field_lengths[key.field]
+                totals[0] -= length
+                totals[1] -= 1
+        self.unit_count -= self._episode_units.pop(episode_id, 0)
+        self.generation += 1
+        self._vocabulary = None
+
+    def episode_postings(self, episode_id: str) -> List[Tuple[str, int]]:
+        """(token, doc id) pairs indexed for one episode"""
+        return self._episode_postings.get(episode_id, [])
+
+    def average_length(self, field: str) -> float:
+        """Mean token length of a field across the corpus"""
+        total, count = self._field_lengths.get(field, (0, 0))
+        return total / count if count else 1.0
+
+    def expand(self, prefix: str) -> List[str]:
+        """Return every indexed token that starts with ``prefix``"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        terms = []
+        i = bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            terms.append(vocabulary[i])
+            i += 1
+        return terms
+
+    def match(self, query: str) -> Set[DocKey]:
+        """
+        Return the fields that contain every query token.
+
+        Each query token also matches longer tokens it is a prefix of, so
+        "lead" matches "leadership" as the old substring search did.
+        """
+        matched: Optional[Set[int]] = None
+        for token in dict.fromkeys(analyze(query)):
+            docs = set()
+            for term in self.expand(token):
+                docs.update(self.postings[term])
+            matched = docs if matched is None else matched & docs
+            if not matched:
+                return set()
+        return {self.docs[doc] for doc in matched or ()}
+
+
+class SituationIndex:
+    """
+    Situation -> episodes lookup built from each episode's situations_addressed.
+
+    Situation ids look like "situation-moving-to-new-company". A free-text
+    situation is matched against them by shared analyzed terms, giving a
+    small set of candidate episodes to score instead of the whole corpus.
+    """
+
+    PREFIX = "situation-"
+
+    # Fraction of a situation's terms the text must contain to match it
+    MIN_COVERAGE = 0.5
+
+    def __init__(self):
+        self.situations: Dict[str, Set[str]] = {}
+        self._terms: Dict[str, Set[str]] = {}
+        self._situation_terms: Dict[str, List[str]] = {}
+        self._episode_situations: Dict[str, List[str]] = {}
+
+    def add_episode(self, episode: Episode) -> None:
+        """Register every situation an episode addresses"""
+        self.remove_episode(episode['id'])
+        situations = list(dict.fromkeys(episode.get('situations_addressed', [])))
+        for situation in situations:
+            if situation not in self.situations:
+                self.situations[situation] = set()
+                terms = list(dict.fromkeys(analyze(situation[len(self.PREFIX):]
+                                                   if situation.startswith(self.PREFIX) else situation)))
+                self._situation_terms[situation] = terms
+                for term in terms:
+                    self._terms.setdefault(term, set()).add(situation)
+            self.situations[situation].add(episode['id'])
+        self._episode_situations[episode['id']] = situations
+
+    def remove_episode(self, episode_id: str) -> None:
+        """Forget an episode, dropping situations no other episode addresses"""
+        for situation in self._episode_situations.pop(episode_id, []):
+            episodes = self.situations[situation]
+            episodes.discard(episode_id)
+            if episodes:
+                continue
+            del self.situations[situation]
+            for term in self._situation_terms.pop(situation):
+                self._terms[term].discard(situation)
+                if not self._terms[term]:
+                    del self._terms[term]
+
+    def match(self, text: str) -> List[str]:
+        """
+        Return the situation ids that ``text`` describes, best match first.
+
+        An exact situation id (or its slug, e.g. "pricing strategy") is a
+        single dictionary lookup; otherwise situations are matched by term
+        coverage.
+        """
+        slug = "-".join(text.casefold().split())
+        for candidate in (slug, self.PREFIX + slug):
+            if candidate in self.situations:
+                return [candidate]
+
+        words = set(analyze(text))
+        overlap: Dict[str, int] = {}
+        for word in words:
+            for situation in self._terms.get(word, ()):
+                overlap[situation] = overlap.get(situation, 0) + 1
+
+        matched = []
+        for situation, shared in overlap.items():
+            size = len(self._situation_terms[situation])
+            if shared >= min(2, size) and shared / size >= self.MIN_COVERAGE:
+                matched.append((shared / size, shared, situation))
+        return [situation for _, _, situation in sorted(matched, reverse=True)]
+
+    def episodes_for(self, situations: Iterable[str]) -> Set[str]:
+        """Ids of every episode addressing any of the given situations"""
+        episodes: Set[str] = set()
+        for situation in situations:
+            episodes |= self.situations.get(situation, set())
+        return episodes
+
+
+def framework_entries(episode: Episode) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Normalize an episode's frameworks_mentioned into (id, name, description).
+
+    Older extractions list framework ids ("framework-lno-001") or plain names;
+    newer ones list {"name": ..., "description": ...} objects.
+    """
+    entries = []
+    for mention in episode.get('frameworks_mentioned') or []:
+        if isinstance(mention, dict):
+            name = mention.get('name')
+            framework_id = mention.get('id') or name
+            if framework_id:
+                entries.append((framework_id, name, mention.get('description')))
+        elif mention:
+            entries.append((mention, None, None))
+    return entries
+
+
+def framework_key(name: str) -> str:
+    """Casefold a framework id or name, treating hyphens as spaces and collapsing whitespace"""
+    return ' '.join(name.replace('-', ' ').casefold().split())
+
+
+def framework_aliases(entry: Dict[str, Any], names: Optional[Dict[str, str]] = None,
+                      full: bool = True) -> Set[str]:
+    """
+    Lookup keys for a framework entry.
+
+    Args:
+        entry: FrameworkIndex entry
+        names: Display names by framework id
+        full: The id and full names if True, otherwise their short forms
+
+    Returns:
+        Set of framework_key() values
+    """
+    framework_id = entry['id']
+    labels = [label for label in (entry['name'], (names or {}).get(framework_id)) if label]
+    if full:
+        return {framework_key(label) for label in [framework_id] + labels}
+    aliases = {framework_key(label.split(' (')[0]) for label in labels}
+    short_id = re.fullmatch(r'framework-(.+?)(?:-\d+)?', framework_id)
+    if short_id:
+        aliases.add(framework_key(short_id.group(1)))
+    return aliases - {''}
+
+
+class FrameworkIndex:
+    """
+    Framework id -> episodes mentioning it and insights that reference it.
+
+    Each episode's contribution is stored separately so an edited or deleted
+    episode only touches the frameworks it mentions. Insights are stored as
+    positions in the episode's key_insights, not copies, so the index stays
+    small and callers load only the episodes they display.
+    """
+
+    def __init__(self):
+        self.frameworks: Dict[str, Dict[str, Any]] = {}
+        self._episode_frameworks: Dict[str, List[str]] = {}
+
+    def add_episode(self, episode: Episode) -> None:
+        """Record the frameworks an episode mentions and the insights citing them"""
+        self.remove_episode(episode['id'])
+        framework_ids = []
+        for framework_id, name, description in framework_entries(episode):
+            entry = self.frameworks.setdefault(framework_id, {
+                'id': framework_id,
+                'name': name,
+                'description': description,
+                'mentions': {}
+            })
+            entry['name'] = entry['name'] or name
+            entry['description'] = entry['description'] or description
+
+            needle = framework_id.lower()
+            entry['mentions'][episode['id']] = {
+                'guest': episode['guest_name'],
+                'episode_id': episode['id'],
+                'insights': [
+                    position for position, insight in enumerate(episode.get('key_insights', []))
+                    if (needle in insight.get('quote', '').lower() or
+                        needle in insight.get('insight', '').lower() or
+                        needle in insight.get('context', '').lower())
+                ]
+            }
+            framework_ids.append(framework_id)
+        self._episode_frameworks[episode['id']] = framework_ids
+
+    def remove_episode(self, episode_id: str) -> None:
+        """Drop an episode's mentions, and frameworks nobody else mentions"""
+        for framework_id in self._episode_frameworks.pop(episode_id, []):
+            entry = self.frameworks.get(framework_id)
+            if entry is None:
+                continue
+            entry['mentions'].pop(episode_id, None)
+            if not entry['mentions']:
+                del self.frameworks[framework_id]
+
+    def get(self, framework_id: str, names: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a framework by id or by any name it is shown under.
+
+        Names are compared case-insensitively with hyphens and runs of spaces
+        collapsed, so a title-cased id matches the id. Short names (the part
+        of a name before " (", or an id without "framework-" and "-001") are
+        only tried when nothing matches in full.
+
+        Args:
+            framework_id: Framework id, name or display name
+            names: Display names by framework id, checked along with the stored names
+
+        Returns:
+            The framework's entry, or None if nothing matches
+        """
+        entry = self.frameworks.get(framework_id)
+        if entry is not None:
+            return entry
+        wanted = framework_key(framework_id)
+        for full in (True, False):
+            for entry in self.frameworks.values():
+                if wanted in framework_aliases(entry, names, full):
+                    return entry
+        return None
+
+    @staticmethod
+    def mentions(entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """A framework's mentions in episode order"""
+        return [entry['mentions'][episode_id] for episode_id in sorted(entry['mentions'])]
+
+
+def normalize_name(name: str) -> str:
+    """Casefold a person's name, strip accents and collapse punctuation"""
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(tokenize(stripped))
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of a normalized name, padded at word edges"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class GuestIndex:
+    """
+    Normalized guest name -> all of that guest's episodes.
+
+    Lookups try, in order: the exact normalized name, names whose words
+    start with every query word ("chesky", "ben h"), then trigram
+    similarity for misspellings ("shreyas doshy").
+    """
+
+    # Minimum trigram Jaccard similarity for a fuzzy match
+    MIN_SIMILARITY = 0.3
+
+    def __init__(self):
+        self.guests: Dict[str, Dict[str, Any]] = {}
+        self._words: Dict[str, Set[str]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._episode_guest: Dict[str, str] = {}
+        self._vocabulary: Optional[List[str]] = None
+
+    def add_episode(self, episode: Episode) -> None:
+        """Map an episode to its guest"""
+        self.remove_episode(episode['id'])
+        key = normalize_name(episode.get('guest_name', ''))
+        if not key:
+            return
+        guest = self.guests.get(key)
+        if guest is None:
+            guest = self.guests[key] = {'name': episode['guest_name'], 'episodes': set()}
+            for word in key.split():
+                self._words.setdefault(word, set()).add(key)
+            for gram in trigrams(key):
+                self._trigrams.setdefault(gram, set()).add(key)
+            self._vocabulary = None
+        guest['episodes'].add(episode['id'])
+        self._episode_guest[episode['id']] = key
+
+    def remove_episode(self, episode_id: str) -> None:
+        """Unmap an episode, dropping its guest if they have no episodes left"""
+        key = self._episode_guest.pop(episode_id, None)
+        if key is None:
+            return
+        guest = self.guests[key]
+        guest['episodes'].discard(episode_id)
+        if guest['episodes']:
+            return
+        del self.guests[key]
+        for word in key.split():
+            self._words[word].discard(key)
+            if not self._words[word]:
+                del self._words[word]
+        for gram in trigrams(key):
+            self._trigrams[gram].discard(key)
+            if not self._trigrams[gram]:
+                del self._trigrams[gram]
+        self._vocabulary = None
+
+    def _prefix_matches(self, word: str) -> Set[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._words)
+        vocabulary = self._vocabulary
+        keys: Set[str] = set()
+        i = bisect_left(vocabulary, word)
+        while i < len(vocabulary) and vocabulary[i].startswith(word):
+            keys |= self._words[vocabulary[i]]
+            i += 1
+        return keys
+
+    def lookup(self, name: str) -> List[str]:
+        """Return matching guest keys, best match first"""
+        query = normalize_name(name)
+        if not query:
+            return []
+        if query in self.guests:
+            return [query]
+
+        matched: Optional[Set[str]] = None
+        for word in query.split():
+            keys = self._prefix_matches(word)
+            matched = keys if matched is None else matched & keys
+            if not matched:
+                break
+        if matched:
+            return sorted(matched)
+
+        query_grams = trigrams(query)
+        shared: Dict[str, int] = {}
+        for gram in query_grams:
+            for key in self._trigrams.get(gram, ()):
+                shared[key] = shared.get(key, 0) + 1
+        scored = []
+        for key, count in shared.items():
+            similarity = count / len(query_grams | trigrams(key))
+            if similarity >= self.MIN_SIMILARITY:
+                scored.append((similarity, key))
+        return [key for _, key in sorted(scored, key=lambda item: (-item[0], item[1]))]
+
+    def episodes(self, key: str) -> List[str]:
+        """A guest's episode ids in a stable order"""
+        return sorted(self.guests[key]['episodes'])
+
+
+def iter_bits(mask: int) -> List[int]:
+    """Positions of the set bits in ``mask``, lowest first"""
+    bits = bin(mask)[:1:-1]
+    return [position for position, bit in enumerate(bits) if bit == '1']
+
+
+class TopicIndex:
+    """
+    Topic tag -> bitsets over insight and episode slots.
+
+    Every insight and episode gets an integer slot; each topic tag keeps a
+    Python int with one bit per slot carrying that tag, and ``actionable``
+    marks actionable insights. Queries such as "actionable AND hiring" or
+    "hiring OR firing" are then bitwise operations on a handful of ints.
+    Topic queries match tags containing the text, as the tools always did.
+    """
+
+    def __init__(self):
+        self.insight_topics: Dict[str, int] = {}
+        self.episode_topics: Dict[str, int] = {}
+        self.actionable = 0
+        self._insight_slots: List[Optional[Tuple[str, int]]] = []
+        self._episode_slots: List[Optional[str]] = []
+        self._free_insight_slots: List[int] = []
+        self._free_episode_slots: List[int] = []
+        self._episode_state: Dict[str, Tuple[int, List[int]]] = {}
+
+    @staticmethod
+    def _allocate(slots: list, free: List[int], value: Any) -> int:
+        if free:
+            slot = free.pop()
+            slots[slot] = value
+        else:
+            slot = len(slots)
+            slots.append(value)
+        return slot
+
+    @staticmethod
+    def _set(bitsets: Dict[str, int], tags: Iterable[str], slot: int) -> None:
+        bit = 1 << slot
+        for tag in set(t.lower() for t in tags):
+            bitsets[tag] = bitsets.get(tag, 0) | bit
+
+    @staticmethod
+    def _clear(bitsets: Dict[str, int], slot: int) -> None:
+        bit = 1 << slot
+        for tag in [tag for tag, mask in bitsets.items() if mask & bit]:
+            bitsets[tag] &= ~bit
+            if not bitsets[tag]:
+                del bitsets[tag]
+
+    def add_episode(self, episode: Episode) -> None:
+        """Set the episode's and its insights' bits"""
+        self.remove_episode(episode['id'])
+        episode_slot = self._allocate(self._episode_slots, self._free_episode_slots, episode['id'])
+        self._set(self.episode_topics, episode.get('topics', []), episode_slot)
+
+        insight_slots = []
+        for position, insight in enumerate(episode.get('key_insights', [])):
+            slot = self._allocate(self._insight_slots, self._free_insight_slots, (episode['id'], position))
+            self._set(self.insight_topics, insight.get('topics', []), slot)
+            if insight.get('actionable'):
+                self.actionable |= 1 << slot
+            insight_slots.append(slot)
+        self._episode_state[episode['id']] = (episode_slot, insight_slots)
+
+    def remove_episode(self, episode_id: str) -> None:
+        """Clear the episode's and its insights' bits and free their slots"""
+        state = self._episode_state.pop(episode_id, None)
+        if state is None:
+            return
+        episode_slot, insight_slots = state
+        self._clear(self.episode_topics, episode_slot)
+        self._episode_slots[episode_slot] = None
+        self._free_episode_slots.append(episode_slot)
+        for slot in insight_slots:
+            self._clear(self.insight_topics, slot)
+            self.actionable &= ~(1 << slot)
+            self._insight_slots[slot] = None
+            self._free_insight_slots.append(slot)
+
+    @staticmethod
+    def _match(bitsets: Dict[str, int], topic: str) -> int:
+        topic_lower = topic.lower()
+        mask = 0
+        for tag, bits in bitsets.items():
+            if topic_lower in tag:
+                mask |= bits
+        return mask
+
+    @staticmethod
+    def _combine(masks: List[int], match_all: bool) -> int:
+        if not masks:
+            return 0
+        combined = masks[0]
+        for mask in masks[1:]:
+            combined = combined & mask if match_all else combined | mask
+        return combined
+
+    def insight_mask(self, topics: List[str], match_all: bool = True) -> int:
+        """Bitset of insights tagged with all (or any) of ``topics``"""
+        return self._combine([self._match(self.insight_topics, t) for t in topics], match_all)
+
+    def episode_mask(self, topics: List[str], match_all: bool = True) -> int:
+        """Bitset of episodes tagged with all (or any) of ``topics``"""
+        return self._combine([self._match(self.episode_topics, t) for t in topics], match_all)
+
+    def insights(self, mask: int) -> List[Tuple[str, int]]:
+        """(episode_id, insight position) for each set bit, in corpus order"""
+        return sorted(self._insight_slots[slot] for slot in iter_bits(mask))
+
+    def episodes(self, mask: int) -> List[str]:
+        """Episode ids for each set bit, in corpus order"""
+        return sorted(self._episode_slots[slot] for slot in iter_bits(mask))
@@ -0,0 +1,68 @@
+"""
+Query parsing for free-text searches and situations
+
+Turns text like "I'm joining a new company as VP Product" into a weighted
+set of index terms:
+
+- tokenized, stopwords removed and stemmed like the indexed text
+- runs of words that form a multi-word tag in the corpus
+  ("product market fit") are added as a phrase term with extra weight
+- words that are only a prefix of indexed terms ("lead" -> "leadership")
+  are expanded at reduced weight
+"""
+
+from typing import Dict, List
+
+from lennys_wisdom.index import InvertedIndex
+from lennys_wisdom.text import COMPOUND_JOINER, analyze
+
+# Weight of a word that appears verbatim (after stemming) in the index
+TERM_WEIGHT = 1.0
+
+# Weight of a detected multi-word phrase
+PHRASE_WEIGHT = 2.0
+
+# Weight of vocabulary terms that a query word is only a prefix of
+PREFIX_WEIGHT = 0.5
+
+# Shorter words are not prefix-expanded, they match too much
+MIN_PREFIX_LENGTH = 4
+
+# Longest phrase (in words) looked up as a compound term
+MAX_PHRASE_WORDS = 4
+
+
+def detect_phrases(index: InvertedIndex, words: List[str]) -> List[str]:
+    """Return compound terms for every run of ``words`` that is an indexed tag"""
+    phrases = []
+    for size in range(min(MAX_PHRASE_WORDS, len(words)), 1, -1):
+        for start in range(len(words) - size + 1):
+            compound = COMPOUND_JOINER.join(words[start:start + size])
+            if compound in index.postings:
+                phrases.append(compound)
+    return phrases
+
+
+def parse_query(index: InvertedIndex, text: str) -> Dict[str, float]:
+    """Turn free text into weighted index terms"""
+    words = analyze(text)
+    terms: Dict[str, float] = {}
+
+    def add(term: str, weight: float) -> None:
+        terms[term] = max(terms.get(term, 0.0), weight)
+
+    for phrase in detect_phrases(index, words):
+        add(phrase, PHRASE_WEIGHT)
+
+    for word in dict.fromkeys(words):
+        if len(word) < MIN_PREFIX_LENGTH:
+            if word in index.postings:
+                add(word, TERM_WEIGHT)
+            continue
+        for term in index.expand(word):
+            if term == word:
+                add(term, TERM_WEIGHT)
+            elif COMPOUND_JOINER not in term:
+                add(term, PREFIX_WEIGHT)
+
+    return terms
@@ -0,0 +1,145 @@
+"""
+BM25F relevance ranking over the inverted index
+
+The unit of retrieval is an episode (its title, description, summary, topics
+and themes) or a single insight (its quote, insight, context and topics).
+Term frequencies from each field are length-normalized and weighted per
+field before BM25 saturation, so a hit in a topic tag counts for more than
+the same word buried in a long context paragraph.
+"""
+
+import heapq
+import math
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from lennys_wisdom.index import InvertedIndex
+
+# Term-frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+# Relative importance of a term occurrence in each field
+FIELD_WEIGHTS = {
+    'title': 2.0,
+    'topics': 2.0,
+    'themes': 1.5,
+    'insight': 1.5,
+    'quote': 1.0,
+    'summary': 1.0,
+    'description': 0.8,
+    'context': 0.7,
+}
+
+# A retrievable unit: (episode_id, insight position or EPISODE_LEVEL)
+Unit = Tuple[str, int]
+
+
+class Prepared(NamedTuple):
+    """Per-document tables of one index generation"""
+    index: InvertedIndex
+    generation: int
+    doc_units: Dict[int, Unit]
+    doc_factors: Dict[int, float]
+    unit_df: Dict[str, int]
+
+
+class BM25FScorer:
+    """
+    Scores units against weighted query terms.
+
+    The per-field length normalization and field weight of every indexed
+    field is precomputed once per index generation, so a query only walks
+    the posting lists of its terms. When the caller already knows which
+    episodes are candidates, only those episodes' postings are visited.
+
+    A reload publishes a new index object instead of changing the old one,
+    so ``score`` takes the index to read (default: the one given here) and
+    uses it, and the tables prepared for it, throughout one call.
+    """
+
+    def __init__(self, index: Optional[InvertedIndex] = None):
+        self.index = index
+        self._prepared: Optional[Prepared] = None
+        self._lock = threading.Lock()
+
+    def _prepare(self, index: InvertedIndex) -> Prepared:
+        prepared = self._prepared
+        if prepared is not None and prepared.index is index and prepared.generation == index.generation:
+            return prepared
+        with self._lock:
+            prepared = self._prepared
+            if prepared is not None and prepared.index is index and prepared.generation == index.generation:
+                return prepared
+            generation = index.generation
+            averages = {}
+            units = {}
+            factors = {}
+            for doc, key in index.docs.items():
+                average = averages.get(key.field)
+                if average is None:
+                    average = averages[key.field] = index.average_length(key.field)
+                units[doc] = (key.episode_id, key.insight)
+                factors[doc] = FIELD_WEIGHTS.get(key.field, 1.0) / (1 - B + B * index.doc_lengths[doc] / average)
+            prepared = self._prepared = Prepared(index, generation, units, factors, {})
+            return prepared
+
+    @staticmethod
+    def _document_frequency(prepared: Prepared, term: str) -> int:
+        """Number of units (not fields) containing ``term``"""
+        df = prepared.unit_df.get(term)
+        if df is None:
+            doc_units = prepared.doc_units
+            df = prepared.unit_df[term] = len({doc_units[doc] for doc in prepared.index.postings.get(term, ())})
+        return df
+
+    def score(
+        self,
+        terms: Dict[str, float],
+        episode_ids: Optional[Iterable[str]] = None,
+        index: Optional[InvertedIndex] = None
+    ) -> Dict[Unit, float]:
+        """
+        Compute the BM25F score of every unit that contains a query term.
+
+        Args:
+            terms: Index terms and their query weights
+            episode_ids: Only score units of these episodes (default: all)
+            index: Index to score against (default: the scorer's index)
+        """
+        index = index if index is not None else self.index
+        prepared = self._prepare(index)
+        doc_units, doc_factors = prepared.doc_units, prepared.doc_factors
+        postings = index.postings
+        weighted_tf: Dict[str, Dict[Unit, float]] = {term: {} for term in terms if term in postings}
+
+        if episode_ids is None:
+            for term, accumulated in weighted_tf.items():
+                for doc, tf in postings[term].items():
+                    unit = doc_units[doc]
+                    accumulated[unit] = accumulated.get(unit, 0.0) + doc_factors[doc] * tf
+                prepared.unit_df.setdefault(term, len(accumulated))
+        else:
+            for episode_id in episode_ids:
+                for token, doc in index.episode_postings(episode_id):
+                    accumulated = weighted_tf.get(token)
+                    if accumulated is not None:
+                        unit = doc_units[doc]
+                        tf = postings[token][doc]
+                        accumulated[unit] = accumulated.get(unit, 0.0) + doc_factors[doc] * tf
+
+        total_units = max(index.unit_count, 1)
+        scores: Dict[Unit, float] = {}
+        for term, accumulated in weighted_tf.items():
+            df = self._document_frequency(prepared, term)
+            idf = math.log(1 + (total_units - df + 0.5) / (df + 0.5))
+            query_weight = terms[term]
+            for unit, tf in accumulated.items():
+                scores[unit] = scores.get(unit, 0.0) + query_weight * idf * tf / (K1 + tf)
+
+        return scores
+
+
+def top_k(scores: Dict[Any, float], k: int) -> List[Tuple[Any, float]]:
+    """Highest-scoring (id, score) pairs, ties going to the smaller id, without a full sort"""
+    return heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,138 @@
+"""
+Safe serialization of index state for snapshot files
+
+Snapshots are read from next to the episode data, which may be any
+directory, so their contents must not be able to run code when loaded the
+way a pickle can. Index state is stored as JSON instead, with the few
+non-JSON values it holds wrapped in single-key tag objects:
+
+    {"$t": [...]}                tuple
+    {"$s": [...]}                set
+    {"$d": [[key, value], ...]}  dict with non-string (or "$"-prefixed) keys
+    {"$i": "-1f"}                int too large for a 64-bit integer, in hex
+    {"$a": [typecode, b64]}      array.array
+    {"$n": [dtype, shape, b64]}  numpy array
+    {"$o": [name, value]}        instance of a registered class
+
+Only classes passed to ``register`` can be rebuilt, and they are rebuilt
+from plain data without calling any code they name: a NamedTuple from its
+fields, any other class by restoring its ``__dict__``.
+"""
+
+import base64
+import json
+from array import array
+from typing import Any, Dict, Type, TypeVar
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+C = TypeVar("C", bound=type)
+
+_REGISTERED: Dict[str, Type] = {}
+
+# Ints outside this range are stored as hex strings (JSON readers limit digits)
+_INT_LIMIT = 1 << 63
+
+
+def register(cls: C) -> C:
+    """Allow instances of ``cls`` in serialized state (usable as a class decorator)"""
+    _REGISTERED[cls.__name__] = cls
+    return cls
+
+
+def _is_namedtuple(value: Any) -> bool:
+    return isinstance(value, tuple) and hasattr(type(value), '_fields')
+
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, float, str)):
+        return value
+    if isinstance(value, int):
+        return value if -_INT_LIMIT < value < _INT_LIMIT else {'$i': format(value, 'x')}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if _is_namedtuple(value) or type(value).__name__ in _REGISTERED:
+        name = type(value).__name__
+        if _REGISTERED.get(name) is not type(value):
+            raise TypeError(f"Cannot serialize unregistered class {name}")
+        state = list(value) if _is_namedtuple(value) else vars(value)
+        return {'$o': [name, _encode(state)]}
+    if isinstance(value, tuple):
+        return {'$t': [_encode(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {'$s': [_encode(item) for item in value]}
+    if isinstance(value, dict):
+        if all(isinstance(key, str) and not key.startswith('$') for key in value):
+            return {key: _encode(item) for key, item in value.items()}
+        return {'$d': [[_encode(key), _encode(item)] for key, item in value.items()]}
+    if isinstance(value, array):
+        return {'$a': [value.typecode, base64.b64encode(value.tobytes()).decode('ascii')]}
+    if HAS_NUMPY and isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value)
+        return {'$n': [data.dtype.str, list(data.shape), base64.b64encode(data.tobytes()).decode('ascii')]}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode(tagged: Dict[str, Any]) -> Any:
+    if len(tagged) != 1:
+        return tagged
+    tag, data = next(iter(tagged.items()))
+    if not tag.startswith('$'):
+        return tagged
+    if tag == '$t':
+        return tuple(data)
+    if tag == '$s':
+        return set(data)
+    if tag == '$d':
+        return {key: item for key, item in data}
+    if tag == '$i':
+        return int(data, 16)
+    if tag == '$a':
+        typecode, encoded = data
+        values = array(typecode)
+        values.frombytes(base64.b64decode(encoded))
+        return values
+    if tag == '$n' and HAS_NUMPY:
+        dtype, shape, encoded = data
+        dtype = np.dtype(dtype)
+        if dtype.hasobject:
+            raise ValueError("Object arrays are not allowed")
+        return np.frombuffer(base64.b64decode(encoded), dtype=dtype).reshape(shape).copy()
+    if tag == '$o':
+        name, state = data
+        cls = _REGISTERED.get(name)
+        if cls is None:
+            raise ValueError(f"Class {name} is not registered for deserialization")
+        if issubclass(cls, tuple):
+            return cls(*state)
+        instance = cls.__new__(cls)
+        instance.__dict__.update(state)
+        return instance
+    raise ValueError(f"Unknown tag {tag}")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serialize ``value`` to UTF-8 JSON bytes.
+
+    Raises:
+        TypeError: ``value`` holds a type that cannot be stored
+    """
+    return json.dumps(_encode(value), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """
+    Rebuild a value written by ``dumps``.
+
+    Raises:
+        ValueError: The data is malformed or names an unregistered class
+    """
+    try:
+        return json.loads(data, object_hook=_decode)
+    except (TypeError, KeyError, AttributeError) as e:
+        raise ValueError(f"Malformed serialized data: {e}")
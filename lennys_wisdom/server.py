@@ -5,239 +5,761 @@ Lenny's Wisdom MCP Server
 Provides structured access to wisdom from 20 curated Lenny's Podcast episodes.
 """
 
+import difflib
+import heapq
 import json
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
 from fastmcp import FastMCP
 
+from lennys_wisdom.budget import Page
+from lennys_wisdom.cache import ResponseCache
+from lennys_wisdom.corpus import CorpusStore, Generation, ManifestEntry, episode_dirs_from_env
+from lennys_wisdom.hybrid import HybridRetriever, Ranking
+from lennys_wisdom.index import (
+    EPISODE_LEVEL, FrameworkIndex, GuestIndex, InvertedIndex, SituationIndex, TopicIndex,
+    framework_key
+)
+from lennys_wisdom.query import parse_query
+from lennys_wisdom.ranking import BM25FScorer, top_k
+from lennys_wisdom.snapshot import SNAPSHOT_NAME
+from lennys_wisdom.transcripts import TranscriptIndex, open_transcript_index
+
+# Optional: only needed for semantic_search
+try:
+    from lennys_wisdom.ann import ANN_NAME, IVFIndex
+    from lennys_wisdom.embeddings import EmbeddingIndex
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 # Initialize MCP server
 mcp = FastMCP("Lenny's Wisdom")
 
-# Path to episode data
-EPISODES_DIR = Path(__file__).parent / "data" / "episodes"
+# Episode data bundled with the package
+BUNDLED_EPISODES_DIR = Path(__file__).parent / "data" / "episodes"
+
+# Directories served as one corpus: LENNYS_WISDOM_EPISODES (or --episodes-dir),
+# else the bundled data. An id found in several is served from the first.
+EPISODE_DIRS = episode_dirs_from_env(BUNDLED_EPISODES_DIR)
+
+# The first directory; the snapshot, ANN and transcript files live next to it
+EPISODES_DIR = EPISODE_DIRS[0]
+
+# Compiled episodes + indexes, used at startup when newer than the JSON files
+SNAPSHOT_PATH = EPISODES_DIR.parent / SNAPSHOT_NAME
+
+# Episodes are parsed once and kept in memory; changed files are reloaded
+corpus = CorpusStore(EPISODE_DIRS, snapshot_path=SNAPSHOT_PATH)
+
+# Indexes kept in sync with the corpus, built together in one pass over the
+# episodes. A reload publishes new index objects, so tools read them from
+# corpus.generation() once per call instead of holding on to them.
+corpus.add_indexes({
+    # Token index over every searchable field
+    'search': InvertedIndex(),
+    # Known situations (situations_addressed) -> episodes that cover them
+    'situation': SituationIndex(),
+    # Framework id -> episodes and insights, materialized once
+    'framework': FrameworkIndex(),
+    # Normalized guest name -> all of the guest's episodes
+    'guest': GuestIndex(),
+    # Topic tag -> bitsets over insights and episodes, plus actionable insights
+    'topic': TopicIndex(),
+    # Hashed n-gram vectors of every insight, for semantic_search
+    **({'semantic': EmbeddingIndex()} if HAS_NUMPY else {})
+})
+
+# BM25F over the search index, with its per-generation tables
+scorer = BM25FScorer()
+
+# Optional IVF index over the embeddings, built by `lennys-wisdom --build-ann`
+ANN_PATH = EPISODES_DIR.parent / ANN_NAME if HAS_NUMPY else None
+ann_index = None
+if ANN_PATH is not None and ANN_PATH.exists():
+    try:
+        ann_index = IVFIndex.load(ANN_PATH)
+    except (OSError, ValueError, KeyError):
+        ann_index = None
+
+# Keyword and vector rankings fused by reciprocal rank fusion, with stage timings
+retriever = HybridRetriever()
+
+# Candidates each retrieval stage contributes before fusion
+HYBRID_DEPTH = 50
+
+# Vector hits at or below this cosine similarity are noise, not paraphrases
+MIN_VECTOR_SIMILARITY = 0.2
+
+# Chunked full transcripts, built by `lennys-wisdom --build-transcripts DIR`;
+# opened on first use
+transcript_index: Optional[TranscriptIndex] = None
+
+# Values accepted by the `match` parameter of multi-topic tools
+TOPIC_MATCH_MODES = ("all", "any")
+
+# Values accepted by the `format` parameter of every tool: rendered markdown,
+# or compact JSON built straight from the indexed records
+OUTPUT_FORMATS = ("markdown", "json")
+
+# Insight fields included in JSON responses (the ones the markdown shows)
+INSIGHT_FIELDS = ('id', 'quote', 'insight', 'context', 'timestamp', 'topics', 'actionable')
+
+# Rendered tool responses, invalidated whenever the corpus reloads
+response_cache = ResponseCache(corpus.current_version)
+
+# Full ranked lists of searches, so later pages skip ranking
+ranking_cache = ResponseCache(corpus.current_version, maxsize=64)
 
+# Readable names for framework ids
+FRAMEWORK_NAMES = {
+    'framework-dhm-001': 'DHM Framework (Delight, Hard-to-copy, Margin-enhancing)',
+    'framework-lno-001': 'LNO Framework (Leverage, Neutral, Overhead)',
+    'framework-pre-mortems-001': 'Pre-mortems (Tigers, Paper Tigers, Elephants)',
+    'framework-jtbd-001': 'Jobs to Be Done (JTBD)',
+    'framework-black-blue-loops-001': 'Black Loops vs Blue Loops (Growth)',
+    'framework-eigenquestions-001': 'Eigenquestions',
+    'framework-good-pm-bad-pm-001': 'Good Product Manager, Bad Product Manager',
+    'framework-managerial-leverage-001': 'Managerial Leverage',
+    'framework-personal-operating-principles-001': 'Personal Operating Principles',
+    'framework-maker-billing-001': 'Maker Billing (Pricing)',
+    'framework-hypothesis-based-coaching-001': 'Hypothesis-Based Coaching',
+    'framework-house-architecture-001': 'House Architecture for Companies',
+    'framework-explorer-not-lecturer-001': 'Explorer Not Lecturer (Management)'
+}
 
-def load_all_episodes() -> List[Dict[str, Any]]:
-    """Load all episode JSON files"""
-    episodes = []
-    for json_file in EPISODES_DIR.glob("ep-*.json"):
-        with open(json_file, 'r') as f:
-            episodes.append(json.load(f))
-    return episodes
+# Share of an episode's metadata score added to each of its insights
+EPISODE_SCORE_SHARE = 0.25
 
 
-def search_episodes(
+def load_all_episodes() -> List[ManifestEntry]:
+    """Return the manifest entry (id, guest, title, description, topics) of every episode"""
+    return corpus.manifest()
+
+
+def to_json(payload: Any) -> str:
+    """Compact JSON for format="json" responses: no indentation or spaces, non-ASCII kept"""
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+
+
+def reply(message: str, format: str) -> str:
+    """A no-results or error message; {"message": ...} when format is json"""
+    return to_json({'message': message}) if format == "json" else message
+
+
+def insight_record(insight: Dict[str, Any]) -> Dict[str, Any]:
+    """An insight reduced to INSIGHT_FIELDS for JSON responses"""
+    return {field: insight.get(field) for field in INSIGHT_FIELDS}
+
+
+def invalid_format(format: str) -> str:
+    """Message for a `format` argument that is not in OUTPUT_FORMATS"""
+    return f"Invalid format '{format}'. Use 'markdown' or 'json'."
+
+
+def vector_insights(
+    indexes: Dict[str, Any],
     query: str,
-    episodes: List[Dict[str, Any]],
-    limit: int = 10
-) -> List[Dict[str, Any]]:
+    limit: int,
+    episode_ids: Optional[Set[str]] = None
+) -> Ranking:
+    """Insights ranked by embedding similarity to the query"""
+    return indexes['semantic'].search(query, limit, episode_ids, MIN_VECTOR_SIMILARITY, ann_index)
+
+
+def load_transcript_index() -> Optional[TranscriptIndex]:
+    """Open the transcript passage index on first use, if it has been built"""
+    global transcript_index
+    if transcript_index is None:
+        transcript_index = open_transcript_index(EPISODES_DIR.parent)
+    return transcript_index
+
+
+@ranking_cache.cached
+def rank_episodes(query: str, depth: int = HYBRID_DEPTH) -> List[Tuple[str, float, List[int]]]:
     """
-    Search episodes for relevant insights.
+    Rank episodes for a query: (episode_id, relevance, matching insight positions), best first.
 
-    Simple keyword matching across:
+    BM25F ranking via the inverted index across:
     - Insight quotes and content
     - Episode titles and summaries
     - Topics and themes
+
+    An episode scores its own metadata plus its three best insights, so
+    long episodes don't win just by having more matches. When embeddings
+    are available, episodes are also ranked by their most similar insight
+    and the two rankings are fused.
+
+    The keyword stage ranks every episode that matches, so paging can reach
+    all of them; the vector stage contributes its top ``depth`` episodes.
+    The ranking is cached per corpus version, so later pages of the same
+    search only load the episodes they show.
     """
-    query_lower = query.lower()
-    results = []
+    indexes = corpus.generation().indexes
+    top_insights: Dict[str, List[tuple]] = {}
+    similar_insights: Dict[str, List[int]] = {}
+
+    def keyword_episodes() -> Ranking:
+        search_index = indexes['search']
+        unit_scores = scorer.score(parse_query(search_index, query), index=search_index)
+
+        # Group unit scores by episode
+        episode_scores: Dict[str, float] = {}
+        insight_scores: Dict[str, List[tuple]] = {}
+        for (episode_id, position), score in unit_scores.items():
+            if position == EPISODE_LEVEL:
+                episode_scores[episode_id] = episode_scores.get(episode_id, 0.0) + score
+            else:
+                # Negated position so ties favour earlier insights
+                insight_scores.setdefault(episode_id, []).append((score, -position))
+                episode_scores.setdefault(episode_id, 0.0)
+
+        for episode_id, scored in insight_scores.items():
+            top_insights[episode_id] = heapq.nlargest(3, scored)  # Top 3 insights
+            episode_scores[episode_id] += sum(score for score, _ in top_insights[episode_id])
+        return top_k(episode_scores, len(episode_scores))
+
+    def vector_episodes() -> Ranking:
+        ranking = []
+        for (episode_id, position), similarity in vector_insights(indexes, query, depth * 3):
+            if episode_id not in similar_insights:
+                ranking.append((episode_id, similarity))
+            similar_insights.setdefault(episode_id, []).append(position)
+        return ranking[:depth]
+
+    fused = retriever.fuse(keyword_episodes, vector_episodes if 'semantic' in indexes else None)
+
+    ranking = []
+    for episode_id, relevance in fused:
+        positions = [-negated_position for _, negated_position in top_insights.get(episode_id, [])]
+        positions += [p for p in similar_insights.get(episode_id, []) if p not in positions]
+        ranking.append((episode_id, relevance, positions[:3]))
+    return ranking
+
+
+def episode_result(episode_id: str, relevance: float, positions: List[int]) -> Optional[Dict[str, Any]]:
+    """A ranked episode with its matching insights, or None if it is no longer in the corpus"""
+    episode = corpus.get(episode_id)
+    if not episode:
+        return None
+    return {
+        'episode_id': episode['id'],
+        'guest_name': episode['guest_name'],
+        'title': episode['title'],
+        'summary': episode['summary'],
+        'relevance_score': relevance,
+        'matching_insights': [episode['key_insights'][p] for p in positions],
+        'key_themes': episode.get('key_themes', [])[:2]  # Top 2 themes
+    }
 
-    for episode in episodes:
-        # Search in episode metadata
-        matches_episode = (
-            query_lower in episode.get('title', '').lower() or
-            query_lower in episode.get('description', '').lower() or
-            query_lower in episode.get('summary', '').lower()
-        )
 
-        # Search in topics
-        matches_topics = any(
-            query_lower in topic.lower()
-            for topic in episode.get('topics', [])
-        )
+def keyword_insights(
+    indexes: Dict[str, Any],
+    query: str,
+    limit: int,
+    episode_ids: Optional[Set[str]] = None
+) -> Ranking:
+    """
+    Insights ranked by BM25F.
 
-        # Search in themes
-        matches_themes = any(
-            query_lower in theme.get('theme', '').lower() or
-            query_lower in theme.get('description', '').lower()
-            for theme in episode.get('key_themes', [])
-        )
+    Each insight scores its own fields plus a share of its episode's
+    metadata score, so an episode that is about the query lifts its insights.
+    """
+    search_index = indexes['search']
+    unit_scores = scorer.score(parse_query(search_index, query), episode_ids, search_index)
 
-        # Search in insights
-        matching_insights = []
-        for insight in episode.get('key_insights', []):
-            matches_insight = (
-                query_lower in insight.get('quote', '').lower() or
-                query_lower in insight.get('insight', '').lower() or
-                query_lower in insight.get('context', '').lower() or
-                any(query_lower in topic.lower() for topic in insight.get('topics', []))
-            )
-            if matches_insight:
-                matching_insights.append(insight)
-
-        # If any matches, add to results
-        if matches_episode or matches_topics or matches_themes or matching_insights:
-            result = {
-                'episode_id': episode['id'],
-                'guest_name': episode['guest_name'],
-                'title': episode['title'],
-                'summary': episode['summary'],
-                'relevance_score': len(matching_insights),  # Simple scoring
-                'matching_insights': matching_insights[:3],  # Top 3 insights
-                'key_themes': episode.get('key_themes', [])[:2]  # Top 2 themes
-            }
-            results.append(result)
+    insight_scores: Dict[tuple, float] = {}
+    for (episode_id, position), score in unit_scores.items():
+        if position != EPISODE_LEVEL:
+            episode_score = unit_scores.get((episode_id, EPISODE_LEVEL), 0.0)
+            insight_scores[(episode_id, position)] = score + EPISODE_SCORE_SHARE * episode_score
+    return top_k(insight_scores, limit)
 
-    # Sort by relevance (number of matching insights)
-    results.sort(key=lambda x: x['relevance_score'], reverse=True)
 
-    return results[:limit]
+def search_insights(
+    query: str,
+    limit: int = 30,
+    episode_ids: Optional[Set[str]] = None,
+    generation: Optional[Generation] = None
+) -> List[Dict[str, Any]]:
+    """
+    Rank individual insights across all episodes (or only ``episode_ids``).
+
+    The keyword ranking keeps exact names (LNO, DHM) on top; when embeddings
+    are available it is fused with the vector ranking to recall paraphrases.
+    ``generation`` is the corpus generation to read (default: the current one).
+    """
+    indexes = (generation or corpus.generation()).indexes
+    depth = max(limit, HYBRID_DEPTH)
+    fused = retriever.fuse(
+        lambda: keyword_insights(indexes, query, depth, episode_ids),
+        (lambda: vector_insights(indexes, query, depth, episode_ids)) if 'semantic' in indexes else None
+    )
+
+    results = []
+    for (episode_id, position), relevance in fused[:limit]:
+        episode = corpus.get(episode_id)
+        if not episode:
+            continue
+        results.append({
+            'guest': episode['guest_name'],
+            'episode_id': episode_id,
+            'insight': episode['key_insights'][position],
+            'relevance': relevance
+        })
+    return results
 
 
 @mcp.tool()
+@response_cache.cached
 def search_wisdom(
     query: str,
-    limit: int = 10
+    limit: int = 10,
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None
 ) -> str:
     """
     Search across 20 curated Lenny's Podcast episodes for wisdom on product, growth, and leadership.
 
     Args:
         query: Search query (e.g., "growth strategy", "hiring", "product-market fit")
-        limit: Maximum number of results to return (default: 10)
+        limit: Maximum number of results per page (default: 10)
+        format: "markdown" (default) or "json" for compact structured results
+        max_tokens: Optional response budget; results that don't fit are left for the next page
+        cursor: Cursor returned by a previous call, to fetch the next page
 
     Returns:
         Formatted search results with relevant insights, quotes, and episode context
     """
-    episodes = load_all_episodes()
-    results = search_episodes(query, episodes, limit)
-
-    if not results:
-        return f"No results found for '{query}'. Try broader terms like 'strategy', 'growth', 'leadership', 'hiring', or 'product-management'."
+    if format not in OUTPUT_FORMATS:
+        return invalid_format(format)
+    ranking = rank_episodes(query, max(limit, HYBRID_DEPTH))
+    try:
+        page = Page(max_tokens, cursor, corpus.current_version(), limit=limit, keyed=True)
+        page.resume([episode_id for episode_id, _, _ in ranking], ordered=False)
+    except ValueError as e:
+        return reply(str(e), format)
+
+    if not ranking:
+        return reply(f"No results found for '{query}'. Try broader terms like 'strategy', 'growth', 'leadership', 'hiring', or 'product-management'.", format)
+
+    # Only the episodes shown on this page are loaded
+    results = filter(None, (episode_result(*entry) for entry in page.window(ranking)))
+
+    if format == "json":
+        records = page.take((
+            {**result, 'matching_insights': [insight_record(i) for i in result['matching_insights']]}
+            for result in results
+        ), to_json, key=lambda record: record['episode_id'])
+        return to_json({'query': query, 'results': records, 'next_cursor': page.next_cursor(len(ranking))})
 
     # Format results
     output = [f"# Search Results for '{query}'\n"]
-    output.append(f"Found {len(results)} relevant episode(s)\n")
+    output.append(f"Found {len(page.window(ranking))} relevant episode(s)\n")
+    page.spend("\n".join(output))
 
-    for i, result in enumerate(results, 1):
-        output.append(f"\n## {i}. {result['guest_name']}: {result['title']}")
-        output.append(f"**Episode:** {result['episode_id']}")
-        output.append(f"**Summary:** {result['summary']}\n")
+    for i, result in enumerate(results, page.start + 1):
+        block = [f"\n## {i}. {result['guest_name']}: {result['title']}"]
+        block.append(f"**Episode:** {result['episode_id']}")
+        block.append(f"**Summary:** {result['summary']}\n")
 
         # Add key themes
         if result['key_themes']:
-            output.append("**Key Themes:**")
+            block.append("**Key Themes:**")
             for theme in result['key_themes']:
-                output.append(f"- {theme['theme']} (relevance: {theme['relevance_score']:.0%})")
-                output.append(f"  {theme['description']}")
+                block.append(f"- {theme['theme']} (relevance: {theme['relevance_score']:.0%})")
+                block.append(f"  {theme['description']}")
 
         # Add matching insights
         if result['matching_insights']:
-            output.append(f"\n**Relevant Insights ({len(result['matching_insights'])}):**")
+            block.append(f"\n**Relevant Insights ({len(result['matching_insights'])}):**")
             for insight in result['matching_insights']:
-                output.append(f"\n### {insight['id']}")
-                output.append(f"> \"{insight['quote']}\"")
-                output.append(f"\n**Insight:** {insight['insight']}")
-                output.append(f"**Context:** {insight['context']}")
-                output.append(f"**Timestamp:** {insight['timestamp']}")
-                output.append(f"**Topics:** {', '.join(insight['topics'])}")
+                block.append(f"\n### {insight['id']}")
+                block.append(f"> \"{insight['quote']}\"")
+                block.append(f"\n**Insight:** {insight['insight']}")
+                block.append(f"**Context:** {insight['context']}")
+                block.append(f"**Timestamp:** {insight['timestamp']}")
+                block.append(f"**Topics:** {', '.join(insight.get('topics', []))}")
                 if insight.get('actionable'):
-                    output.append("✅ **Actionable**")
+                    block.append("✅ **Actionable**")
 
-        output.append("\n" + "-" * 80)
+        block.append("\n" + "-" * 80)
+        if not page.add("\n".join(block), result['episode_id']):
+            break
+        output.extend(block)
 
+    output.extend(page.note(len(ranking)))
     return "\n".join(output)
 
 
 @mcp.tool()
-def list_guests() -> str:
+@response_cache.cached
+def semantic_search(
+    query: str,
+    limit: int = 10,
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> str:
+    """
+    Find insights similar in meaning to a query, even when they use different words.
+
+    Unlike search_wisdom, which matches keywords, this compares the query with
+    every insight by vector similarity, so related phrasings still match.
+
+    Args:
+        query: Free-text query (e.g., "letting an underperformer go", "how to price a new product")
+        limit: Maximum number of insights to return (default: 10)
+        format: "markdown" (default) or "json" for compact structured results
+        max_tokens: Optional response budget; results that don't fit are left for the next page
+        cursor: Cursor returned by a previous call, to continue where it stopped
+
+    Returns:
+        The most similar insights with their quotes, guests and similarity scores
+    """
+    generation = corpus.generation()
+    embedding_index = generation.indexes.get('semantic')
+    if format not in OUTPUT_FORMATS:
+        return invalid_format(format)
+    try:
+        page = Page(max_tokens, cursor, generation.version)
+    except ValueError as e:
+        return reply(str(e), format)
+    if embedding_index is None:
+        return reply("Semantic search requires numpy. Run: pip install numpy", format)
+
+    results = []
+    for (episode_id, position), similarity in embedding_index.search(query, limit, ann=ann_index):
+        episode = corpus.get(episode_id)
+        if episode:
+            results.append((episode, episode['key_insights'][position], similarity))
+    if not results:
+        return reply(f"No similar insights found for '{query}'. Try describing the situation in more words.", format)
+
+    if format == "json":
+        matches = page.take((
+            {
+                'guest': episode['guest_name'],
+                'episode_id': episode['id'],
+                'similarity': similarity,
+                'insight': insight_record(insight)
+            }
+            for episode, insight, similarity in results[page.start:]
+        ), to_json)
+        return to_json({'query': query, 'results': matches, 'next_cursor': page.next_cursor(len(results))})
+
+    output = [f"# Insights Similar to '{query}'\n"]
+    output.append(f"Found {len(results)} similar insight(s)\n")
+    page.spend("\n".join(output))
+
+    for i, (episode, insight, similarity) in enumerate(results[page.start:], page.start + 1):
+        block = [f"\n## {i}. {episode['guest_name']} ({episode['id']})"]
+        block.append(f"**Similarity:** {similarity:.0%}\n")
+        block.append(f"> \"{insight['quote']}\"\n")
+        block.append(f"**Insight:** {insight['insight']}")
+        block.append(f"**Context:** {insight['context']}")
+        block.append(f"**Topics:** {', '.join(insight.get('topics', []))}")
+        if insight.get('actionable'):
+            block.append("✅ **Actionable**")
+        if not page.add("\n".join(block)):
+            break
+        output.extend(block)
+
+    output.extend(page.note(len(results)))
+    return "\n".join(output)
+
+
+@mcp.tool()
+@response_cache.cached
+def search_transcripts(
+    query: str,
+    limit: int = 10,
+    episode_id: Optional[str] = None,
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> str:
+    """
+    Search the full episode transcripts, not just the curated insights.
+
+    Use this for anything that was said on the podcast but not extracted as an
+    insight: stories, names, tools, numbers.
+
+    Args:
+        query: Search terms (e.g., "Airbnb founder mode", "reference calls")
+        limit: Maximum number of passages to return (default: 10)
+        episode_id: Only search this episode's transcript (e.g., "ep-brian-chesky")
+        format: "markdown" (default) or "json" for compact structured results
+        max_tokens: Optional response budget; passages that don't fit are left for the next page
+        cursor: Cursor returned by a previous call, to continue where it stopped
+
+    Returns:
+        Matching transcript passages with guest, speaker and timestamp
+    """
+    if format not in OUTPUT_FORMATS:
+        return invalid_format(format)
+    try:
+        page = Page(max_tokens, cursor, corpus.current_version())
+    except ValueError as e:
+        return reply(str(e), format)
+    index = load_transcript_index()
+    if index is None:
+        return reply("Transcript search is not set up. Download the transcripts and run:\n"
+                     "lennys-wisdom --build-transcripts /path/to/transcripts", format)
+
+    passages = list(index.search(query, limit, episode_id))
+    if not passages:
+        scope = f" in {episode_id}" if episode_id else ""
+        return reply(f"No transcript passages found for '{query}'{scope}. Try different or fewer words.", format)
+
+    if format == "json":
+        records = page.take((passage._asdict() for passage in passages[page.start:]), to_json)
+        return to_json({'query': query, 'results': records, 'next_cursor': page.next_cursor(len(passages))})
+
+    output = [f"# Transcript Passages for '{query}'\n"]
+    output.append(f"Found {len(passages)} passage(s)\n")
+    page.spend("\n".join(output))
+
+    for i, passage in enumerate(passages[page.start:], page.start + 1):
+        timestamp = f" at {passage.timestamp}" if passage.timestamp else ""
+        block = [f"\n## {i}. {passage.guest_name} ({passage.episode_id}){timestamp}"]
+        if passage.speaker:
+            block.append(f"**Speaker:** {passage.speaker}\n")
+        block.append(f"> {passage.text}")
+        if not page.add("\n".join(block)):
+            break
+        output.extend(block)
+
+    output.extend(page.note(len(passages)))
+    return "\n".join(output)
+
+
+@mcp.tool()
+@response_cache.cached
+def list_guests(
+    limit: Optional[int] = None,
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> str:
     """
     List all available podcast guests with brief descriptions.
 
+    Args:
+        limit: Maximum number of guests per page (default: all)
+        format: "markdown" (default) or "json" for compact structured results
+        max_tokens: Optional response budget; guests that don't fit are left for the next page
+        cursor: Cursor returned by a previous call, to fetch the next page
+
     Returns:
         Formatted list of all 20 guests and their expertise areas
     """
-    episodes = load_all_episodes()
+    if format not in OUTPUT_FORMATS:
+        return invalid_format(format)
+    episodes = sorted(load_all_episodes(), key=lambda x: (x.guest_name, x.id))
+    try:
+        page = Page(max_tokens, cursor, corpus.current_version(), limit=limit, keyed=True)
+        page.resume([(episode.guest_name, episode.id) for episode in episodes])
+    except ValueError as e:
+        return reply(str(e), format)
+
+    if format == "json":
+        guests = page.take((
+            {
+                'guest_name': episode.guest_name,
+                'episode_id': episode.id,
+                'description': episode.description[:150],
+                'topics': episode.topics[:5]
+            }
+            for episode in page.window(episodes)
+        ), to_json, key=lambda guest: (guest['guest_name'], guest['episode_id']))
+        return to_json({'guests': guests, 'next_cursor': page.next_cursor(len(episodes))})
 
     output = ["# Available Guests (20 Episodes)\n"]
+    page.spend(output[0])
+
+    for episode in page.window(episodes):
+        block = [f"**{episode.guest_name}** ({episode.id})"]
+        block.append(f"  {episode.description[:150]}...")
+        block.append(f"  Topics: {', '.join(episode.topics[:5])}")
+        block.append("")
+        if not page.add("\n".join(block), (episode.guest_name, episode.id)):
+            break
+        output.extend(block)
 
-    for episode in sorted(episodes, key=lambda x: x['guest_name']):
-        output.append(f"**{episode['guest_name']}** ({episode['id']})")
-        output.append(f"  {episode['description'][:150]}...")
-        output.append(f"  Topics: {', '.join(episode['topics'][:5])}")
-        output.append("")
-
+    output.extend(page.note(len(episodes)))
     return "\n".join(output)
 
 
 @mcp.tool()
-def get_episode(episode_id: str) -> str:
+@response_cache.cached
+def get_episode(
+    episode_id: str,
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> str:
     """
     Get detailed information about a specific episode.
 
     Args:
         episode_id: Episode identifier (e.g., "ep-brian-chesky", "ep-shreyas-doshi")
+        format: "markdown" (default) or "json" for compact structured results
+        max_tokens: Optional response budget; insights that don't fit are left for the next page
+        cursor: Cursor returned by a previous call, to continue where it stopped
 
     Returns:
         Complete episode details including all insights, themes, and frameworks
     """
-    episodes = load_all_episodes()
-    episode = next((ep for ep in episodes if ep['id'] == episode_id), None)
+    if format not in OUTPUT_FORMATS:
+        return invalid_format(format)
+    try:
+        page = Page(max_tokens, cursor, corpus.current_version())
+    except ValueError as e:
+        return reply(str(e), format)
+    episode = corpus.get(episode_id)
 
     if not episode:
-        available = [ep['id'] for ep in episodes]
+        available = [ep.id for ep in load_all_episodes()]
+        if format == "json":
+            return to_json({'message': f"Episode '{episode_id}' not found.", 'available': available})
         return f"Episode '{episode_id}' not found. Available episodes:\n" + "\n".join(available)
 
+    insights = episode['key_insights']
+
+    if format == "json":
+        # The overview comes with the first page; later pages only add insights
+        record = {'id': episode['id'], 'guest_name': episode['guest_name'], 'title': episode['title']}
+        if page.start == 0:
+            record.update({
+                'description': episode['description'],
+                'summary': episode['summary'],
+                'topics': episode['topics'],
+                'key_themes': episode['key_themes'],
+                'frameworks_mentioned': episode.get('frameworks_mentioned', []),
+                'transcript_word_count': episode.get('transcript_word_count', 0),
+                'extraction_metadata': episode['extraction_metadata']
+            })
+        page.spend(to_json(record))
+        record['key_insights'] = page.take((insight_record(insight) for insight in insights[page.start:]), to_json)
+        record['next_cursor'] = page.next_cursor(len(insights))
+        return to_json(record)
+
     output = [f"# {episode['guest_name']}: {episode['title']}\n"]
     output.append(f"**Episode ID:** {episode['id']}")
-    output.append(f"**Description:** {episode['description']}")
-    output.append(f"**Summary:** {episode['summary']}\n")
 
-    # Topics
-    output.append(f"**Topics:** {', '.join(episode['topics'])}\n")
+    if page.start == 0:
+        output.append(f"**Description:** {episode['description']}")
+        output.append(f"**Summary:** {episode['summary']}\n")
 
-    # Key Themes
-    output.append(f"## Key Themes ({len(episode['key_themes'])})\n")
-    for theme in episode['key_themes']:
-        output.append(f"### {theme['theme']} (Relevance: {theme['relevance_score']:.0%})")
-        output.append(f"{theme['description']}\n")
+        # Topics
+        output.append(f"**Topics:** {', '.join(episode['topics'])}\n")
 
-    # Key Insights
-    output.append(f"## Key Insights ({len(episode['key_insights'])})\n")
-    for i, insight in enumerate(episode['key_insights'], 1):
-        output.append(f"### {i}. {insight['id']}")
-        output.append(f"> \"{insight['quote']}\"")
-        output.append(f"\n**Insight:** {insight['insight']}")
-        output.append(f"**Context:** {insight['context']}")
-        output.append(f"**Timestamp:** {insight['timestamp']}")
-        output.append(f"**Topics:** {', '.join(insight['topics'])}")
-        if insight.get('actionable'):
-            output.append("✅ **Actionable**")
-        output.append("")
+        # Key Themes
+        output.append(f"## Key Themes ({len(episode['key_themes'])})\n")
+        for theme in episode['key_themes']:
+            output.append(f"### {theme['theme']} (Relevance: {theme['relevance_score']:.0%})")
+            output.append(f"{theme['description']}\n")
 
-    # Frameworks mentioned
+        output.append(f"## Key Insights ({len(insights)})\n")
+    else:
+        output.append(f"\n## Key Insights ({len(insights)}, continued)\n")
+
+    # Frameworks and metadata close the last page; their room is kept on every page
+    closing = []
     if episode.get('frameworks_mentioned'):
-        output.append(f"## Frameworks Mentioned")
-        output.append(f"{', '.join(episode['frameworks_mentioned'])}\n")
+        closing.append(f"## Frameworks Mentioned")
+        closing.append(f"{', '.join(episode['frameworks_mentioned'])}\n")
+    closing.append(f"## Episode Metadata")
+    closing.append(f"- Transcript: {episode.get('transcript_word_count', 0):,} words")
+    closing.append(f"- Extracted: {episode['extraction_metadata']['extracted_at']}")
+    closing.append(f"- Model: {episode['extraction_metadata']['llm_model']}")
+    page.spend("\n".join(output + closing))
 
-    # Metadata
-    output.append(f"## Episode Metadata")
-    output.append(f"- Transcript: {episode.get('transcript_word_count', 0):,} words")
-    output.append(f"- Extracted: {episode['extraction_metadata']['extracted_at']}")
-    output.append(f"- Model: {episode['extraction_metadata']['llm_model']}")
+    # Key Insights
+    for i, insight in enumerate(insights[page.start:], page.start + 1):
+        block = [f"### {i}. {insight['id']}"]
+        block.append(f"> \"{insight['quote']}\"")
+        block.append(f"\n**Insight:** {insight['insight']}")
+        block.append(f"**Context:** {insight['context']}")
+        block.append(f"**Timestamp:** {insight['timestamp']}")
+        block.append(f"**Topics:** {', '.join(insight.get('topics', []))}")
+        if insight.get('actionable'):
+            block.append("✅ **Actionable**")
+        block.append("")
+        if not page.add("\n".join(block)):
+            break
+        output.extend(block)
 
+    if page.next_cursor(len(insights)) is None:
+        output.extend(closing)
+    output.extend(page.note(len(insights)))
     return "\n".join(output)
 
 
+def requested_topics(topic: Optional[str], topics: Optional[List[str]]) -> List[str]:
+    """Combine a tool's single `topic` argument with its `topics` list"""
+    return ([topic] if topic else []) + [t for t in topics or [] if t]
+
+
+def topic_label(topics: List[str], match: str) -> str:
+    """Human-readable form of a multi-topic query, e.g. hiring OR firing"""
+    return (" AND " if match == "all" else " OR ").join(topics)
+
+
+def framework_display_name(entry: Dict[str, Any]) -> str:
+    """Readable name for a framework index entry"""
+    framework_id = entry['id']
+    return (FRAMEWORK_NAMES.get(framework_id) or entry['name'] or
+            framework_id.replace('-', ' ').title())
+
+
+def framework_example(insight: Dict[str, Any]) -> str:
+    """Framework example quote, shortened to 200 characters"""
+    quote = insight['quote']
+    return quote[:200] + "..." if len(quote) > 200 else quote
+
+
+def insight_items(keys: Iterable[Tuple[str, int]]) -> Iterator[Tuple[Tuple[str, int], Dict[str, Any]]]:
+    """(key, guest/episode/insight item) for (episode_id, position) keys, loading episodes as they are reached"""
+    for episode_id, position in keys:
+        episode = corpus.get(episode_id)
+        if episode:
+            yield (episode_id, position), {
+                'guest': episode['guest_name'],
+                'episode_id': episode['id'],
+                'insight': episode['key_insights'][position]
+            }
+
+
+def mention_insights(mention: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Insights of a framework mention, loaded from its episode"""
+    episode = corpus.get(mention['episode_id'])
+    if not episode:
+        return []
+    return [episode['key_insights'][position] for position in mention['insights']]
+
+
 @mcp.tool()
-def list_frameworks() -> str:
+@response_cache.cached
+def list_frameworks(
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> str:
     """
     List all frameworks and mental models mentioned across all episodes.
 
     This tool extracts and catalogs all named frameworks (DHM, LNO, Pre-mortems, JTBD, etc.)
     mentioned by guests, showing which episodes cover each framework.
 
+    Args:
+        format: "markdown" (default) or "json" for compact structured results
+        max_tokens: Optional response budget; frameworks that don't fit are left for the next page
+        cursor: Cursor returned by a previous call, to continue where it stopped
+
     Returns:
         Complete catalog of frameworks with descriptions and episode references
 
@@ -247,90 +769,182 @@ def list_frameworks() -> str:
         - Growth: Black/Blue Loops, Kindle vs Fire Strategies
         - Hiring: Reference Checks Framework, Good PM/Bad PM
     """
+    generation = corpus.generation()
+    framework_index = generation.indexes['framework']
+    if format not in OUTPUT_FORMATS:
+        return invalid_format(format)
+    try:
+        page = Page(max_tokens, cursor, generation.version)
+    except ValueError as e:
+        return reply(str(e), format)
     episodes = load_all_episodes()
-
-    # Collect all frameworks
-    frameworks = {}
-    for episode in episodes:
-        if episode.get('frameworks_mentioned'):
-            for framework_id in episode['frameworks_mentioned']:
-                if framework_id not in frameworks:
-                    frameworks[framework_id] = {
-                        'episodes': [],
-                        'insights': []
-                    }
-
-                frameworks[framework_id]['episodes'].append({
-                    'guest': episode['guest_name'],
-                    'episode_id': episode['id']
-                })
-
-                # Find insights that mention this framework
-                for insight in episode.get('key_insights', []):
-                    if (framework_id.lower() in insight.get('quote', '').lower() or
-                        framework_id.lower() in insight.get('insight', '').lower() or
-                        framework_id.lower() in insight.get('context', '').lower()):
-                        frameworks[framework_id]['insights'].append({
-                            'guest': episode['guest_name'],
-                            'quote': insight['quote'][:200] + "..." if len(insight['quote']) > 200 else insight['quote'],
-                            'insight': insight['insight']
-                        })
+    frameworks = framework_index.frameworks
+    framework_ids = sorted(frameworks)
 
     if not frameworks:
-        return "No frameworks found in episodes."
-
-    # Create framework names mapping (clean up IDs to readable names)
-    framework_names = {
-        'framework-dhm-001': 'DHM Framework (Delight, Hard-to-copy, Margin-enhancing)',
-        'framework-lno-001': 'LNO Framework (Leverage, Neutral, Overhead)',
-        'framework-pre-mortems-001': 'Pre-mortems (Tigers, Paper Tigers, Elephants)',
-        'framework-jtbd-001': 'Jobs to Be Done (JTBD)',
-        'framework-black-blue-loops-001': 'Black Loops vs Blue Loops (Growth)',
-        'framework-eigenquestions-001': 'Eigenquestions',
-        'framework-good-pm-bad-pm-001': 'Good Product Manager, Bad Product Manager',
-        'framework-managerial-leverage-001': 'Managerial Leverage',
-        'framework-personal-operating-principles-001': 'Personal Operating Principles',
-        'framework-maker-billing-001': 'Maker Billing (Pricing)',
-        'framework-hypothesis-based-coaching-001': 'Hypothesis-Based Coaching',
-        'framework-house-architecture-001': 'House Architecture for Companies',
-        'framework-explorer-not-lecturer-001': 'Explorer Not Lecturer (Management)'
-    }
+        return reply("No frameworks found in episodes.", format)
+
+    if format == "json":
+        def framework_record(framework_id: str) -> Dict[str, Any]:
+            entry = frameworks[framework_id]
+            mentions = framework_index.mentions(entry)
+            example = next((m for m in mentions if m['insights']), None)
+            return {
+                'id': framework_id,
+                'name': framework_display_name(entry),
+                'description': entry['description'],
+                'mentions': [{'guest': m['guest'], 'episode_id': m['episode_id']} for m in mentions],
+                'example': {
+                    'guest': example['guest'],
+                    'episode_id': example['episode_id'],
+                    'quote': mention_insights(example)[0]['quote']
+                } if example else None
+            }
+
+        catalog = page.take((framework_record(fid) for fid in framework_ids[page.start:]), to_json)
+        return to_json({'frameworks': catalog, 'next_cursor': page.next_cursor(len(framework_ids))})
 
     output = [f"# Product Management Frameworks Catalog\n"]
     output.append(f"Found {len(frameworks)} frameworks across {len(episodes)} episodes\n")
     output.append("=" * 80 + "\n")
 
-    for i, (framework_id, data) in enumerate(sorted(frameworks.items()), 1):
-        # Get readable name or use ID
-        framework_name = framework_names.get(framework_id, framework_id.replace('-', ' ').title())
-
-        output.append(f"\n## {i}. {framework_name}")
-        output.append(f"**Framework ID:** {framework_id}")
-        output.append(f"**Mentioned in {len(data['episodes'])} episode(s):**")
-        for ep in data['episodes']:
-            output.append(f"  - **{ep['guest']}** ({ep['episode_id']})")
+    # The categories close the last page; their room is kept on every page
+    closing = [f"\n## Framework Categories\n"]
+    closing.append("**Product Strategy:** DHM, Eigenquestions, Pre-mortems")
+    closing.append("**Decision-Making:** LNO, Pre-mortems, Hypothesis-Based Coaching")
+    closing.append("**Growth:** Black/Blue Loops, Maker Billing")
+    closing.append("**Leadership:** Managerial Leverage, Good PM/Bad PM, Personal Operating Principles")
+    closing.append("**Company Building:** House Architecture, Explorer Not Lecturer")
+    page.spend("\n".join(output + closing))
+
+    for i, framework_id in enumerate(framework_ids[page.start:], page.start + 1):
+        entry = frameworks[framework_id]
+        mentions = framework_index.mentions(entry)
+
+        block = [f"\n## {i}. {framework_display_name(entry)}"]
+        block.append(f"**Framework ID:** {framework_id}")
+        block.append(f"**Mentioned in {len(mentions)} episode(s):**")
+        for mention in mentions:
+            block.append(f"  - **{mention['guest']}** ({mention['episode_id']})")
 
         # Show example insight if available
-        if data['insights']:
-            output.append(f"\n**Example Usage:**")
-            insight = data['insights'][0]
-            output.append(f"> \"{insight['quote']}\"")
-            output.append(f"— {insight['guest']}\n")
+        example = next((m for m in mentions if m['insights']), None)
+        if example:
+            guest, insight = example['guest'], mention_insights(example)[0]
+            block.append(f"\n**Example Usage:**")
+            block.append(f"> \"{framework_example(insight)}\"")
+            block.append(f"— {guest}\n")
+
+        block.append("-" * 80)
+        if not page.add("\n".join(block)):
+            break
+        output.extend(block)
+
+    if page.next_cursor(len(framework_ids)) is None:
+        output.extend(closing)
+    output.extend(page.note(len(framework_ids)))
+    return "\n".join(output)
 
-        output.append("-" * 80)
 
-    output.append(f"\n## Framework Categories\n")
-    output.append("**Product Strategy:** DHM, Eigenquestions, Pre-mortems")
-    output.append("**Decision-Making:** LNO, Pre-mortems, Hypothesis-Based Coaching")
-    output.append("**Growth:** Black/Blue Loops, Maker Billing")
-    output.append("**Leadership:** Managerial Leverage, Good PM/Bad PM, Personal Operating Principles")
-    output.append("**Company Building:** House Architecture, Explorer Not Lecturer")
+@mcp.tool()
+@response_cache.cached
+def get_framework(
+    framework_id: str,
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> str:
+    """
+    Get a single framework with every episode and insight that references it.
 
+    Args:
+        framework_id: Framework identifier or name from list_frameworks()
+                      (e.g., "framework-lno-001", "framework-dhm-001", "Flash Tags")
+        format: "markdown" (default) or "json" for compact structured results
+        max_tokens: Optional response budget; examples that don't fit are left for the next page
+        cursor: Cursor returned by a previous call, to continue where it stopped
+
+    Returns:
+        Framework name, description, the guests who discuss it and example quotes
+    """
+    generation = corpus.generation()
+    framework_index = generation.indexes['framework']
+    if format not in OUTPUT_FORMATS:
+        return invalid_format(format)
+    try:
+        page = Page(max_tokens, cursor, generation.version)
+    except ValueError as e:
+        return reply(str(e), format)
+    entry = framework_index.get(framework_id, FRAMEWORK_NAMES)
+
+    if not entry:
+        # Match against the names list_frameworks() shows as well as the ids
+        labels = {}
+        for fid in sorted(framework_index.frameworks):
+            labels.setdefault(framework_key(fid), fid)
+            labels.setdefault(framework_key(framework_display_name(framework_index.frameworks[fid])), fid)
+        wanted = framework_key(framework_id)
+        suggestions = list(dict.fromkeys(fid for label, fid in labels.items() if wanted in label))[:5]
+        close = difflib.get_close_matches(wanted, list(labels), n=10, cutoff=0.4)
+        suggestions = suggestions or list(dict.fromkeys(labels[label] for label in close))[:5]
+        message = f"Framework '{framework_id}' not found."
+        if format == "json":
+            return to_json({'message': message, 'suggestions': suggestions})
+        if suggestions:
+            message += " Did you mean:\n" + "\n".join(f"- {s}" for s in suggestions)
+        return message + "\nUse list_frameworks() to browse all frameworks."
+
+    mentions = framework_index.mentions(entry)
+    examples = [(m, insight) for m in mentions for insight in mention_insights(m)]
+
+    if format == "json":
+        record = {
+            'id': entry['id'],
+            'name': framework_display_name(entry),
+            'description': entry['description'],
+            'mentions': [{'guest': m['guest'], 'episode_id': m['episode_id']} for m in mentions]
+        }
+        page.spend(to_json(record))
+        record['examples'] = page.take((
+            {'guest': m['guest'], 'episode_id': m['episode_id'], 'insight': insight_record(insight)}
+            for m, insight in examples[page.start:]
+        ), to_json)
+        record['next_cursor'] = page.next_cursor(len(examples))
+        return to_json(record)
+
+    output = [f"# {framework_display_name(entry)}\n"]
+    output.append(f"**Framework ID:** {entry['id']}")
+    if entry['description']:
+        output.append(f"**Description:** {entry['description']}")
+    output.append(f"**Mentioned in {len(mentions)} episode(s):**")
+    for mention in mentions:
+        output.append(f"  - **{mention['guest']}** ({mention['episode_id']})")
+
+    if examples:
+        output.append(f"\n## Example Usage ({len(examples)})\n")
+        page.spend("\n".join(output))
+        for mention, insight in examples[page.start:]:
+            block = [f"> \"{framework_example(insight)}\""]
+            block.append(f"— {mention['guest']}\n")
+            block.append(f"**Insight:** {insight['insight']}\n")
+            if not page.add("\n".join(block)):
+                break
+            output.extend(block)
+
+    output.extend(page.note(len(examples)))
     return "\n".join(output)
 
 
 @mcp.tool()
-def get_quotes_by_guest(guest_name: str, topic: Optional[str] = None, limit: int = 10) -> str:
+@response_cache.cached
+def get_quotes_by_guest(
+    guest_name: str,
+    topic: Optional[str] = None,
+    limit: int = 10,
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> str:
     """
     Get all quotes from a specific guest, optionally filtered by topic.
 
@@ -341,6 +955,9 @@ def get_quotes_by_guest(guest_name: str, topic: Optional[str] = None, limit: int
         guest_name: Name of the guest (e.g., "Ben Horowitz", "Brian Chesky", "Shreyas Doshi")
         topic: Optional topic filter (e.g., "hiring", "leadership", "decision-making")
         limit: Maximum number of quotes to return (default: 10)
+        format: "markdown" (default) or "json" for compact structured results
+        max_tokens: Optional response budget; quotes that don't fit are left for the next page
+        cursor: Cursor returned by a previous call, to continue where it stopped
 
     Returns:
         Collection of quotes and insights from the specified guest
@@ -350,21 +967,36 @@ def get_quotes_by_guest(guest_name: str, topic: Optional[str] = None, limit: int
         - get_quotes_by_guest("Brian Chesky", "leadership") → Brian's leadership quotes
         - get_quotes_by_guest("Deb Liu", "career") → Deb's career advice
     """
-    episodes = load_all_episodes()
-
-    # Find the guest's episode
-    guest_episode = None
-    for episode in episodes:
-        if guest_name.lower() in episode['guest_name'].lower():
-            guest_episode = episode
-            break
-
-    if not guest_episode:
-        available_guests = sorted([ep['guest_name'] for ep in episodes])
+    generation = corpus.generation()
+    guest_index = generation.indexes['guest']
+    if format not in OUTPUT_FORMATS:
+        return invalid_format(format)
+    try:
+        page = Page(max_tokens, cursor, generation.version)
+    except ValueError as e:
+        return reply(str(e), format)
+
+    # Resolve the name (exact, partial or misspelled) to a guest. Bodies come
+    # from the live store, so episodes removed since this generation are skipped
+    matches = guest_index.lookup(guest_name)
+    guest_episodes = [corpus.get(episode_id) for episode_id in guest_index.episodes(matches[0])] if matches else []
+    guest_episodes = [episode for episode in guest_episodes if episode]
+
+    if not guest_episodes:
+        available_guests = sorted(guest['name'] for guest in guest_index.guests.values())
+        if format == "json":
+            return to_json({'message': f"Guest '{guest_name}' not found.", 'available': available_guests})
         return f"Guest '{guest_name}' not found. Available guests:\n" + "\n".join(f"- {g}" for g in available_guests)
 
-    # Get all insights
-    insights = guest_episode.get('key_insights', [])
+    guest_episode = guest_episodes[0]
+    episode_ids = [episode['id'] for episode in guest_episodes]
+
+    # Get all insights across all of the guest's episodes
+    insights = [
+        insight
+        for episode in guest_episodes
+        for insight in episode.get('key_insights', [])
+    ]
 
     # Filter by topic if specified
     if topic:
@@ -378,34 +1010,55 @@ def get_quotes_by_guest(guest_name: str, topic: Optional[str] = None, limit: int
 
     if not insights:
         if topic:
-            return f"No quotes found from {guest_episode['guest_name']} on topic '{topic}'. Try broader terms or remove the topic filter."
-        return f"No quotes found from {guest_episode['guest_name']}."
+            return reply(f"No quotes found from {guest_episode['guest_name']} on topic '{topic}'. Try broader terms or remove the topic filter.", format)
+        return reply(f"No quotes found from {guest_episode['guest_name']}.", format)
 
     insights = insights[:limit]
 
+    if format == "json":
+        return to_json({
+            'guest': guest_episode['guest_name'],
+            'topic': topic,
+            'episode_ids': episode_ids,
+            'quotes': page.take((insight_record(insight) for insight in insights[page.start:]), to_json),
+            'next_cursor': page.next_cursor(len(insights))
+        })
+
     output = [f"# Quotes from {guest_episode['guest_name']}\n"]
     if topic:
         output.append(f"**Filtered by topic:** {topic}")
-    output.append(f"**Episode:** {guest_episode['id']}")
+    output.append(f"**Episode{'s' if len(episode_ids) > 1 else ''}:** {', '.join(episode_ids)}")
     output.append(f"**Found:** {len(insights)} quote(s)\n")
     output.append("=" * 80 + "\n")
-
-    for i, insight in enumerate(insights, 1):
-        output.append(f"## Quote {i}")
-        output.append(f"> \"{insight['quote']}\"\n")
-        output.append(f"**Insight:** {insight['insight']}\n")
-        output.append(f"**Context:** {insight['context']}")
-        output.append(f"**Topics:** {', '.join(insight['topics'])}")
-        output.append(f"**Timestamp:** {insight['timestamp']}")
+    page.spend("\n".join(output))
+
+    for i, insight in enumerate(insights[page.start:], page.start + 1):
+        block = [f"## Quote {i}"]
+        block.append(f"> \"{insight['quote']}\"\n")
+        block.append(f"**Insight:** {insight['insight']}\n")
+        block.append(f"**Context:** {insight['context']}")
+        block.append(f"**Topics:** {', '.join(insight.get('topics', []))}")
+        block.append(f"**Timestamp:** {insight['timestamp']}")
         if insight.get('actionable'):
-            output.append("✅ **Actionable**")
-        output.append("\n" + "-" * 80 + "\n")
+            block.append("✅ **Actionable**")
+        block.append("\n" + "-" * 80 + "\n")
+        if not page.add("\n".join(block)):
+            break
+        output.extend(block)
 
+    output.extend(page.note(len(insights)))
     return "\n".join(output)
 
 
 @mcp.tool()
-def compare_perspectives(topic: str, guests: Optional[List[str]] = None) -> str:
+@response_cache.cached
+def compare_perspectives(
+    topic: str,
+    guests: Optional[List[str]] = None,
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> str:
     """
     Compare how different product leaders approach the same topic.
 
@@ -416,6 +1069,9 @@ def compare_perspectives(topic: str, guests: Optional[List[str]] = None) -> str:
         topic: Topic to compare (e.g., "leadership", "hiring", "decision-making", "product strategy")
         guests: Optional list of specific guests to compare (e.g., ["Brian Chesky", "Ben Horowitz"])
                 If not specified, shows all guests who have insights on this topic
+        format: "markdown" (default) or "json" for compact structured results
+        max_tokens: Optional response budget; guests that don't fit are left for the next page
+        cursor: Cursor returned by a previous call, to continue where it stopped
 
     Returns:
         Comparative analysis showing how different leaders approach the same challenge
@@ -425,71 +1081,111 @@ def compare_perspectives(topic: str, guests: Optional[List[str]] = None) -> str:
         - compare_perspectives("hiring", ["Ben Horowitz", "Shishir Mehrotra"]) → Specific comparison
         - compare_perspectives("product-market fit") → Different approaches to PMF
     """
-    episodes = load_all_episodes()
-    topic_lower = topic.lower()
+    generation = corpus.generation()
+    indexes = generation.indexes
+    guest_index, search_index, topic_index = indexes['guest'], indexes['search'], indexes['topic']
+    if format not in OUTPUT_FORMATS:
+        return invalid_format(format)
+    try:
+        page = Page(max_tokens, cursor, generation.version)
+    except ValueError as e:
+        return reply(str(e), format)
+    episode_ids = [entry.id for entry in load_all_episodes()]
+
+    # Only look at the requested guests' episodes (partial names and any casing work)
+    if guests:
+        episode_ids = sorted({
+            episode_id
+            for name in guests
+            for key in guest_index.lookup(name)[:1]
+            for episode_id in guest_index.episodes(key)
+        })
+
+    # Insights tagged with the topic, or mentioning it in their text
+    matched = set(topic_index.insights(topic_index.insight_mask([topic])))
+    matched.update(
+        (key.episode_id, key.insight) for key in search_index.match(topic)
+        if key.field in ('quote', 'insight', 'context')
+    )
+    positions_by_episode: Dict[str, List[int]] = {}
+    for episode_id, position in sorted(matched):
+        positions_by_episode.setdefault(episode_id, []).append(position)
 
-    # Collect insights by guest
+    # Collect insights by guest, loading only episodes with a match
     guest_insights = {}
-    for episode in episodes:
-        guest_name = episode['guest_name']
-
-        # Skip if specific guests requested and this isn't one of them
-        if guests and guest_name not in guests:
-            continue
-
-        # Find matching insights
-        matching_insights = []
-        for insight in episode.get('key_insights', []):
-            matches = (
-                any(topic_lower in t.lower() for t in insight.get('topics', [])) or
-                topic_lower in insight.get('quote', '').lower() or
-                topic_lower in insight.get('insight', '').lower() or
-                topic_lower in insight.get('context', '').lower()
-            )
-            if matches:
-                matching_insights.append(insight)
-
-        if matching_insights:
-            guest_insights[guest_name] = {
-                'episode_id': episode['id'],
-                'insights': matching_insights[:3]  # Top 3 insights
-            }
+    for episode_id in episode_ids:
+        positions = positions_by_episode.get(episode_id)
+        episode = corpus.get(episode_id) if positions else None
+        if episode:
+            guest_name = episode['guest_name']
+            matching_insights = [episode['key_insights'][position] for position in positions]
+            data = guest_insights.setdefault(guest_name, {'episode_ids': [], 'insights': []})
+            data['episode_ids'].append(episode['id'])
+            data['insights'] = (data['insights'] + matching_insights)[:3]  # Top 3 insights
 
     if not guest_insights:
         if guests:
-            return f"No insights found on '{topic}' from {', '.join(guests)}. Try broader terms or different guests."
-        return f"No insights found on '{topic}'. Try broader terms like 'strategy', 'growth', 'leadership', or 'hiring'."
+            return reply(f"No insights found on '{topic}' from {', '.join(guests)}. Try broader terms or different guests.", format)
+        return reply(f"No insights found on '{topic}'. Try broader terms like 'strategy', 'growth', 'leadership', or 'hiring'.", format)
+
+    perspectives = list(guest_insights.items())
+
+    if format == "json":
+        return to_json({'topic': topic, 'perspectives': page.take((
+            {
+                'guest': guest_name,
+                'episode_ids': data['episode_ids'],
+                'insights': [insight_record(insight) for insight in data['insights']]
+            }
+            for guest_name, data in perspectives[page.start:]
+        ), to_json), 'next_cursor': page.next_cursor(len(perspectives))})
 
     output = [f"# Comparing Perspectives on: \"{topic}\"\n"]
     output.append(f"Perspectives from {len(guest_insights)} product leader(s)\n")
     output.append("=" * 80 + "\n")
 
-    for i, (guest_name, data) in enumerate(guest_insights.items(), 1):
-        output.append(f"\n## {i}. {guest_name}'s Perspective")
-        output.append(f"**Episode:** {data['episode_id']}\n")
+    # Add synthesis section; it closes the last page and its room is kept on every page
+    closing = [f"\n## Key Takeaways"]
+    closing.append(f"These {len(guest_insights)} leaders offer different perspectives on **{topic}**:")
+    for guest_name in guest_insights.keys():
+        closing.append(f"- **{guest_name}**: {len(guest_insights[guest_name]['insights'])} insights")
+    page.spend("\n".join(output + closing))
+
+    for i, (guest_name, data) in enumerate(perspectives[page.start:], page.start + 1):
+        block = [f"\n## {i}. {guest_name}'s Perspective"]
+        block.append(f"**Episode:** {', '.join(data['episode_ids'])}\n")
 
         for j, insight in enumerate(data['insights'], 1):
-            output.append(f"### Insight {j}")
-            output.append(f"> \"{insight['quote']}\"\n")
-            output.append(f"**{guest_name}'s Take:** {insight['insight']}\n")
-            output.append(f"**Context:** {insight['context']}")
+            block.append(f"### Insight {j}")
+            block.append(f"> \"{insight['quote']}\"\n")
+            block.append(f"**{guest_name}'s Take:** {insight['insight']}\n")
+            block.append(f"**Context:** {insight['context']}")
             if insight.get('actionable'):
-                output.append("✅ **Actionable**")
-            output.append("")
+                block.append("✅ **Actionable**")
+            block.append("")
 
-        output.append("-" * 80)
-
-    # Add synthesis section
-    output.append(f"\n## Key Takeaways")
-    output.append(f"These {len(guest_insights)} leaders offer different perspectives on **{topic}**:")
-    for guest_name in guest_insights.keys():
-        output.append(f"- **{guest_name}**: {len(guest_insights[guest_name]['insights'])} insights")
+        block.append("-" * 80)
+        if not page.add("\n".join(block)):
+            break
+        output.extend(block)
 
+    if page.next_cursor(len(perspectives)) is None:
+        output.extend(closing)
+    output.extend(page.note(len(perspectives)))
     return "\n".join(output)
 
 
 @mcp.tool()
-def get_actionable_insights(topic: Optional[str] = None, limit: int = 15) -> str:
+@response_cache.cached
+def get_actionable_insights(
+    topic: Optional[str] = None,
+    limit: int = 15,
+    topics: Optional[List[str]] = None,
+    match: str = "all",
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> str:
     """
     Get only insights marked as immediately actionable, optionally filtered by topic.
 
@@ -498,7 +1194,12 @@ def get_actionable_insights(topic: Optional[str] = None, limit: int = 15) -> str
 
     Args:
         topic: Optional topic to filter by (e.g., "hiring", "decision-making", "leadership")
-        limit: Maximum number of insights to return (default: 15)
+        limit: Maximum number of insights per page (default: 15)
+        topics: Optional list of topics to combine with `topic` (e.g., ["hiring", "firing"])
+        match: "all" to require every topic (AND), "any" for at least one (OR)
+        format: "markdown" (default) or "json" for compact structured results
+        max_tokens: Optional response budget; results that don't fit are left for the next page
+        cursor: Cursor returned by a previous call, to fetch the next page
 
     Returns:
         Actionable insights with clear takeaways you can implement immediately
@@ -507,37 +1208,47 @@ def get_actionable_insights(topic: Optional[str] = None, limit: int = 15) -> str
         - get_actionable_insights() → All actionable insights
         - get_actionable_insights("hiring") → Actionable hiring advice
         - get_actionable_insights("growth-marketing") → Actionable growth tactics
+        - get_actionable_insights(topics=["hiring", "firing"], match="any") → Either topic
     """
-    episodes = load_all_episodes()
-
-    # Collect all actionable insights
-    actionable_insights = []
-    for episode in episodes:
-        for insight in episode.get('key_insights', []):
-            if insight.get('actionable'):
-                # If topic filter specified, check if insight matches
-                if topic:
-                    topic_lower = topic.lower()
-                    matches_topic = any(
-                        topic_lower in t.lower()
-                        for t in insight.get('topics', [])
-                    )
-                    if not matches_topic:
-                        continue
-
-                actionable_insights.append({
-                    'guest': episode['guest_name'],
-                    'episode_id': episode['id'],
-                    'insight': insight
-                })
-
-    if not actionable_insights:
+    generation = corpus.generation()
+    topic_index = generation.indexes['topic']
+    if format not in OUTPUT_FORMATS:
+        return invalid_format(format)
+    if match not in TOPIC_MATCH_MODES:
+        return reply(f"Invalid match '{match}'. Use 'all' or 'any'.", format)
+    wanted = requested_topics(topic, topics)
+    if wanted:
+        topic = topic_label(wanted, match)
+
+    # Actionable AND topic filter is a single bitwise intersection
+    mask = topic_index.actionable
+    if wanted:
+        mask &= topic_index.insight_mask(wanted, match_all=(match == "all"))
+    keys = topic_index.insights(mask)
+
+    try:
+        page = Page(max_tokens, cursor, generation.version, limit=limit, keyed=True)
+        page.resume(keys)
+    except ValueError as e:
+        return reply(str(e), format)
+
+    if not keys:
         if topic:
-            return f"No actionable insights found for topic '{topic}'. Try broader terms or remove the topic filter."
-        return "No actionable insights found."
-
-    # Limit results
-    actionable_insights = actionable_insights[:limit]
+            return reply(f"No actionable insights found for topic '{topic}'. Try broader terms or remove the topic filter.", format)
+        return reply("No actionable insights found.", format)
+
+    # Only the episodes of the insights on this page are loaded
+    actionable_insights = insight_items(page.window(keys))
+
+    if format == "json":
+        shown = page.take((
+            (key, {**item, 'insight': insight_record(item['insight'])}) for key, item in actionable_insights
+        ), lambda entry: to_json(entry[1]), key=lambda entry: entry[0])
+        return to_json({
+            'topic': topic,
+            'insights': [record for _, record in shown],
+            'next_cursor': page.next_cursor(len(keys))
+        })
 
     output = []
     if topic:
@@ -545,24 +1256,36 @@ def get_actionable_insights(topic: Optional[str] = None, limit: int = 15) -> str
     else:
         output.append(f"# Actionable Insights (All Topics)\n")
 
-    output.append(f"Found {len(actionable_insights)} immediately actionable insights\n")
+    output.append(f"Found {len(page.window(keys))} immediately actionable insights\n")
     output.append("---\n")
+    page.spend("\n".join(output))
 
-    for i, item in enumerate(actionable_insights, 1):
+    for i, (key, item) in enumerate(actionable_insights, page.start + 1):
         insight = item['insight']
-        output.append(f"## {i}. {item['guest']}")
-        output.append(f"> \"{insight['quote']}\"\n")
-        output.append(f"**✅ Action:** {insight['insight']}\n")
-        output.append(f"**Context:** {insight['context']}")
-        output.append(f"**Topics:** {', '.join(insight['topics'])}")
-        output.append(f"**Episode:** {item['episode_id']} | **Timestamp:** {insight['timestamp']}")
-        output.append("\n" + "-" * 80 + "\n")
+        block = [f"## {i}. {item['guest']}"]
+        block.append(f"> \"{insight['quote']}\"\n")
+        block.append(f"**✅ Action:** {insight['insight']}\n")
+        block.append(f"**Context:** {insight['context']}")
+        block.append(f"**Topics:** {', '.join(insight.get('topics', []))}")
+        block.append(f"**Episode:** {item['episode_id']} | **Timestamp:** {insight['timestamp']}")
+        block.append("\n" + "-" * 80 + "\n")
+        if not page.add("\n".join(block), key):
+            break
+        output.extend(block)
 
+    output.extend(page.note(len(keys)))
     return "\n".join(output)
 
 
 @mcp.tool()
-def get_advice_for_situation(situation: str, limit: int = 10) -> str:
+@response_cache.cached
+def get_advice_for_situation(
+    situation: str,
+    limit: int = 10,
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> str:
     """
     Get relevant advice for a specific PM situation or challenge.
 
@@ -573,6 +1296,9 @@ def get_advice_for_situation(situation: str, limit: int = 10) -> str:
         situation: Description of your situation (e.g., "I'm joining a new company as VP Product",
                   "My team is struggling with roadmap prioritization", "I need to fire an underperformer")
         limit: Maximum number of insights to return (default: 10)
+        format: "markdown" (default) or "json" for compact structured results
+        max_tokens: Optional response budget; insights that don't fit are left for the next page
+        cursor: Cursor returned by a previous call, to continue where it stopped
 
     Returns:
         Curated advice from multiple guests with specific quotes and actionable insights
@@ -583,109 +1309,201 @@ def get_advice_for_situation(situation: str, limit: int = 10) -> str:
         - "My product has good retention but slow growth"
         - "I need to have a difficult conversation with my team"
     """
-    episodes = load_all_episodes()
-
-    # Search for relevant insights
-    results = search_episodes(situation, episodes, limit=20)
+    generation = corpus.generation()
+    situation_index = generation.indexes['situation']
+    if format not in OUTPUT_FORMATS:
+        return invalid_format(format)
+    try:
+        page = Page(max_tokens, cursor, generation.version)
+    except ValueError as e:
+        return reply(str(e), format)
+    candidates = max(limit * 3, 20)
+
+    # Known situations narrow scoring to the episodes that address them
+    matched_situations = situation_index.match(situation)
+    all_insights = []
+    if matched_situations:
+        all_insights = search_insights(
+            situation, limit=candidates,
+            episode_ids=situation_index.episodes_for(matched_situations),
+            generation=generation
+        )
 
-    if not results:
-        return f"No specific advice found for your situation. Try rephrasing or use search_wisdom() for broader results."
+    # Otherwise (or if that is too little) rank insights across the corpus
+    if len(all_insights) < limit:
+        seen = {item['insight']['id'] for item in all_insights}
+        all_insights += [
+            item for item in search_insights(situation, limit=candidates, generation=generation)
+            if item['insight']['id'] not in seen
+        ]
 
-    # Collect all matching insights across episodes
-    all_insights = []
-    for result in results:
-        for insight in result['matching_insights']:
-            all_insights.append({
-                'guest': result['guest_name'],
-                'episode_id': result['episode_id'],
-                'insight': insight,
-                'relevance': result['relevance_score']
-            })
+    if not all_insights:
+        return reply(f"No specific advice found for your situation. Try rephrasing or use search_wisdom() for broader results.", format)
 
     # Sort by actionability and relevance
     all_insights.sort(
         key=lambda x: (x['insight'].get('actionable', False), x['relevance']),
         reverse=True
     )
+    advice = all_insights[:limit]
+
+    if format == "json":
+        return to_json({
+            'situation': situation,
+            'matched_situations': matched_situations,
+            'advice': page.take((
+                {**item, 'insight': insight_record(item['insight'])} for item in advice[page.start:]
+            ), to_json),
+            'next_cursor': page.next_cursor(len(advice))
+        })
 
     output = [f"# Advice for: \"{situation}\"\n"]
-    output.append(f"Found {len(all_insights[:limit])} relevant insights from {len(set(i['guest'] for i in all_insights[:limit]))} product leaders\n")
+    if matched_situations:
+        output.append(f"**Matched situations:** {', '.join(matched_situations)}\n")
+    output.append(f"Found {len(advice)} relevant insights from {len(set(i['guest'] for i in advice))} product leaders\n")
     output.append("---\n")
 
-    for i, item in enumerate(all_insights[:limit], 1):
+    # Add summary of perspectives; it closes the last page and its room is kept on every page
+    unique_guests = list(set(i['guest'] for i in advice))
+    closing = [f"\n**Perspectives from:** {', '.join(unique_guests)}"]
+    page.spend("\n".join(output + closing))
+
+    for i, item in enumerate(advice[page.start:], page.start + 1):
         insight = item['insight']
-        output.append(f"## {i}. {item['guest']}'s Advice")
-        output.append(f"> \"{insight['quote']}\"\n")
-        output.append(f"**Actionable Insight:** {insight['insight']}\n")
-        output.append(f"**Context:** {insight['context']}")
-        output.append(f"**From Episode:** {item['episode_id']}")
-        output.append(f"**Timestamp:** {insight['timestamp']}")
+        block = [f"## {i}. {item['guest']}'s Advice"]
+        block.append(f"> \"{insight['quote']}\"\n")
+        block.append(f"**Actionable Insight:** {insight['insight']}\n")
+        block.append(f"**Context:** {insight['context']}")
+        block.append(f"**From Episode:** {item['episode_id']}")
+        block.append(f"**Timestamp:** {insight['timestamp']}")
         if insight.get('actionable'):
-            output.append("✅ **Immediately Actionable**")
-        output.append("\n" + "-" * 80 + "\n")
-
-    # Add summary of perspectives
-    unique_guests = list(set(i['guest'] for i in all_insights[:limit]))
-    output.append(f"\n**Perspectives from:** {', '.join(unique_guests)}")
+            block.append("✅ **Immediately Actionable**")
+        block.append("\n" + "-" * 80 + "\n")
+        if not page.add("\n".join(block)):
+            break
+        output.extend(block)
 
+    if page.next_cursor(len(advice)) is None:
+        output.extend(closing)
+    output.extend(page.note(len(advice)))
     return "\n".join(output)
 
 
 @mcp.tool()
-def search_by_topic(topic: str, limit: int = 5) -> str:
+@response_cache.cached
+def search_by_topic(
+    topic: str = "",
+    limit: int = 5,
+    topics: Optional[List[str]] = None,
+    match: str = "all",
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> str:
     """
     Find episodes and insights by specific topic.
 
     Args:
         topic: Topic to search for (e.g., "hiring", "growth-marketing", "decision-making")
-        limit: Maximum number of results
+        limit: Maximum number of episodes per page
+        topics: Optional list of topics to combine with `topic` (e.g., ["hiring", "culture"])
+        match: "all" to require every topic (AND), "any" for at least one (OR)
+        format: "markdown" (default) or "json" for compact structured results
+        max_tokens: Optional response budget; results that don't fit are left for the next page
+        cursor: Cursor returned by a previous call, to fetch the next page
 
     Returns:
         Episodes and insights tagged with the specified topic
     """
-    episodes = load_all_episodes()
-    topic_lower = topic.lower()
-
-    results = []
-    for episode in episodes:
-        # Check if topic matches episode topics
-        matching_topics = [t for t in episode.get('topics', []) if topic_lower in t.lower()]
-
-        # Get insights with this topic
-        matching_insights = [
-            insight for insight in episode.get('key_insights', [])
-            if any(topic_lower in t.lower() for t in insight.get('topics', []))
-        ]
-
-        if matching_topics or matching_insights:
-            results.append({
-                'episode': episode,
-                'matching_insights': matching_insights
-            })
+    generation = corpus.generation()
+    topic_index = generation.indexes['topic']
+    if format not in OUTPUT_FORMATS:
+        return invalid_format(format)
+    if match not in TOPIC_MATCH_MODES:
+        return reply(f"Invalid match '{match}'. Use 'all' or 'any'.", format)
+    wanted = requested_topics(topic, topics)
+    if not wanted:
+        return reply("Please provide a topic (e.g., 'hiring', 'growth-marketing', 'decision-making').", format)
+    topic = topic_label(wanted, match)
+    match_all = match == "all"
+
+    # Group matching insights by episode
+    matching_positions: Dict[str, List[int]] = {
+        episode_id: [] for episode_id in topic_index.episodes(topic_index.episode_mask(wanted, match_all))
+    }
+    for episode_id, position in topic_index.insights(topic_index.insight_mask(wanted, match_all)):
+        matching_positions.setdefault(episode_id, []).append(position)
+
+    episode_ids = sorted(matching_positions)
+
+    try:
+        page = Page(max_tokens, cursor, generation.version, limit=limit, keyed=True)
+        page.resume(episode_ids)
+    except ValueError as e:
+        return reply(str(e), format)
+
+    if not episode_ids:
+        return reply(f"No results found for topic '{topic}'.", format)
+
+    # Only the episodes shown on this page are loaded
+    results = (
+        {
+            'episode': episode,
+            'matching_insights': [episode['key_insights'][p] for p in matching_positions[episode['id']]]
+        }
+        for episode in filter(None, map(corpus.get, page.window(episode_ids)))
+    )
 
-    if not results:
-        return f"No results found for topic '{topic}'."
+    if format == "json":
+        return to_json({'topic': topic, 'results': page.take((
+            {
+                'episode_id': result['episode']['id'],
+                'guest_name': result['episode']['guest_name'],
+                'title': result['episode']['title'],
+                'topics': result['episode']['topics'],
+                'matching_insights': [insight_record(insight) for insight in result['matching_insights'][:3]]
+            }
+            for result in results
+        ), to_json, key=lambda record: record['episode_id']), 'next_cursor': page.next_cursor(len(episode_ids))})
 
     output = [f"# Results for Topic: '{topic}'\n"]
-    output.append(f"Found {len(results)} episode(s)\n")
+    output.append(f"Found {len(episode_ids)} episode(s)\n")
+    page.spend("\n".join(output))
 
-    for i, result in enumerate(results[:limit], 1):
+    for i, result in enumerate(results, page.start + 1):
         ep = result['episode']
-        output.append(f"\n## {i}. {ep['guest_name']}: {ep['title']}")
-        output.append(f"**Episode:** {ep['id']}")
-        output.append(f"**Topics:** {', '.join(ep['topics'])}\n")
+        block = [f"\n## {i}. {ep['guest_name']}: {ep['title']}"]
+        block.append(f"**Episode:** {ep['id']}")
+        block.append(f"**Topics:** {', '.join(ep['topics'])}\n")
 
         if result['matching_insights']:
-            output.append(f"**Insights on '{topic}' ({len(result['matching_insights'])}):**\n")
+            block.append(f"**Insights on '{topic}' ({len(result['matching_insights'])}):**\n")
             for insight in result['matching_insights'][:3]:
-                output.append(f"- **{insight['id']}**")
-                output.append(f"  > \"{insight['quote'][:100]}...\"")
-                output.append(f"  {insight['insight'][:150]}...")
-                output.append("")
+                block.append(f"- **{insight['id']}**")
+                block.append(f"  > \"{insight['quote'][:100]}...\"")
+                block.append(f"  {insight['insight'][:150]}...")
+                block.append("")
+        if not page.add("\n".join(block), ep['id']):
+            break
+        output.extend(block)
 
+    output.extend(page.note(len(episode_ids)))
     return "\n".join(output)
 
 
+@mcp.resource("lennys-wisdom://stats/cache", mime_type="application/json")
+def cache_stats() -> str:
+    """Response cache hit/miss counters and size"""
+    return json.dumps(response_cache.stats())
+
+
+@mcp.resource("lennys-wisdom://stats/retrieval", mime_type="application/json")
+def retrieval_stats() -> str:
+    """Per-stage latency of hybrid retrieval (keyword, vector, fusion, total)"""
+    return json.dumps(retriever.stats())
+
+
 if __name__ == "__main__":
-    # Run the MCP server
+    # Pick up new and changed episodes in the background, then run the MCP server
+    corpus.watch()
     mcp.run()
@@ -0,0 +1,222 @@
+"""
+Compiled corpus snapshots for fast server startup
+
+A snapshot is a single file holding every episode plus the prebuilt search
+indexes, so the server can skip parsing JSON and building indexes:
+
+    b"LWCORPUS" | format version (u16) | header length (u32) | header | body
+
+The header is compact JSON with the package version and a hash of its
+code, the source files (name, mtime, size, sha256), the episode manifest
+(id, guest, title, description, topics and the offset/length of the
+episode's compact JSON in the body) and the offset/length of each index's
+state. The body holds those episode blobs followed by the index states,
+written with serialize.py, which cannot run code on load.
+
+The file is memory-mapped; only the header is decoded at startup, index
+states when their index is registered and episode bodies when first
+requested. Snapshots are only trusted when they were written by the same
+code and every source file still matches the header; otherwise the server
+falls back to JSON.
+
+Build (or rebuild) the snapshot next to the episode data with:
+    lennys-wisdom --build-snapshot
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from lennys_wisdom import __version__, serialize
+
+MAGIC = b"LWCORPUS"
+
+# Bump whenever the episode or index layout changes
+FORMAT_VERSION = 2
+
+_PREFIX = struct.Struct("<HI")
+
+SNAPSHOT_NAME = "corpus.snapshot"
+
+
+def file_digest(path: Path) -> str:
+    """sha256 of a file's contents"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def code_digest() -> str:
+    """sha256 over the package's Python sources, so edits invalidate snapshots"""
+    digest = hashlib.sha256()
+    for source in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(source.name.encode('utf-8'))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def describe_sources(episodes_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """Name, mtime, size and hash of every episode file"""
+    sources = {}
+    for json_file in sorted(Path(episodes_dir).glob("ep-*.json")):
+        stat = json_file.stat()
+        sources[json_file.name] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': file_digest(json_file)
+        }
+    return sources
+
+
+def is_fresh(sources: Dict[str, Dict[str, Any]], episodes_dir: Path) -> bool:
+    """
+    Check that the episode files on disk are the ones the snapshot was built from.
+
+    Matching mtime and size is trusted; if only the mtime differs (a fresh
+    checkout or install) the file is hashed and compared instead.
+    """
+    current = {p.name: p for p in Path(episodes_dir).glob("ep-*.json")}
+    if set(current) != set(sources):
+        return False
+    for name, source in sources.items():
+        stat = current[name].stat()
+        if stat.st_size != source['size']:
+            return False
+        if stat.st_mtime_ns != source['mtime_ns'] and file_digest(current[name]) != source['sha256']:
+            return False
+    return True
+
+
+def write_snapshot(
+    path: Path,
+    sources: Dict[str, Dict[str, Any]],
+    manifest: List[Dict[str, Any]],
+    episodes: List[Dict[str, Any]],
+    indexes: Dict[str, Tuple[str, Dict[str, Any]]]
+) -> None:
+    """
+    Atomically write a snapshot file.
+
+    ``manifest`` and ``episodes`` are parallel lists; each manifest entry
+    gets the offset and length of its episode's blob added. ``indexes``
+    maps each index name to its class name and state.
+    """
+    blobs = [json.dumps(episode, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+             for episode in episodes]
+    offset = 0
+    entries = []
+    for entry, blob in zip(manifest, blobs):
+        entries.append(dict(entry, offset=offset, length=len(blob)))
+        offset += len(blob)
+    index_blobs = []
+    index_entries = {}
+    for name, (type_name, state) in indexes.items():
+        blob = serialize.dumps(state)
+        index_entries[name] = {'type': type_name, 'offset': offset, 'length': len(blob)}
+        index_blobs.append(blob)
+        offset += len(blob)
+
+    header = json.dumps({
+        'package': __version__,
+        'code': code_digest(),
+        'python': list(sys.version_info[:2]),
+        'sources': sources,
+        'manifest': entries,
+        'indexes': index_entries
+    }, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_PREFIX.pack(FORMAT_VERSION, len(header)))
+            f.write(header)
+            for blob in blobs + index_blobs:
+                f.write(blob)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+class Snapshot:
+    """
+    A memory-mapped snapshot file.
+
+    Attributes:
+        sources: Source file descriptions from the header
+        manifest: Episode manifest entries with blob offsets
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mapped[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{self.path} is not a corpus snapshot")
+            self.format_version, header_length = _PREFIX.unpack_from(self._mapped, len(MAGIC))
+            header_start = len(MAGIC) + _PREFIX.size
+            self._body = header_start + header_length
+            self.header = json.loads(bytes(self._mapped[header_start:self._body]))
+        except BaseException:
+            self.close()
+            raise
+        self.sources: Dict[str, Dict[str, Any]] = self.header.get('sources', {})
+        self.manifest: List[Dict[str, Any]] = self.header.get('manifest', [])
+
+    def usable(self, episodes_dir: Path) -> bool:
+        """True if this snapshot was built by this format, code and Python from the files on disk"""
+        return (self.format_version == FORMAT_VERSION and
+                self.header.get('package') == __version__ and
+                self.header.get('code') == code_digest() and
+                self.header.get('python') == list(sys.version_info[:2]) and
+                is_fresh(self.sources, episodes_dir))
+
+    def index_types(self) -> Dict[str, str]:
+        """Class name of every prebuilt index, by index name"""
+        return {name: entry['type'] for name, entry in self.header.get('indexes', {}).items()}
+
+    def index_state(self, name: str) -> Dict[str, Any]:
+        """
+        Decode the prebuilt state of one index.
+
+        Raises:
+            KeyError: The snapshot has no index of that name
+            ValueError: The state is malformed
+        """
+        entry = self.header['indexes'][name]
+        start = self._body + entry['offset']
+        return serialize.loads(self._mapped[start:start + entry['length']])
+
+    def episode(self, offset: int, length: int) -> Dict[str, Any]:
+        """Decode one episode blob"""
+        start = self._body + offset
+        return json.loads(self._mapped[start:start + length])
+
+    def close(self) -> None:
+        if getattr(self, '_mapped', None) is not None:
+            self._mapped.close()
+            self._mapped = None
+        self._file.close()
+
+
+def open_snapshot(path: Path, episodes_dir: Path) -> Optional[Snapshot]:
+    """Open a snapshot if it exists, is readable by this version and is fresh"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        snapshot = Snapshot(path)
+    except (OSError, ValueError):
+        return None
+    if not snapshot.usable(episodes_dir):
+        snapshot.close()
+        return None
+    return snapshot
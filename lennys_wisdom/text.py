@@ -0,0 +1,87 @@
+"""
+Text analysis shared by the search indexes and the query parser
+
+Both sides of a search go through the same pipeline: casefolded
+alphanumeric tokens, stopwords dropped, then a light suffix-stripping
+stemmer so "hiring", "hired" and "hire" meet on the same term.
+"""
+
+import re
+from typing import Iterable, List
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could d did do does doing down
+during each few for from further get had has have having he her here hers
+herself him himself his how i if in into is it its itself just ll m me more
+most my myself need no nor not now of off on once only or other our ours
+ourselves out over own re s same she should so some such t than that the their
+theirs them themselves then there these they this those through to too under
+until up ve very want was we were what when where which while who whom why
+will with would you your yours yourself yourselves
+""".split())
+
+# Separator joining the stems of a multi-word tag ("product-market-fit")
+COMPOUND_JOINER = "_"
+
+_VOWELS = frozenset("aeiouy")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into casefolded alphanumeric tokens"""
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def stem(token: str) -> str:
+    """
+    Strip common English inflections.
+
+    Deliberately light: plurals, -ing and -ed, then a trailing "e", which is
+    enough to conflate hire/hires/hired/hiring without Porter's full rule set.
+    """
+    if len(token) <= 3 or token.isdigit():
+        return token
+
+    if token.endswith("ies") and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith("sses"):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+
+    for suffix in ("ing", "ed"):
+        if token.endswith(suffix) and not token.endswith("eed"):
+            base = token[:-len(suffix)]
+            if len(base) >= 3 and _VOWELS.intersection(base):
+                token = base
+                # running -> runn -> run, but keep "fall", "pass", "buzz"
+                if base[-1] == base[-2] and base[-1] not in "lsz":
+                    token = base[:-1]
+            break
+
+    if token.endswith("e") and len(token) > 3:
+        token = token[:-1]
+    return token
+
+
+def analyze(text: str) -> List[str]:
+    """Tokens of ``text`` with stopwords removed and stemmed, in order"""
+    return [stem(token) for token in tokenize(text) if token not in STOPWORDS]
+
+
+def analyze_tags(tags: Iterable[str]) -> List[str]:
+    """
+    Analyze topic-style tags such as "product-market-fit".
+
+    Every word is emitted on its own, and multi-word tags are also emitted as
+    a single compound term so the query parser can match them as a phrase.
+    """
+    terms = []
+    for tag in tags:
+        words = analyze(tag)
+        terms.extend(words)
+        if len(words) > 1:
+            terms.append(COMPOUND_JOINER.join(words))
+    return terms
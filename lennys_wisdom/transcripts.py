@@ -0,0 +1,320 @@
+"""
+Full-transcript passage search
+
+Transcripts are split into passages of roughly ``PASSAGE_WORDS`` words
+along speaker turns, each tagged with the speaker and timestamp of the turn
+it starts in. Two files are written next to the episode data:
+
+    transcripts.blob   every passage's UTF-8 text, back to back
+    transcripts.index  passage table (blob offsets, episode, speaker,
+                       timestamp, length) and inverted index (term ->
+                       passage ids and term frequencies), written with
+                       serialize.py so loading it cannot run code
+
+The blob is memory-mapped, so a search ranks passages from the inverted
+index alone and decodes only the passages it returns; whole transcripts
+are never loaded into memory.
+
+Build the files from a directory of "<Guest Name>.txt" transcripts with:
+    lennys-wisdom --build-transcripts /path/to/transcripts
+"""
+
+import heapq
+import math
+import mmap
+import os
+import re
+import tempfile
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from lennys_wisdom import serialize
+from lennys_wisdom.text import analyze
+
+BLOB_NAME = "transcripts.blob"
+INDEX_NAME = "transcripts.index"
+
+# Bump whenever the passage table or postings layout changes
+FORMAT_VERSION = 2
+
+# Target passage size; long speaker turns are split at sentence ends
+PASSAGE_WORDS = 200
+
+# BM25 parameters for passage ranking
+K1 = 1.2
+B = 0.75
+
+# "Brian Chesky (00:12:34):" or "[00:12:34] Brian Chesky:" at the start of a turn
+_TURN_RE = re.compile(
+    r"^(?:(?P<speaker>[^\n():\[\]]{1,80}?)\s*\((?P<ts>\d{1,2}:\d{2}(?::\d{2})?)\)\s*:?"
+    r"|\[(?P<ts2>\d{1,2}:\d{2}(?::\d{2})?)\]\s*(?P<speaker2>[^\n:]{1,80}):)\s*",
+    re.MULTILINE
+)
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+class Turn(NamedTuple):
+    """One speaker turn of a transcript"""
+    speaker: str
+    timestamp: str
+    text: str
+
+
+class Passage(NamedTuple):
+    """A transcript passage returned by a search"""
+    episode_id: str
+    guest_name: str
+    speaker: str
+    timestamp: str
+    text: str
+    score: float
+
+
+def parse_turns(transcript: str) -> List[Turn]:
+    """Split a transcript into speaker turns (a single untimed turn if no headers are found)"""
+    matches = list(_TURN_RE.finditer(transcript))
+    if not matches:
+        text = transcript.strip()
+        return [Turn('', '', text)] if text else []
+
+    turns = []
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following else len(transcript)
+        text = " ".join(transcript[match.end():end].split())
+        if text:
+            speaker = (match.group('speaker') or match.group('speaker2') or '').strip()
+            timestamp = match.group('ts') or match.group('ts2') or ''
+            turns.append(Turn(speaker, timestamp, text))
+    return turns
+
+
+def chunk_turns(turns: Iterable[Turn], passage_words: int = PASSAGE_WORDS) -> Iterator[Turn]:
+    """
+    Group turns into passages of about ``passage_words`` words.
+
+    Short consecutive turns are merged (keeping the first turn's speaker and
+    timestamp); long turns are split at sentence boundaries.
+    """
+    pending: Optional[Turn] = None
+    pending_words = 0
+    for turn in turns:
+        for sentence_group in _split_long(turn.text, passage_words):
+            words = len(sentence_group.split())
+            if pending is not None and pending_words + words > passage_words:
+                yield pending
+                pending = None
+            if pending is None:
+                pending, pending_words = Turn(turn.speaker, turn.timestamp, sentence_group), words
+            else:
+                speaker_prefix = f"{turn.speaker}: " if turn.speaker and turn.speaker != pending.speaker else ""
+                pending = pending._replace(text=f"{pending.text} {speaker_prefix}{sentence_group}")
+                pending_words += words
+    if pending is not None:
+        yield pending
+
+
+def _split_long(text: str, passage_words: int) -> List[str]:
+    """Split a turn longer than ``passage_words`` into sentence groups"""
+    if len(text.split()) <= passage_words:
+        return [text]
+    groups, current, count = [], [], 0
+    for sentence in _SENTENCE_END_RE.split(text):
+        words = len(sentence.split())
+        if current and count + words > passage_words:
+            groups.append(" ".join(current))
+            current, count = [], 0
+        current.append(sentence)
+        count += words
+    if current:
+        groups.append(" ".join(current))
+    return groups
+
+
+def find_transcript(transcripts_dir: Path, episode: Dict[str, Any]) -> Optional[Path]:
+    """Locate an episode's transcript by the file name in transcript_path, then by guest name"""
+    candidates = []
+    if episode.get('transcript_path'):
+        candidates.append(Path(episode['transcript_path']).name)
+    if episode.get('guest_name'):
+        candidates.append(f"{episode['guest_name']}.txt")
+    for name in candidates:
+        path = Path(transcripts_dir) / name
+        if path.is_file():
+            return path
+    return None
+
+
+def build_transcript_index(
+    episodes: Iterable[Dict[str, Any]],
+    transcripts_dir: Path,
+    output_dir: Path
+) -> Tuple[int, int]:
+    """
+    Chunk and index the transcripts of ``episodes`` into ``output_dir``.
+
+    Transcripts are read one at a time and passages are appended to the
+    blob as they are produced.
+
+    Returns:
+        (number of transcripts indexed, number of passages)
+    """
+    output_dir = Path(output_dir)
+    episode_table: List[Tuple[str, str]] = []
+    offsets = array('Q', [0])
+    passage_episodes = array('I')
+    lengths = array('I')
+    speakers: List[str] = []
+    timestamps: List[str] = []
+    postings: Dict[str, Tuple[array, array]] = {}
+
+    blob_path = output_dir / BLOB_NAME
+    fd, blob_tmp = tempfile.mkstemp(dir=output_dir, prefix=BLOB_NAME, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as blob:
+            for episode in episodes:
+                path = find_transcript(transcripts_dir, episode)
+                if path is None:
+                    continue
+                episode_number = len(episode_table)
+                episode_table.append((episode['id'], episode.get('guest_name', '')))
+                with open(path, 'r', encoding='utf-8') as f:
+                    turns = parse_turns(f.read())
+
+                for passage in chunk_turns(turns):
+                    passage_id = len(lengths)
+                    terms = Counter(analyze(passage.text))
+                    for term, tf in terms.items():
+                        ids, tfs = postings.setdefault(term, (array('I'), array('H')))
+                        ids.append(passage_id)
+                        tfs.append(min(tf, 0xFFFF))
+                    encoded = passage.text.encode('utf-8')
+                    blob.write(encoded)
+                    offsets.append(offsets[-1] + len(encoded))
+                    passage_episodes.append(episode_number)
+                    lengths.append(sum(terms.values()))
+                    speakers.append(passage.speaker)
+                    timestamps.append(passage.timestamp)
+        os.replace(blob_tmp, blob_path)
+    except BaseException:
+        os.unlink(blob_tmp)
+        raise
+
+    _write_index(output_dir / INDEX_NAME, {
+        'format': FORMAT_VERSION,
+        'blob_size': offsets[-1],
+        'episodes': episode_table,
+        'offsets': offsets,
+        'passage_episodes': passage_episodes,
+        'lengths': lengths,
+        'speakers': speakers,
+        'timestamps': timestamps,
+        'postings': postings,
+    })
+    return len(episode_table), len(lengths)
+
+
+def _write_index(path: Path, data: Dict[str, Any]) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(serialize.dumps(data))
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+class TranscriptIndex:
+    """
+    Read side of the transcript files: ranks passages and decodes them from the blob.
+
+    Args:
+        data_dir: Directory holding transcripts.blob and transcripts.index
+    """
+
+    def __init__(self, data_dir: Path):
+        data_dir = Path(data_dir)
+        with open(data_dir / INDEX_NAME, 'rb') as f:
+            data = serialize.loads(f.read())
+        if not isinstance(data, dict) or data.get('format') != FORMAT_VERSION:
+            raise ValueError(f"{data_dir / INDEX_NAME} has an unsupported format; rebuild it")
+        self._file = open(data_dir / BLOB_NAME, 'rb')
+        if os.fstat(self._file.fileno()).st_size != data['blob_size']:
+            self._file.close()
+            raise ValueError(f"{data_dir / BLOB_NAME} does not match {INDEX_NAME}; rebuild it")
+        self._blob = (mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                      if data['blob_size'] else b"")
+
+        self.episodes: List[Tuple[str, str]] = data['episodes']
+        self._offsets: array = data['offsets']
+        self._passage_episodes: array = data['passage_episodes']
+        self._lengths: array = data['lengths']
+        self._speakers: List[str] = data['speakers']
+        self._timestamps: List[str] = data['timestamps']
+        self._postings: Dict[str, Tuple[array, array]] = data['postings']
+        self._average_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 1.0
+        self._episode_numbers = {episode_id: n for n, (episode_id, _) in enumerate(self.episodes)}
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def passage_text(self, passage_id: int) -> str:
+        """Decode one passage from the memory-mapped blob"""
+        return bytes(self._blob[self._offsets[passage_id]:self._offsets[passage_id + 1]]).decode('utf-8')
+
+    def search(self, query: str, limit: int = 10, episode_id: Optional[str] = None) -> Iterator[Passage]:
+        """
+        Yield the best passages for ``query``, best first.
+
+        Passages are ranked with BM25 from the postings alone; text is read
+        from the blob only as each result is yielded.
+
+        Args:
+            query: Search terms
+            limit: Maximum number of passages
+            episode_id: Only search this episode's transcript
+        """
+        only_episode = self._episode_numbers.get(episode_id, -1) if episode_id else None
+        terms = set(analyze(query))
+        total = max(len(self._lengths), 1)
+        scores: Dict[int, float] = {}
+        for term in terms:
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            ids, tfs = entry
+            idf = math.log(1 + (total - len(ids) + 0.5) / (len(ids) + 0.5))
+            for passage_id, tf in zip(ids, tfs):
+                if only_episode is not None and self._passage_episodes[passage_id] != only_episode:
+                    continue
+                norm = 1 - B + B * self._lengths[passage_id] / self._average_length
+                scores[passage_id] = scores.get(passage_id, 0.0) + idf * tf * (K1 + 1) / (tf + K1 * norm)
+
+        for passage_id, score in heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0])):
+            episode_id_, guest_name = self.episodes[self._passage_episodes[passage_id]]
+            yield Passage(
+                episode_id=episode_id_,
+                guest_name=guest_name,
+                speaker=self._speakers[passage_id],
+                timestamp=self._timestamps[passage_id],
+                text=self.passage_text(passage_id),
+                score=score
+            )
+
+    def close(self) -> None:
+        if isinstance(self._blob, mmap.mmap):
+            self._blob.close()
+        self._file.close()
+
+
+def open_transcript_index(data_dir: Path) -> Optional[TranscriptIndex]:
+    """Open the transcript index in ``data_dir`` if it has been built"""
+    data_dir = Path(data_dir)
+    if not (data_dir / INDEX_NAME).exists() or not (data_dir / BLOB_NAME).exists():
+        return None
+    try:
+        return TranscriptIndex(data_dir)
+    except (OSError, ValueError, KeyError):
+        return None
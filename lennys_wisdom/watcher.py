@@ -0,0 +1,210 @@
+"""
+Episode directory watching
+
+A background thread notices episode files being added, replaced or deleted
+and calls back once the directory has been quiet for ``DEBOUNCE_SECONDS``
+(so a burst of files from a batch extraction triggers one reload, not one
+per file).
+
+On Linux the thread blocks on inotify (through ctypes, so nothing extra is
+installed); elsewhere, or if inotify is unavailable, it polls the
+directory's file names, sizes and mtimes every ``POLL_INTERVAL`` seconds.
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds between directory scans when polling
+POLL_INTERVAL = 0.5
+
+# Quiet period after the last change before calling back
+DEBOUNCE_SECONDS = 0.1
+
+# inotify event masks (linux/inotify.h)
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# Finished writes, renames in or out, and deletes; not every IN_MODIFY of a
+# file still being written
+WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_inotify() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class DirectoryWatcher:
+    """
+    Calls ``on_change`` from a daemon thread whenever files matching
+    ``pattern`` in ``directory`` change.
+
+    Exceptions raised by ``on_change`` are logged and the watch goes on; the
+    next change retries.
+
+    Args:
+        directory: Directory to watch (not recursive)
+        on_change: Called with no arguments after each burst of changes
+        pattern: Glob of the file names that matter
+        poll_interval: Seconds between scans when polling
+        use_inotify: Set False to force polling
+
+    Attributes:
+        backend: "inotify" or "polling", once started
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        on_change: Callable[[], None],
+        pattern: str = "ep-*.json",
+        poll_interval: float = POLL_INTERVAL,
+        use_inotify: bool = True
+    ):
+        self.directory = Path(directory)
+        self.on_change = on_change
+        self.pattern = pattern
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend: Optional[str] = None
+        self.changes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._fd = -1
+
+    def start(self) -> "DirectoryWatcher":
+        """Start watching in a daemon thread"""
+        if self._thread is not None:
+            return self
+        libc = _load_inotify() if self.use_inotify else None
+        if libc is not None:
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0 and libc.inotify_add_watch(fd, os.fsencode(self.directory), WATCH_MASK) >= 0:
+                self._fd, self.backend = fd, "inotify"
+            elif fd >= 0:
+                os.close(fd)
+        if self.backend is None:
+            self.backend = "polling"
+        self._thread = threading.Thread(
+            target=self._run_inotify if self.backend == "inotify" else self._run_polling,
+            name=f"watch:{self.directory.name}",
+            daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching and wait for the thread to exit"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    @property
+    def alive(self) -> bool:
+        """True while the watch thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _notify(self) -> None:
+        self.changes += 1
+        try:
+            self.on_change()
+        except Exception:
+            logger.exception("Reloading %s failed", self.directory)
+
+    def _read_events(self) -> Tuple[bool, bool]:
+        """Drain pending inotify events: (a matching file changed, the directory itself went away)"""
+        relevant = gone = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return relevant, gone
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b"\0")
+                offset += _EVENT_HEADER.size + length
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    gone = True
+                elif fnmatch.fnmatch(os.fsdecode(name), self.pattern):
+                    relevant = True
+
+    def _run_inotify(self) -> None:
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self._fd], [], [], self.poll_interval)
+            if not ready:
+                continue
+            relevant, gone = self._read_events()
+            # Wait until writes settle so one burst is one reload
+            while relevant and not gone and select.select([self._fd], [], [], DEBOUNCE_SECONDS)[0]:
+                more, gone = self._read_events()
+                relevant = relevant or more
+            if relevant:
+                self._notify()
+            if gone:
+                logger.warning("%s was removed or moved; watching by polling", self.directory)
+                self.backend = "polling"
+                self._run_polling()
+                return
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """File name -> (mtime_ns, size) of every matching file"""
+        stamps = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if fnmatch.fnmatch(entry.name, self.pattern):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        stamps[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+        return stamps
+
+    def _run_polling(self) -> None:
+        previous = self._scan()
+        while not self._stop.wait(self.poll_interval):
+            current = self._scan()
+            if current != previous:
+                # Wait until writes settle so one burst is one reload
+                time.sleep(DEBOUNCE_SECONDS)
+                current = self._scan()
+                self._notify()
+                previous = current
@@ -16,7 +16,7 @@ setup(
     url="https://github.com/edisoncruz/lennys-wisdom-mcp",
     packages=find_packages(),
     package_data={
-        'lennys_wisdom': ['data/episodes/*.json'],
+        'lennys_wisdom': ['data/episodes/*.json', 'data/corpus.snapshot', 'data/embeddings.ivf.npz'],
     },
     include_package_data=True,
     classifiers=[
@@ -34,6 +34,9 @@ setup(
     install_requires=[
         "fastmcp>=0.1.0",
     ],
+    extras_require={
+        "semantic": ["numpy>=1.20"],
+    },
     entry_points={
         'console_scripts': [
             'lennys-wisdom=lennys_wisdom.__main__:main',
@@ -0,0 +1,121 @@
+"""Tests for response budgets and cursors (lennys_wisdom/budget.py)"""
+
+import pytest
+
+from lennys_wisdom.budget import (
+    CONTINUATION_TOKENS,
+    EXPIRED_CURSOR,
+    Page,
+    decode_cursor,
+    encode_cursor,
+    estimate_tokens,
+)
+
+
+def test_cursor_round_trip():
+    for key in (None, "ep-brian-chesky", ("ep-brian-chesky", 3), 7):
+        assert decode_cursor(encode_cursor(12, 40, key)) == (12, 40, key)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(1, 2, ("ep-ünïcode", 5))
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor(1, -3), "WzFd"])
+def test_malformed_cursor_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        Page(None, cursor, 1)
+
+
+def test_offset_cursor_expires_with_version():
+    cursor = encode_cursor(1, 10)
+    assert Page(None, cursor, 1).start == 10
+    with pytest.raises(ValueError, match="expired"):
+        Page(None, cursor, 2)
+
+
+def test_keyed_cursor_survives_version():
+    page = Page(None, encode_cursor(1, 2, "b"), 2, keyed=True)
+    assert page.resume(["a", "b", "c", "d"]) == 2
+
+
+def test_cursor_from_another_tool_rejected():
+    # A guest-name cursor given to a tool keyed by (episode, insight) pairs
+    page = Page(None, encode_cursor(1, 1, "Ben Horowitz"), 1, keyed=True)
+    with pytest.raises(ValueError, match="Invalid cursor for this tool"):
+        page.resume([("ep-a", 0), ("ep-a", 1), ("ep-b", 0)])
+
+
+def test_ordered_resume_survives_removed_key():
+    keys = [("ep-a", 0), ("ep-a", 2), ("ep-c", 1)]
+    page = Page(None, encode_cursor(1, 2, ("ep-a", 1)), 2, keyed=True)
+    assert page.resume(keys) == 1
+    assert page.window(keys) == [("ep-a", 2), ("ep-c", 1)]
+
+
+def test_unordered_resume_finds_moved_key():
+    ranked = ["ep-c", "ep-a", "ep-b", "ep-d"]
+    page = Page(None, encode_cursor(1, 1, "ep-b"), 1, keyed=True)
+    assert page.resume(ranked, ordered=False) == 3
+
+    # The cursor's offset is used when the key is still there
+    page = Page(None, encode_cursor(1, 3, "ep-b"), 1, keyed=True)
+    assert page.resume(ranked, ordered=False) == 3
+
+
+def test_unordered_resume_expires_without_key():
+    page = Page(None, encode_cursor(1, 2, "ep-gone"), 2, keyed=True)
+    with pytest.raises(ValueError) as raised:
+        page.resume(["ep-a", "ep-b"], ordered=False)
+    assert str(raised.value) == EXPIRED_CURSOR
+
+
+def test_invalid_max_tokens_rejected():
+    with pytest.raises(ValueError, match="max_tokens"):
+        Page(0, None, 1)
+
+
+@pytest.mark.parametrize("limit", [0, -5])
+def test_invalid_limit_rejected(limit):
+    with pytest.raises(ValueError, match="Invalid limit"):
+        Page(None, None, 1, limit=limit)
+
+
+def test_limit_pages():
+    items = list(range(7))
+    seen, cursor = [], None
+    while True:
+        page = Page(None, cursor, 1, limit=3)
+        taken = page.take(page.window(items), str)
+        seen.extend(taken)
+        cursor = page.next_cursor(len(items))
+        if cursor is None:
+            break
+        assert len(taken) == 3
+    assert seen == items
+
+
+def test_budget_continues_where_it_stopped():
+    items = [f"item {i} " + "x" * 40 for i in range(30)]
+    budget = CONTINUATION_TOKENS + 5 * (estimate_tokens(items[0]) + 1)
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = Page(budget, cursor, 1)
+        page.resume(items)
+        taken = page.take(page.window(items), lambda item: item)
+        assert taken and page.used <= budget
+        seen.extend(taken)
+        pages += 1
+        cursor = page.next_cursor(len(items))
+        if cursor is None:
+            break
+        assert page.note(len(items))[0].startswith(f"\n*Showing {page.start + 1}-{page.end} of 30.")
+    assert seen == items
+    assert pages == 6
+
+
+def test_first_item_always_fits():
+    page = Page(1, None, 1)
+    assert page.take(["x" * 400, "y"], lambda item: item) == ["x" * 400]
+    assert page.next_cursor(2) is not None
@@ -0,0 +1,178 @@
+"""Tests for reloads, snapshots and shadowed episodes (lennys_wisdom/corpus.py)"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from lennys_wisdom.corpus import CorpusStore
+from lennys_wisdom.index import FrameworkIndex, GuestIndex, InvertedIndex, SituationIndex, TopicIndex
+
+EPISODES_DIR = Path(__file__).resolve().parent.parent / "lennys_wisdom" / "data" / "episodes"
+
+NAMES = ["ep-ami-vora", "ep-annie-duke", "ep-april-dunford"]
+
+TOPICS = [['leadership'], ['strategy'], ['positioning'], ['decision-making', 'leadership']]
+
+
+def copy_episodes(episodes_dir: Path, names=NAMES) -> Path:
+    episodes_dir.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        shutil.copy(EPISODES_DIR / f"{name}.json", episodes_dir / f"{name}.json")
+    return episodes_dir
+
+
+def edit(json_file: Path, **fields) -> None:
+    with open(json_file, 'r', encoding='utf-8') as f:
+        episode = json.load(f)
+    episode.update(fields)
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(episode, f, indent=2)
+
+
+def retitle_same_size(json_file: Path) -> None:
+    """Change the first letter of the title to X, keeping the file size"""
+    data = json_file.read_bytes()
+    stat = json_file.stat()
+    start = data.index(b'"title": "') + len(b'"title": "')
+    assert data[start:start + 1] != b'X'
+    json_file.write_bytes(data[:start] + b'X' + data[start + 1:])
+    assert json_file.stat().st_size == stat.st_size
+    os.utime(json_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def open_store(episodes_dir, snapshot_path=None) -> CorpusStore:
+    store = CorpusStore(episodes_dir, check_interval=0, snapshot_path=snapshot_path)
+    store.add_indexes({
+        'search': InvertedIndex(),
+        'situation': SituationIndex(),
+        'framework': FrameworkIndex(),
+        'guest': GuestIndex(),
+        'topic': TopicIndex(),
+    })
+    return store
+
+
+def view(store: CorpusStore) -> dict:
+    """Everything the indexes answer, independent of doc ids and slot numbers"""
+    indexes = store.generation().indexes
+    search, topic = indexes['search'], indexes['topic']
+    return {
+        'manifest': [(entry.id, entry.title, entry.path.name) for entry in store.manifest()],
+        'postings': {
+            token: {search.docs[doc]: tf for doc, tf in docs.items()}
+            for token, docs in search.postings.items()
+        },
+        'lengths': (search.unit_count, search._field_lengths),
+        'situations': indexes['situation'].situations,
+        'frameworks': indexes['framework'].frameworks,
+        'guests': indexes['guest'].guests,
+        'topics': [
+            (topic.insights(topic.insight_mask(topics)), topic.episodes(topic.episode_mask(topics)))
+            for topics in TOPICS
+        ],
+        'actionable': topic.insights(topic.actionable),
+    }
+
+
+def test_refresh_add_change_delete(tmp_path):
+    episodes_dir = copy_episodes(tmp_path / "episodes", NAMES[:2])
+    store = open_store(episodes_dir)
+    version = store.version
+
+    copy_episodes(episodes_dir, NAMES[2:])
+    edit(episodes_dir / "ep-ami-vora.json", title="Zeppelin strategy with Ami Vora", topics=['zeppelins'])
+    (episodes_dir / "ep-annie-duke.json").unlink()
+    assert store.refresh()
+    assert store.version == version + 1
+
+    assert [entry.id for entry in store.manifest()] == ["ep-ami-vora", "ep-april-dunford"]
+    assert store.get("ep-annie-duke") is None
+    assert store.get("ep-ami-vora")['title'] == "Zeppelin strategy with Ami Vora"
+    assert view(store) == view(open_store(episodes_dir))
+
+    # Nothing changed since
+    assert not store.refresh()
+    assert store.version == version + 1
+
+
+def test_refresh_same_size_edit(tmp_path):
+    episodes_dir = copy_episodes(tmp_path / "episodes")
+    store = open_store(episodes_dir)
+    retitle_same_size(episodes_dir / "ep-april-dunford.json")
+
+    assert store.refresh()
+    assert store.get("ep-april-dunford")['title'].startswith("X")
+    assert view(store) == view(open_store(episodes_dir))
+
+
+def test_snapshot_round_trip(tmp_path):
+    episodes_dir = copy_episodes(tmp_path / "episodes")
+    snapshot_path = tmp_path / "corpus.snapshot"
+    built = open_store(episodes_dir)
+    built.write_snapshot(snapshot_path)
+
+    loaded = open_store(episodes_dir, snapshot_path)
+    assert loaded.loaded_from_snapshot
+    assert view(loaded) == view(built)
+    assert loaded.get("ep-ami-vora") == built.get("ep-ami-vora")
+
+    # Touching a file without changing it keeps the snapshot usable
+    json_file = episodes_dir / "ep-ami-vora.json"
+    stat = json_file.stat()
+    os.utime(json_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert open_store(episodes_dir, snapshot_path).loaded_from_snapshot
+
+
+@pytest.mark.parametrize("change", ["edit", "same_size", "add", "delete"])
+def test_stale_snapshot_ignored(tmp_path, change):
+    episodes_dir = copy_episodes(tmp_path / "episodes", NAMES[:2])
+    snapshot_path = tmp_path / "corpus.snapshot"
+    open_store(episodes_dir).write_snapshot(snapshot_path)
+
+    json_file = episodes_dir / "ep-ami-vora.json"
+    if change == "edit":
+        edit(json_file, title="Retitled")
+    elif change == "same_size":
+        retitle_same_size(json_file)
+    elif change == "add":
+        copy_episodes(episodes_dir, NAMES[2:])
+    else:
+        json_file.unlink()
+
+    store = open_store(episodes_dir, snapshot_path)
+    assert not store.loaded_from_snapshot
+    assert view(store) == view(open_store(episodes_dir))
+
+
+def test_shadowed_ids_served_from_first_directory(tmp_path):
+    first = copy_episodes(tmp_path / "first", NAMES[:1])
+    second = copy_episodes(tmp_path / "second")
+    edit(first / "ep-ami-vora.json", title="Ami Vora, edited copy")
+
+    store = open_store([first, second])
+    assert [entry.id for entry in store.manifest()] == NAMES
+    assert store.manifest()[0].path == first / "ep-ami-vora.json"
+    assert store.get("ep-ami-vora")['title'] == "Ami Vora, edited copy"
+    assert store.index('search').match("edited") == {
+        key for key in store.index('search').docs.values() if key.episode_id == "ep-ami-vora" and key.field == 'title'
+    }
+
+    # Editing the shadowed copy changes nothing
+    edit(second / "ep-ami-vora.json", title="Ignored")
+    assert not store.refresh()
+
+    # Removing the first copy hands the id to the second directory
+    (first / "ep-ami-vora.json").unlink()
+    assert store.refresh()
+    assert store.get("ep-ami-vora")['title'] == "Ignored"
+    assert store.manifest()[0].path == second / "ep-ami-vora.json"
+    assert view(store) == view(open_store(second))
+
+
+def test_snapshot_needs_single_directory(tmp_path):
+    store = open_store([copy_episodes(tmp_path / "first", NAMES[:1]), copy_episodes(tmp_path / "second")])
+    with pytest.raises(ValueError, match="single episode directory"):
+        store.write_snapshot(tmp_path / "corpus.snapshot")
@@ -0,0 +1,50 @@
+"""Tests for framework lookup (lennys_wisdom/server.py, lennys_wisdom/index.py)"""
+
+import json
+
+import pytest
+
+from lennys_wisdom import server
+from lennys_wisdom.index import FrameworkIndex
+
+CATALOG = json.loads(server.list_frameworks(format="json"))["frameworks"]
+
+
+def test_catalog_lists_frameworks():
+    assert len(CATALOG) == len(server.corpus.index('framework').frameworks)
+
+
+@pytest.mark.parametrize("record", CATALOG, ids=lambda record: record["id"])
+def test_listed_name_resolves(record):
+    for name in (record["name"], record["id"], record["name"].upper()):
+        assert json.loads(server.get_framework(name, format="json"))["id"] == record["id"]
+
+
+def test_markdown_listing_resolves():
+    listing = server.list_frameworks()
+    headings = [line.split(". ", 1)[1] for line in listing.splitlines() if line.startswith("## ") and ". " in line]
+    assert len(headings) == len(CATALOG)
+    for heading in headings:
+        assert "Framework ID:" in server.get_framework(heading)
+
+
+@pytest.mark.parametrize("name, framework_id", [
+    ("LNO", "framework-lno-001"),
+    ("lno framework", "framework-lno-001"),
+    ("DHM", "framework-dhm-001"),
+])
+def test_short_name_resolves(name, framework_id):
+    assert json.loads(server.get_framework(name, format="json"))["id"] == framework_id
+
+
+def test_unknown_framework_suggests_by_display_name():
+    reply = json.loads(server.get_framework("Leverage Neutral", format="json"))
+    assert reply["suggestions"][0] == "framework-lno-001"
+
+
+def test_full_name_preferred_over_short_name():
+    index = FrameworkIndex()
+    index.add_episode({'id': 'ep-a', 'guest_name': 'A', 'frameworks_mentioned': ['framework-okrs-001', 'OKRs']})
+    assert index.get('okrs')['id'] == 'OKRs'
+    assert index.get('framework okrs 001')['id'] == 'framework-okrs-001'
+    assert index.get('missing') is None
@@ -0,0 +1,21 @@
+"""Tests for guest quotes (lennys_wisdom/server.py)"""
+
+import json
+
+from lennys_wisdom import server
+
+
+def test_quotes_by_guest():
+    server.response_cache.clear()
+    reply = json.loads(server.get_quotes_by_guest("Ben Horowitz", format="json"))
+    assert reply["guest"] == "Ben Horowitz" and reply["quotes"]
+
+
+def test_guest_removed_after_generation(monkeypatch):
+    # The guest index still lists the episode but its body is already gone
+    server.response_cache.clear()
+    monkeypatch.setattr(server.corpus, "get", lambda episode_id: None)
+    assert server.get_quotes_by_guest("Ben Horowitz").startswith("Guest 'Ben Horowitz' not found.")
+    reply = json.loads(server.get_quotes_by_guest("Ben Horowitz", format="json"))
+    assert reply["message"] == "Guest 'Ben Horowitz' not found."
+    server.response_cache.clear()
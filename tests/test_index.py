@@ -0,0 +1,135 @@
+"""Tests for incremental index updates (lennys_wisdom/index.py)"""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from lennys_wisdom.corpus import staged_copy
+from lennys_wisdom.index import FrameworkIndex, GuestIndex, InvertedIndex, SituationIndex, TopicIndex
+
+EPISODES_DIR = Path(__file__).resolve().parent.parent / "lennys_wisdom" / "data" / "episodes"
+
+# State that must return to what it was once an added episode is removed
+# (slot and doc id counters only ever grow, and caches are rebuilt on demand)
+STATE = {
+    InvertedIndex: ('postings', 'docs', 'doc_lengths', '_field_lengths', 'unit_count',
+                    '_episode_units', '_episode_postings'),
+    SituationIndex: ('situations', '_terms', '_situation_terms', '_episode_situations'),
+    GuestIndex: ('guests', '_words', '_trigrams', '_episode_guest'),
+    TopicIndex: ('insight_topics', 'episode_topics', 'actionable', '_episode_state'),
+    FrameworkIndex: ('frameworks', '_episode_frameworks'),
+}
+
+
+def load(name: str) -> dict:
+    with open(EPISODES_DIR / f"{name}.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+BASE = [load("ep-ami-vora"), load("ep-april-dunford")]
+
+# A second episode from a guest already indexed, sharing topics, situations and terms
+EXTRA = dict(copy.deepcopy(BASE[0]), id="ep-ami-vora-2", title="Ami Vora returns to talk product reviews")
+EXTRA['key_insights'] = EXTRA['key_insights'][:3] + [{
+    'quote': 'A brand new insight about pricing page experiments.',
+    'insight': 'Experiment with the pricing page.',
+    'context': 'Growth discussion.',
+    'topics': ['pricing', 'brand-new-topic'],
+    'actionable': True
+}]
+EXTRA['situations_addressed'] = EXTRA['situations_addressed'][:2] + ['situation-brand-new-situation']
+
+# An episode sharing nothing with the others: a new guest, topic and situation
+STRANGER = {
+    'id': 'ep-stranger',
+    'guest_name': 'Zed Quillfeather',
+    'title': 'Xylophone zeppelins',
+    'topics': ['zeppelins'],
+    'situations_addressed': ['situation-zeppelin-landing'],
+    'frameworks_mentioned': ['framework-zeppelin-001'],
+    'key_insights': [{'quote': 'Zeppelins float.', 'insight': 'Float.', 'context': '', 'topics': ['zeppelins']}]
+}
+
+
+def state(index) -> dict:
+    return copy.deepcopy({name: getattr(index, name) for name in STATE[type(index)]})
+
+
+def build(cls):
+    index = cls()
+    for episode in BASE:
+        index.add_episode(episode)
+    return index
+
+
+@pytest.mark.parametrize("cls", list(STATE), ids=lambda cls: cls.__name__)
+@pytest.mark.parametrize("episode", [EXTRA, STRANGER], ids=["shared", "stranger"])
+def test_add_then_remove_restores_state(cls, episode):
+    index = build(cls)
+    before = state(index)
+    index.add_episode(episode)
+    assert state(index) != before
+    index.remove_episode(episode['id'])
+    assert state(index) == before
+
+
+@pytest.mark.parametrize("cls", list(STATE), ids=lambda cls: cls.__name__)
+def test_readd_matches_fresh_build(cls):
+    index = build(cls)
+    index.add_episode(EXTRA)
+    index.add_episode(EXTRA)
+    index.remove_episode(BASE[1]['id'])
+    index.add_episode(BASE[1])
+    fresh = cls()
+    for episode in (BASE[0], EXTRA, BASE[1]):
+        fresh.add_episode(episode)
+    if cls is InvertedIndex:
+        # Doc ids differ; compare what they point at
+        def postings(index):
+            return {token: {index.docs[doc]: tf for doc, tf in docs.items()} for token, docs in index.postings.items()}
+        assert postings(index) == postings(fresh)
+        assert index._field_lengths == fresh._field_lengths and index.unit_count == fresh.unit_count
+    elif cls is TopicIndex:
+        for topics in (['leadership'], ['pricing'], ['brand-new-topic'], ['strategy', 'metrics']):
+            assert index.insights(index.insight_mask(topics)) == fresh.insights(fresh.insight_mask(topics))
+            assert index.episodes(index.episode_mask(topics)) == fresh.episodes(fresh.episode_mask(topics))
+        assert index.insights(index.actionable) == fresh.insights(fresh.actionable)
+    else:
+        assert state(index) == state(fresh)
+
+
+@pytest.mark.parametrize("cls", list(STATE), ids=lambda cls: cls.__name__)
+@pytest.mark.parametrize("change", ["add", "remove", "readd"])
+def test_staged_copy_leaves_published_index(cls, change):
+    published = build(cls)
+    before = state(published)
+    staged = staged_copy(published)
+    if change == "add":
+        staged.add_episode(EXTRA)
+    elif change == "remove":
+        staged.remove_episode(BASE[0]['id'])
+    else:
+        # The same episode id, edited into something else entirely
+        staged.add_episode(dict(STRANGER, id=BASE[1]['id']))
+    assert state(staged) != before
+    assert state(published) == before
+
+
+def test_inverted_index_copies_postings_on_write():
+    published = build(InvertedIndex)
+    staged = published.copy()
+    assert all(staged.postings[token] is published.postings[token] for token in published.postings)
+
+    staged.add_episode(STRANGER)
+    changed = {token for token, _ in staged.episode_postings(STRANGER['id'])}
+    for token in published.postings:
+        shared = staged.postings[token] is published.postings[token]
+        assert shared == (token not in changed)
+    assert not changed & staged._shared
+
+    # A token re-added after a write keeps the staged copy's own postings dict
+    staged.remove_episode(STRANGER['id'])
+    assert staged.postings == published.postings
+    assert not any(staged.postings[token] is published.postings[token] for token in changed & set(published.postings))
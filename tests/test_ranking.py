@@ -0,0 +1,40 @@
+"""Tests for BM25F ranking (lennys_wisdom/ranking.py)"""
+
+from lennys_wisdom.index import EPISODE_LEVEL, InvertedIndex
+from lennys_wisdom.ranking import BM25FScorer, top_k
+from lennys_wisdom.text import analyze
+
+
+def episode(episode_id: str, title: str) -> dict:
+    return {
+        'id': episode_id,
+        'title': title,
+        'key_insights': [{'quote': 'Pricing is a product decision.', 'insight': 'Own pricing.', 'context': ''}]
+    }
+
+
+def scores() -> dict:
+    # ep-c and ep-a are identical, so every one of their units ties
+    index = InvertedIndex()
+    for episode_id, title in (('ep-c', 'Pricing'), ('ep-b', 'Pricing pricing pricing'), ('ep-a', 'Pricing')):
+        index.add_episode(episode(episode_id, title))
+    return BM25FScorer(index).score({term: 1.0 for term in analyze('pricing')})
+
+
+def test_fixture_has_ties():
+    result = scores()
+    assert result[('ep-a', EPISODE_LEVEL)] == result[('ep-c', EPISODE_LEVEL)]
+    assert result[('ep-b', EPISODE_LEVEL)] > result[('ep-a', EPISODE_LEVEL)]
+
+
+def test_ties_go_to_smaller_id():
+    result = scores()
+    ranked = [unit for unit, _ in top_k(result, len(result))]
+    assert ranked[0] == ('ep-b', EPISODE_LEVEL)
+    assert ranked.index(('ep-a', EPISODE_LEVEL)) < ranked.index(('ep-c', EPISODE_LEVEL))
+    assert ranked.index(('ep-a', 0)) < ranked.index(('ep-c', 0))
+    assert ranked == [unit for unit, _ in sorted(result.items(), key=lambda item: (-item[1], item[0]))]
+
+
+def test_top_k_cuts_after_ties():
+    assert top_k({'b': 1.0, 'c': 2.0, 'a': 1.0, 'd': 0.5}, 2) == [('c', 2.0), ('a', 1.0)]
@@ -0,0 +1,110 @@
+"""Tests for extraction response repair (extraction_scripts/response_parser.py)"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "extraction_scripts"))
+
+from response_parser import ExtractionError, StreamingExtractionParser, parse_response  # noqa: E402
+
+INSIGHT = {
+    "quote": "Hire slowly, fire quickly.",
+    "timestamp": "12:34",
+    "context": "Talking about building the first team.",
+    "insight": "Take time over hires and act fast on mismatches.",
+    "topics": ["hiring"],
+    "actionable": True
+}
+
+EXTRACTION = {
+    "guest_name": "Jane Doe",
+    "guest_title": "CEO",
+    "guest_company": "Acme",
+    "guest_bio": "Founded Acme.",
+    "episode_summary": "Jane talks about hiring.",
+    "topics": ["hiring"],
+    "key_themes": [{"theme": "Hiring bar", "description": "Keep it high.", "relevance_score": 0.9}],
+    "key_insights": [INSIGHT, dict(INSIGHT, quote="Culture is what you do.", timestamp="20:00")]
+}
+
+RESPONSE = json.dumps(EXTRACTION, indent=2)
+
+
+def stream(text: str, size: int = 7) -> dict:
+    parser = StreamingExtractionParser("Jane Doe")
+    for i in range(0, len(text), size):
+        parser.feed(text[i:i + size])
+    return parser.result()
+
+
+def test_clean_response():
+    data = parse_response(RESPONSE)
+    assert data["episode_summary"] == "Jane talks about hiring."
+    assert [i["quote"] for i in data["key_insights"]] == [i["quote"] for i in EXTRACTION["key_insights"]]
+
+
+def test_streamed_in_pieces_matches_whole():
+    assert stream(RESPONSE) == parse_response(RESPONSE)
+
+
+def test_prose_and_fences_around_object():
+    text = f"Here is the extraction:\n```json\n{RESPONSE}\n```\nLet me know if you need more."
+    assert stream(text) == parse_response(RESPONSE)
+
+
+def test_braces_in_prose_before_object():
+    text = f"Sure! I used {{curly}} notes.\n{RESPONSE}"
+    assert stream(text) == parse_response(RESPONSE)
+
+
+def test_json_object_in_prose_before_object():
+    text = f'The format is {{"example": 1}}, so:\n{RESPONSE}'
+    assert stream(text) == parse_response(RESPONSE)
+
+
+def test_unclosed_brace_in_prose_before_object():
+    text = f"Notes {{ see below\n{RESPONSE}"
+    data = parse_response(text)
+    assert data["episode_summary"] == "Jane talks about hiring."
+    assert len(data["key_insights"]) == 2
+
+
+def test_trailing_commas():
+    text = RESPONSE.replace('"actionable": true\n', '"actionable": true,\n').replace("]\n}", "],\n}")
+    assert text != RESPONSE
+    parser = StreamingExtractionParser("Jane Doe")
+    parser.feed(text)
+    assert parser.result() == parse_response(RESPONSE)
+
+
+def test_truncated_response_keeps_complete_insights():
+    cut = RESPONSE.index("Culture is what")
+    parser = StreamingExtractionParser("Jane Doe")
+    parser.feed(RESPONSE[:cut])
+    data = parser.result()
+    assert [i["quote"] for i in data["key_insights"]] == ["Hire slowly, fire quickly."]
+    assert data["key_themes"][0]["theme"] == "Hiring bar"
+    assert any("cut off" in problem for problem in parser.problems)
+
+
+def test_invalid_insight_dropped():
+    broken = dict(EXTRACTION, key_insights=[INSIGHT, {"quote": "", "insight": "No quote"}])
+    parser = StreamingExtractionParser("Jane Doe")
+    parser.feed(json.dumps(broken))
+    data = parser.result()
+    assert len(data["key_insights"]) == 1
+    assert any("missing quote" in problem for problem in parser.problems)
+
+
+def test_no_json_object():
+    with pytest.raises(ExtractionError) as raised:
+        parse_response("I could not read the transcript {sorry}.")
+    assert raised.value.response == "I could not read the transcript {sorry}."
+
+
+def test_no_summary_rejected():
+    with pytest.raises(ExtractionError, match="episode_summary"):
+        parse_response(json.dumps(dict(EXTRACTION, episode_summary="")))